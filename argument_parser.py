@@ -1,22 +1,46 @@
 import argparse
 
-from argument_types import ParserArguments, Browsers, Formats
+from argument_types import ParserArguments, ControllerBackends, Browsers, Formats, Waits, Profiles, Roles, \
+    DRIVER_CACHE_PATH
 
 
 def get_parser_arguments() -> ParserArguments:
     """Generates the argument parser using `argparse`, and parses the arguments given."""
     parser = argparse.ArgumentParser()
+    parser.add_argument("--backend",
+                        choices=ControllerBackends, default=ControllerBackends[0],
+                        help="How to interact with the site ('selenium' = drive a browser, "
+                             "'http' = call the site's HTTP API directly over keep-alive connections, no browser).")
     parser.add_argument("-b", "--browser",
                         choices=Browsers, default=Browsers[0],
                         help="Browser for Selenium to use.")
-    # parser.add_argument("-u", "--url",
-    #                     default="https://gandalf.lakera.ai/gandalf-the-white",
-    #                     help="Base URL for Selenium to use")
-    # NOTE: Disabled because this is generally intended for internal use only.
+    parser.add_argument("--headless",
+                        action="store_true", default=False,
+                        help="Flag to launch the browser without a window.")
+    parser.add_argument("--profile",
+                        choices=Profiles, default=Profiles[0],
+                        help="Browser profile ('lean' = headless, small window, no images/fonts/extensions/trackers).")
+    parser.add_argument("--pool-size",
+                        default=0, type=int,
+                        help="Number of pre-warmed headless browser sessions to reuse (0 = new browser per session).")
+    parser.add_argument("--driver-cache",
+                        default=DRIVER_CACHE_PATH,
+                        help="Path of the on-disk cache of the browser resolved by 'auto'.")
+    parser.add_argument("--no-driver-cache",
+                        action="store_const", const=None, dest="driver_cache",
+                        help="Flag to probe the browsers for 'auto' every time, without caching.")
+    parser.add_argument("-u", "--url",
+                        default="https://gandalf.lakera.ai/gandalf-the-white",
+                        help="Base URL for Selenium to use (e.g. a local stand-in server, see 'stub_server.py').")
+    # NOTE: Generally intended for internal use only (testing & benchmarks).
     parser.add_argument("-t", "--timeout",
                         default=10, type=float, help="How long should Selenium wait for responses before timing out?")
     parser.add_argument("-p", "--poll-frequency",
                         default=.2, type=float, help="How frequently should Selenium poll for responses?")
+    parser.add_argument("-W", "--wait",
+                        choices=Waits, default=Waits[0],
+                        help="How should Selenium wait for responses? "
+                             "('observer' = react to DOM changes, falling back to polling; 'poll' = poll only)")
     parser.add_argument("-k", "--keep",
                         action="store_true", default=False,
                         help="Flag to disable cookie deletion when opening Selenium.")
@@ -26,7 +50,82 @@ def get_parser_arguments() -> ParserArguments:
                        help="Format of output ('stdout' = print to standard output, file extension = 'output.{ext}'")
     group.add_argument("-o", "--output",
                        help=f"Path for file output (supported extensions: {Formats}, defaults to 'txt')")
+    parser.add_argument("--flush-interval",
+                        default=1.0, type=float,
+                        help="Maximum seconds to keep output buffered before writing it to the output file.")
+    parser.add_argument("--flush-size",
+                        default=64, type=int,
+                        help="Maximum number of output records to keep buffered before writing them to the output file.")
+    parser.add_argument("--trace",
+                        help="Record per-operation timings & WebDriver round-trips, export them to this Chrome-trace "
+                             "JSON file (chrome://tracing, ui.perfetto.dev) & print a summary when the session ends.")
+    parser.add_argument("-s", "--script",
+                        help="Command script to run without interactive prompts ('-' = standard input, like 'test.txt')"
+                             "; Invalid lines are skipped before reaching the site, and a JSON summary is printed.")
+    # Cache Group
+    group = parser.add_argument_group("cache", "Reuse answers to prompts already submitted on the same level.")
+    group.add_argument("--cache",
+                       help="Path of the persistent response cache (SQLite), keyed on level & prompt.")
+    group.add_argument("--cache-size",
+                       default=10000, type=int, help="Maximum number of answers to keep in the response cache.")
+    group.add_argument("--cache-ttl",
+                       type=float, help="Seconds a cached answer stays valid (default: forever).")
+    group.add_argument("--refresh",
+                       action="store_true", default=False,
+                       help="Flag to always submit comments to the chatbot (refreshing the cached answers).")
+    # Campaign Group
+    group = parser.add_argument_group("campaign", "Run a batch of prompts instead of the interactive CLI.")
+    group.add_argument("-c", "--campaign",
+                       help="Prompt file to run (commands like 'test.txt', or '.jsonl' with one prompt/job per line).")
+    group.add_argument("-w", "--workers",
+                       default=1, type=int,
+                       help="Number of parallel sessions used to run the campaign (or the solver, or the worker "
+                            "processes spawned by a '--queue' coordinator).")
+    group.add_argument("--job-timeout",
+                       type=float, help="How long may a single job (comment & its guesses) take before timing out?")
+    group.add_argument("--retries",
+                       default=1, type=int, help="How many times to retry a job when page elements are not found?")
+    # Solver Group
+    group = parser.add_argument_group("solver", "Pass all levels automatically instead of the interactive CLI.")
+    group.add_argument("-a", "--auto",
+                       action="store_true", default=False,
+                       help="Flag to pass all levels automatically (in parallel, one session per level, if '--workers' "
+                            "is above 1).")
+    group.add_argument("-e", "--extractor",
+                       action="append", dest="extractors",
+                       help="Regular expression extracting password candidates from answers (the 1st group, if any, "
+                            "otherwise the whole match); Can be repeated, tried before the built-in ones.")
+    group.add_argument("--max-attempts",
+                       default=10, type=int, help="Maximum number of guesses per level before giving up on it.")
+    # Checkpoint Group
+    group = parser.add_argument_group("checkpoint", "Periodically save the progress, to resume after a crash.")
+    group.add_argument("--checkpoint",
+                       help="Path of the checkpoint file (gzip-compressed JSON) the progress is saved to.")
+    group.add_argument("--checkpoint-interval",
+                       default=30.0, type=float,
+                       help="Minimum seconds between checkpoints (0 = after every completed step).")
+    group.add_argument("--resume",
+                       action="store_true", default=False,
+                       help="Flag to restore the session from the checkpoint file, and skip the work already done.")
+    # Queue Group
+    group = parser.add_argument_group("queue", "Run a campaign across worker processes (on one host) sharing a queue.")
+    group.add_argument("--queue",
+                       help="Path of the job queue (SQLite) shared by the coordinator & its workers; Re-running the "
+                            "coordinator on the same queue resumes the campaign.")
+    group.add_argument("--role",
+                       choices=Roles, default=Roles[0],
+                       help="Role of this process ('coordinator' = enqueue the campaign, spawn '--workers' worker "
+                            "processes & merge their results in order, 'worker' = run jobs from the queue).")
+    group.add_argument("--lease",
+                       default=30.0, type=float,
+                       help="Seconds a worker may hold a job without a heartbeat before it is put back on the queue.")
     args = parser.parse_args()
+    if args.resume and args.checkpoint is None:
+        parser.error("--resume requires --checkpoint")
+    if args.queue is None and args.role == "worker":
+        parser.error("--role worker requires --queue")
+    if args.queue is not None and args.role == "coordinator" and args.campaign is None:
+        parser.error("--queue requires --campaign (or --role worker)")
     return ParserArguments(**vars(args))
 
 
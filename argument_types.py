@@ -1,15 +1,84 @@
-from typing import Optional, Literal, List, get_args, AnyStr
-from dataclasses import dataclass
-from selenium.webdriver.remote.webelement import WebElement
+from __future__ import annotations
+
+import os
+from typing import Optional, Literal, List, Tuple, Dict, Any, get_args, AnyStr, TYPE_CHECKING
+from dataclasses import dataclass, field
+
+if TYPE_CHECKING:  # Only for annotations; Importing Selenium's webdriver package is slow (see benchmark_imports.py).
+    from selenium.webdriver.remote.webelement import WebElement
 
 BrowserType = Literal["auto", "firefox", "chrome", "edge", "safari"]
 """String-Literal Type of supported browsers (and their respective drivers)."""
-FormatType = Literal["stdout", "txt", "csv", "json"]
-"""String-Literal Type of supported output formats."""
+FormatType = Literal["stdout", "txt", "csv", "json", "jsonl", "garc"]
+"""String-Literal Type of supported output formats (`garc` = compressed columnar archive of typed records)."""
+JsonMode = Literal["array", "lines"]
+"""String-Literal Type of supported JSON output modes (`array` = single JSON array, `lines` = JSON Lines)."""
+WaitType = Literal["observer", "poll"]
+"""String-Literal Type of supported wait strategies (`observer` = DOM MutationObserver, `poll` = fixed interval)."""
+ProfileType = Literal["default", "lean"]
+"""String-Literal Type of supported browser profiles (`lean` = headless, no images/fonts/extensions/trackers)."""
+CommandType = Literal["help", "comment", "guess", "exit", "quit"]
+"""String-Literal Type of supported CLI commands."""
+BackendType = Literal["selenium", "http"]
+"""String-Literal Type of supported controller backends (`http` = the site's HTTP API directly, without a browser)."""
+OutcomeType = Literal["answered", "passed", "failed", "error"]
+"""String-Literal Type of the outcome of a submitted comment (`answered`) or guess (`passed` / `failed`)."""
+RoleType = Literal["coordinator", "worker"]
+"""String-Literal Type of the roles of a process in a distributed campaign (see :mod:`job_queue`)."""
 Browsers: List[BrowserType] = list(get_args(BrowserType))
 """List of supported browsers' names."""
 Formats: List[FormatType] = list(get_args(FormatType))
 """List of supported output formats' extensions."""
+JsonModes: List[JsonMode] = list(get_args(JsonMode))
+"""List of supported JSON output modes."""
+Waits: List[WaitType] = list(get_args(WaitType))
+"""List of supported wait strategies."""
+Profiles: List[ProfileType] = list(get_args(ProfileType))
+"""List of supported browser profiles."""
+Commands: List[CommandType] = list(get_args(CommandType))
+"""List of supported CLI commands."""
+ControllerBackends: List[BackendType] = list(get_args(BackendType))
+"""List of supported controller backends."""
+Outcomes: List[OutcomeType] = list(get_args(OutcomeType))
+"""List of the outcomes of a submitted comment or guess (their position is their code in archives)."""
+Roles: List[RoleType] = list(get_args(RoleType))
+"""List of the roles of a process in a distributed campaign."""
+DRIVER_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "gandalf-cli", "drivers.json")
+"""Default path of the on-disk cache of the browser resolved by `auto` for each machine."""
+BLOCKED_URL_PATTERNS: List[str] = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*segment.io*", "*segment.com*", "*hotjar.com*", "*mixpanel.com*", "*amplitude.com*", "*posthog.com*",
+    "*intercom.io*", "*sentry.io*", "*facebook.net*", "*linkedin.com*", "*hubspot.com*", "*hs-scripts.com*",
+    "*fonts.googleapis.com*", "*fonts.gstatic.com*", "*.woff*", "*.ttf*",
+]
+"""URL patterns of third-party, analytics & font requests blocked by the `lean` browser profile."""
+MIN_PROMPT_LENGTH = 10
+"""Minimum length of a comment (prompt) accepted by the chatbot."""
+SUCCESS_MESSAGE = "You guessed the password!"
+"""Title of the alert shown after a correct guess (the start of :py:meth:`Controller.submit_guess`'s answer)."""
+Levels: List[str] = ["baseline", "do-not-tell", "do-not-tell-and-block", "gpt-is-password-encoded",
+                     "word-blacklist", "gpt-blacklist", "gandalf", "gandalf-the-white"]
+"""Names of the levels (defenders), in order; The URL of each level is `{site}/{name}`."""
+Selectors: Dict[str, str] = {
+    "level_label": ".level-label",
+    "description": ".description",
+    "comment": "#comment",
+    "comment_submit": "button[type='submit']:nth-child(1)",
+    "answer": ".answer",
+    "guess": "#guess",
+    "guess_submit": "button[type='submit']:nth-child(2)",
+    "alert_title": ".customAlert div:nth-child(2)",  # 1st match
+    "alert_text": ".customAlert div:nth-child(2)",  # 2nd match
+    "alert_submit": ".customAlert button",
+}
+"""CSS Selector of each of the :class:`Elements` fields."""
+ElementGroups: Dict[str, List[str]] = {
+    "default": ["level_label", "description", "comment", "comment_submit"],
+    "answer": ["answer"],
+    "guess": ["guess", "guess_submit"],
+    "alert": ["alert_title", "alert_text", "alert_submit"],
+}
+"""The :class:`Elements` fields, grouped by when they appear on the webpage."""
 
 
 @dataclass
@@ -29,11 +98,68 @@ class ParserArguments:
     """Format of output; Cannot be used with Output (`stdout` = print to standard output, extension = `output.{ext}`)"""
     output: Optional[str]
     """Output file path; Cannot be used with Format."""
+    headless: bool = False
+    """Flag to launch the browser without a window."""
+    profile: ProfileType = "default"
+    """Browser profile (`default` = no options, `lean` = headless & resource-lean)."""
+    pool_size: int = 0
+    """Number of pre-warmed headless browser sessions to keep for reuse (0 = launch a new browser per session)."""
+    driver_cache: Optional[str] = DRIVER_CACHE_PATH
+    """Path of the on-disk cache of the browser resolved by `auto` (None = probe the browsers every time)."""
+    wait: WaitType = "observer"
+    """How should Selenium wait for responses? (`observer` = react to DOM changes, `poll` = every `poll_frequency`)"""
+    flush_interval: float = 1.0
+    """Maximum seconds to keep output records buffered before writing them to the output file."""
+    flush_size: int = 64
+    """Maximum number of output records to keep buffered before writing them to the output file."""
+    trace: Optional[str] = None
+    """Path of the Chrome-trace / Perfetto JSON file to export per-operation timings to (None = no instrumentation)."""
+    cache: Optional[str] = None
+    """Path of the persistent response cache (SQLite) of answers, keyed on level & prompt (None = no caching)."""
+    cache_size: int = 10000
+    """Maximum number of answers to keep in the response cache (least recently used are evicted first)."""
+    cache_ttl: Optional[float] = None
+    """Seconds a cached answer stays valid (None = forever)."""
+    refresh: bool = False
+    """Flag to always submit comments to the chatbot (refreshing the cached answers)."""
+    campaign: Optional[str] = None
+    """Prompt file (commands like `test.txt`, or JSONL) to run as a batch campaign (None = interactive CLI)."""
+    workers: int = 1
+    """Number of parallel :class:`Controller` sessions used to run a campaign (or the solver, one level per session)."""
+    job_timeout: Optional[float] = None
+    """How long may a single campaign job (comment & its guesses) take before it is reported as timed out?"""
+    retries: int = 1
+    """How many times to retry a campaign job (after reloading the page) when elements could not be found?"""
+    backend: BackendType = "selenium"
+    """How to interact with the site (`selenium` = drive a browser, `http` = call the site's HTTP API directly)."""
+    script: Optional[str] = None
+    """Command script (like `test.txt`) to run non-interactively (`-` = standard input, None = interactive CLI)."""
+    auto: bool = False
+    """Flag to pass all levels automatically (see :mod:`solver`) instead of the interactive CLI."""
+    extractors: Optional[List[str]] = None
+    """Regular expressions extracting password candidates from answers, tried before the built-in ones."""
+    max_attempts: int = 10
+    """Maximum number of guesses per level before the solver gives up on it."""
+    checkpoint: Optional[str] = None
+    """Path of the checkpoint file the session's progress is periodically saved to (None = no checkpoints)."""
+    checkpoint_interval: float = 30.0
+    """Minimum seconds between checkpoints (0 = after every completed step)."""
+    resume: bool = False
+    """Flag to restore the session from the checkpoint file, and skip the work already done."""
+    queue: Optional[str] = None
+    """Path of the job queue (SQLite) a distributed campaign is run through (None = run the campaign in-process)."""
+    role: RoleType = "coordinator"
+    """Role of this process in a distributed campaign (`coordinator` = enqueue & merge, `worker` = run jobs)."""
+    lease: float = 30.0
+    """Seconds a worker may hold a job without a heartbeat before it is put back on the queue."""
 
 
 @dataclass
 class Elements:
-    """Data Class container for all relevant :class:`WebElement` instances."""
+    """
+    Data Class container for all relevant :class:`WebElement` instances; Also caches them, per group (see
+    :py:data:`ElementGroups`), until invalidated by the :class:`Controller` (stale reference, or new level).
+    """
     level_label: Optional[WebElement] = None
     """The label displaying the current level."""
     description: Optional[WebElement] = None
@@ -54,3 +180,137 @@ class Elements:
     """The text content of the alert messagebox (appears after each password attempt submission)."""
     alert_submit: Optional[WebElement] = None
     """The button used to submit & close the alert messagebox (appears after each password attempt submission)."""
+    texts: Dict[str, Optional[str]] = field(default_factory=dict)
+    """The text of each element (by field name), as of the latest snapshot of the webpage."""
+    version: int = 0
+    """DOM version; Incremented whenever the webpage is (re)loaded or moves on to a new level."""
+    resolved: Dict[str, int] = field(default_factory=dict)
+    """The DOM version each group was last resolved at (missing = not resolved since invalidated)."""
+
+    def has(self, group: str) -> bool:
+        """Whether all elements of the group are available (resolved, though possibly stale)."""
+        for name in ElementGroups[group]:
+            if getattr(self, name) is None:
+                return False
+        return True
+
+    def is_valid(self, group: str) -> bool:
+        """Whether the group was resolved at the current DOM version, and none of its references were found stale."""
+        return self.resolved.get(group) == self.version and self.has(group)
+
+    def set_group(self, group: str, elements: Dict[str, Optional[WebElement]]) -> None:
+        """Caches the (freshly resolved) elements of the group, by field name, at the current DOM version."""
+        for name in ElementGroups[group]:
+            setattr(self, name, elements.get(name))
+        self.resolved[group] = self.version
+
+    def invalidate(self, group: Optional[str] = None) -> None:
+        """
+        Drops the cached elements of the group (e.g. after one of them was found stale, or the webpage replaced them).
+
+        :param Optional[str] group: The group to invalidate (None = all of them, moving on to a new DOM version).
+        """
+        groups = list(ElementGroups) if group is None else [group]
+        if group is None:
+            self.version += 1
+            self.texts = {}
+        for invalidated in groups:
+            for name in ElementGroups[invalidated]:
+                setattr(self, name, None)
+            self.resolved.pop(invalidated, None)
+
+
+@dataclass
+class Job:
+    """Data Class container for a single campaign job: a comment (prompt), and the guesses to submit after it."""
+    index: int
+    """Position of the job in the campaign (results are merged in this order)."""
+    comment: str
+    """The comment (prompt) to submit to the chatbot."""
+    guesses: List[str] = field(default_factory=list)
+    """The guesses for the password to submit after the comment."""
+
+
+@dataclass
+class JobResult:
+    """Data Class container for the result of a single campaign :class:`Job`."""
+    index: int
+    """Position of the job in the campaign."""
+    comment: str
+    """The comment (prompt) submitted to the chatbot."""
+    answer: Optional[str] = None
+    """The answer from the chatbot (None = not answered)."""
+    guesses: List[Tuple[str, str]] = field(default_factory=list)
+    """Pairs of (guess, alert message received) for each guess submitted."""
+    attempts: int = 0
+    """How many times the job was attempted."""
+    error: Optional[str] = None
+    """The error which stopped the job (None = completed)."""
+    elapsed: float = 0
+    """How long the job took, in seconds (including retries)."""
+
+
+@dataclass
+class Command:
+    """Data Class container for a single command of a CLI script (see :mod:`script`)."""
+    line_num: int
+    """Line number of the command in the script."""
+    command: str
+    """The command, lower-case (see :py:data:`Commands`; Unknown commands are kept, with an :py:attr:`error`)."""
+    query: Optional[str] = None
+    """The comment / guess to submit (None = not given)."""
+    error: Optional[str] = None
+    """Why the command was skipped or failed (None = valid, or succeeded)."""
+    response: Optional[str] = None
+    """The response to the command (None = not executed yet)."""
+
+
+@dataclass
+class ArchiveRecord:
+    """Data Class container for a typed record of a single submitted comment or guess (see :class:`ArchiveBackend`)."""
+    timestamp: float
+    """When the comment or guess was submitted (seconds since the epoch)."""
+    level: str
+    """The level it was submitted on (label & description)."""
+    prompt: Optional[str]
+    """The comment (for a guess, the level's latest comment; None = no comment yet)."""
+    answer: Optional[str] = None
+    """The answer from the chatbot, the result message of a guess, or the error (None = no response)."""
+    guess: Optional[str] = None
+    """The guess for the password (None = a comment)."""
+    outcome: OutcomeType = "answered"
+    """The outcome of the comment (`answered`) or guess (`passed` / `failed`), or `error`."""
+    latency: float = 0
+    """How long the submission took, in seconds."""
+
+
+@dataclass
+class LevelResult:
+    """Data Class container for the result of the solver on a single level (see :mod:`solver`)."""
+    level: str
+    """The defender name of the level."""
+    password: Optional[str] = None
+    """The correct password (None = not found)."""
+    prompts: int = 0
+    """How many comments (prompts) were submitted."""
+    guesses: List[str] = field(default_factory=list)
+    """The password candidates guessed, in order."""
+    error: Optional[str] = None
+    """The error which stopped the solver on this level (None = no error)."""
+    elapsed: float = 0
+    """How long the level took, in seconds."""
+
+
+@dataclass
+class CheckpointState:
+    """Data Class container for the progress saved to a checkpoint file (see :mod:`checkpoint`)."""
+    url: Optional[str] = None
+    """URL of the session's current level (None = not saved)."""
+    cookies: List[Dict[str, Any]] = field(default_factory=list)
+    """The session's cookies, as returned by :py:meth:`WebDriver.get_cookies`."""
+    completed: List[str] = field(default_factory=list)
+    """Keys of the completed work (e.g. `job:3`, `line:12`, `level:baseline`), in order of completion."""
+    passwords: Dict[str, str] = field(default_factory=dict)
+    """The passwords found, by level (defender name)."""
+    updated: float = 0
+    """When the checkpoint was saved (seconds since the epoch)."""
@@ -0,0 +1,356 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Optional, Any, Dict, List, Callable, Awaitable, Tuple, TYPE_CHECKING
+from urllib.parse import urlsplit
+
+from selenium.common import (WebDriverException, NoSuchElementException, StaleElementReferenceException,
+                             ElementNotInteractableException, TimeoutException)
+
+from argument_parser import get_parser_arguments
+from argument_types import ParserArguments, Selectors, ElementGroups, MIN_PROMPT_LENGTH, SUCCESS_MESSAGE
+from controller import SNAPSHOT_SCRIPT
+from drivers import create_driver
+from output import OutputBackend, create_backend
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+"""W3C WebDriver key identifying an element reference in a JSON response."""
+ERRORS: Dict[str, type] = {
+    "no such element": NoSuchElementException,
+    "stale element reference": StaleElementReferenceException,
+    "element not interactable": ElementNotInteractableException,
+}
+"""W3C WebDriver error codes, and the Selenium exception each of them is raised as."""
+
+
+def get_executor_url(driver: WebDriver) -> str:
+    """
+    Returns the URL of the driver's W3C WebDriver HTTP endpoint.
+
+    Newer Selenium versions keep it in the command executor's client configuration, older ones in its `_url`.
+
+    :param WebDriver driver: The :class:`WebDriver` instance.
+    :return: The URL of the endpoint.
+    :rtype: str
+    """
+    executor = driver.command_executor
+    client_config = getattr(executor, "_client_config", None)
+    return getattr(client_config, "remote_server_addr", None) or executor._url
+
+
+class AsyncController:
+    """
+    Asyncio-native variant of :class:`Controller`, with the same public API as coroutines.
+
+    The browser is launched (once) via Selenium, but every command afterwards is sent directly to the driver's
+    W3C WebDriver HTTP endpoint over a non-blocking keep-alive connection, and waits poll with :py:func:`asyncio.sleep`.
+    That way a single event loop can supervise many browser sessions at once, without a thread per session.
+
+    Use :py:meth:`start` (or `async with`) before submitting anything.
+    """
+    _arguments: ParserArguments
+    """Parser Arguments received upon initialization."""
+    _output: OutputBackend
+    """The output backend to print to."""
+    _owns_output: bool
+    """Whether :py:attr:`_output` was created by this instance (and should be closed by it)."""
+    _driver: Optional[WebDriver] = None
+    """The Selenium :class:`WebDriver` instance used to launch (& quit) the browser."""
+    _host: str
+    """Host of the driver's HTTP endpoint."""
+    _port: int
+    """Port of the driver's HTTP endpoint."""
+    _prefix: str
+    """Path prefix of the current session's commands (`{base path}/session/{session id}`)."""
+    _connection: Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = None
+    """Keep-alive connection to the driver (None = not connected yet)."""
+    _lock: asyncio.Lock
+    """Serializes the commands sent over :py:attr:`_connection`."""
+    _elements: Dict[str, Optional[str]]
+    """Element references (by :class:`Elements` field name) of the current level."""
+    _level: str
+    """Label & description of the current level."""
+    _is_interacted: bool
+    """Used to indicate whether an initial comment (message) has been sent to the chatbot."""
+    _last_comment: Optional[str]
+
+    def __init__(self, arguments: ParserArguments, output: Optional[OutputBackend] = None):
+        """
+        The :class:`AsyncController` Constructor; Doesn't launch the browser (see :py:meth:`start`).
+
+        :param ParserArguments arguments: Parser Arguments for initialization.
+        :param Optional[OutputBackend] output: Output backend to print to (None = create from :param:`arguments`).
+        """
+        self._arguments = arguments
+        self._owns_output = output is None
+        self._output = create_backend(self._arguments) if output is None else output
+        self._lock = asyncio.Lock()
+        self._elements = {}
+        self._level = ""
+        self._is_interacted = False
+        self._last_comment = None
+
+    async def __aenter__(self) -> "AsyncController":
+        try:
+            await self.start()
+        except BaseException:  # Don't leave the browser running (`__aexit__` isn't called).
+            await self.close()
+            raise
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    def __str__(self):
+        return self._level
+
+    def print(self, *values: object, sep: Optional[str] = " ", end: Optional[str] = "\n", flush: bool = False) -> None:
+        """Prints the values to the output backend; See :py:meth:`Controller.print`."""
+        self._output.write(*values, sep=sep, end=end, flush=flush)
+
+    async def start(self) -> None:
+        """
+        Launches the browser (in a worker thread, as Selenium blocks), then opens the webpage & reads the first level.
+
+        :raises NoSuchDriverException: The `browser` field for the given arguments was not recognized.
+        """
+        self._driver = await asyncio.to_thread(create_driver, self._arguments.browser, self.print,
+                                               self._arguments.headless, self._arguments.driver_cache,
+                                               self._arguments.profile)
+        executor_url = urlsplit(get_executor_url(self._driver))
+        self._host, self._port = executor_url.hostname, executor_url.port or 80
+        self._prefix = f"{executor_url.path.rstrip('/')}/session/{self._driver.session_id}"
+        if not self._arguments.keep:
+            await self._execute("DELETE", "/cookie")
+        await self._execute("POST", "/url", {"url": self._arguments.url})
+        await self._start_level()
+
+    async def close(self) -> None:
+        """Closes the driver connection, the browser & the output backend (if created by this instance)."""
+        if self._connection is not None:
+            self._connection[1].close()
+            self._connection = None
+        if self._driver is not None:
+            await asyncio.to_thread(self._driver.quit)
+            self._driver = None
+        if self._owns_output:
+            self._output.close()
+        else:
+            self._output.flush()
+
+    async def _execute(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Sends a single W3C WebDriver command for the current session.
+
+        :param str method: The HTTP method.
+        :param str path: The command path, relative to the session.
+        :param Optional[Dict[str, Any]] payload: The command parameters (JSON body).
+        :return: The `value` of the response.
+        :rtype: Any
+        :raises WebDriverException: The driver returned an error (mapped to the matching Selenium exception).
+        """
+        body = b"" if payload is None and method != "POST" else json.dumps(payload or {}).encode()
+        request = (f"{method} {self._prefix}{path} HTTP/1.1\r\n"
+                   f"Host: {self._host}:{self._port}\r\n"
+                   f"Content-Type: application/json;charset=UTF-8\r\n"
+                   f"Content-Length: {len(body)}\r\n"
+                   f"Connection: keep-alive\r\n\r\n").encode() + body
+        async with self._lock:
+            for retry in [False, True]:  # The driver may have dropped an idle keep-alive connection; Reconnect once.
+                if self._connection is None:
+                    self._connection = await asyncio.open_connection(self._host, self._port)
+                reader, writer = self._connection
+                try:
+                    writer.write(request)
+                    await writer.drain()
+                    status, data = await self._read_response(reader)
+                    break
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    writer.close()
+                    self._connection = None
+                    if retry:
+                        raise
+        value = json.loads(data).get("value") if data else None
+        if status >= 400:
+            error = value.get("error", "") if isinstance(value, dict) else ""
+            message = value.get("message", "") if isinstance(value, dict) else str(value)
+            raise ERRORS.get(error, WebDriverException)(f"{error}: {message}")
+        return value
+
+    async def _read_response(self, reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+        """Reads a single HTTP response (`Content-Length` or chunked body) from the driver connection."""
+        status_line = await reader.readuntil(b"\r\n")
+        status = int(status_line.split()[1])
+        headers: Dict[str, str] = {}
+        while (line := await reader.readuntil(b"\r\n")) != b"\r\n":
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while (size := int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)) > 0:
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            await reader.readuntil(b"\r\n")
+            data = b"".join(chunks)
+        elif "content-length" in headers:
+            data = await reader.readexactly(int(headers["content-length"]))
+        else:  # Body ends when the driver closes the connection
+            data = await reader.read()
+            headers["connection"] = "close"
+        if headers.get("connection", "").lower() == "close" and self._connection is not None:
+            self._connection[1].close()
+            self._connection = None
+        return status, data
+
+    async def _find_all(self, name: str) -> List[str]:
+        """Returns the references of all elements matching the CSS Selector of the given :class:`Elements` field."""
+        value = await self._execute("POST", "/elements", {"using": "css selector", "value": Selectors[name]})
+        return [element[ELEMENT_KEY] for element in value]
+
+    async def _find(self, name: str) -> str:
+        """Returns the reference of the first element matching the CSS Selector of the given :class:`Elements` field."""
+        value = await self._execute("POST", "/element", {"using": "css selector", "value": Selectors[name]})
+        return value[ELEMENT_KEY]
+
+    async def _text(self, element: str) -> str:
+        """Returns the visible text of the referenced element."""
+        return await self._execute("GET", f"/element/{element}/text")
+
+    async def _type(self, element: str, value: str) -> None:
+        """Clears the referenced element, and types the given value into it."""
+        await self._execute("POST", f"/element/{element}/clear")
+        await self._execute("POST", f"/element/{element}/value", {"text": value})
+
+    async def _click(self, element: str) -> None:
+        """Clicks the referenced element."""
+        await self._execute("POST", f"/element/{element}/click")
+
+    async def _until(self, condition: Callable[[], Awaitable[Any]], message: str) -> Any:
+        """
+        Polls the condition (every `poll_frequency` seconds, without blocking the event loop) until it is truthy.
+
+        :param Callable[[], Awaitable[Any]] condition: Coroutine function to poll; Missing elements count as falsy.
+        :param str message: Message for the :class:`TimeoutException`.
+        :return: The truthy result of the condition.
+        :rtype: Any
+        :raises TimeoutException: The condition wasn't met within `timeout` seconds.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._arguments.timeout
+        while True:
+            try:
+                value = await condition()
+                if value:
+                    return value
+            except (NoSuchElementException, ElementNotInteractableException, StaleElementReferenceException):
+                pass
+            if loop.time() >= deadline:
+                raise TimeoutException(message)
+            await asyncio.sleep(self._arguments.poll_frequency)
+
+    async def _start_level(self) -> None:
+        """Refresh the stored state of the webpage (elements & their texts in a single round-trip)."""
+        self._is_interacted = False
+        self._last_comment = None
+        names = ElementGroups["default"]
+        snapshot = await self._execute("POST", "/execute/sync", {
+            "script": SNAPSHOT_SCRIPT, "args": [{name: Selectors[name] for name in names}]})
+        missing = [name for name in names if snapshot["elements"].get(name) is None]
+        if missing:
+            raise NoSuchElementException(f"Couldn't get elements: {missing}")
+        self._elements = {name: snapshot["elements"][name][ELEMENT_KEY] for name in names}
+        self._level = f"{snapshot['texts']['level_label']}: {snapshot['texts']['description']}"
+        self.print(str(self))
+
+    async def _get_answer_elements(self) -> bool:
+        """Update the answer & guess element references (all of them, or none)."""
+        self._elements["answer"] = await self._find("answer")
+        self._elements["guess"] = await self._find("guess")
+        self._elements["guess_submit"] = await self._find("guess_submit")
+        return True
+
+    async def _get_alert_elements(self) -> bool:
+        """Update the modal alert element references."""
+        alerts = await self._find_all("alert_title")
+        if len(alerts) < 2:
+            return False
+        self._elements["alert_title"], self._elements["alert_text"] = alerts[:2]  # 1st & 2nd matches
+        self._elements["alert_submit"] = await self._find("alert_submit")
+        return True
+
+    async def submit_comment(self, value: str) -> str:
+        """
+        Submit a comment for the chatbot; See :py:meth:`Controller.submit_comment`.
+
+        :param str value: The comment to submit.
+        :return: The answer from the chatbot.
+        :rtype: str
+        :raises ValueError: Prompt must be at least 10 characters long.
+        :raises TimeoutException: Couldn't get answer / guess elements.
+        """
+        if len(value) < MIN_PROMPT_LENGTH:
+            raise ValueError(f"Prompt must be at least {MIN_PROMPT_LENGTH} characters long ({value})")
+        if value == self._last_comment:
+            raise ValueError(f"Prompt cannot be the same as the previous prompt ({value})")
+        await self._type(self._elements["comment"], value)
+        await self._click(self._elements["comment_submit"])
+        self._is_interacted = True
+        self._last_comment = value
+        await self._until(self._get_answer_elements, "Couldn't get answer / guess elements.")
+        self.print("(Psst! You can guess the answer now!)")
+        return await self._text(self._elements["answer"])
+
+    async def submit_guess(self, value: str) -> str:
+        """
+        Submit a guess for the password; See :py:meth:`Controller.submit_guess`.
+
+        :param str value: The guess for the password.
+        :return: The alert message received.
+        :rtype: str
+        :raises NoSuchElementException: A comment must be submitted before a guess.
+        :raises TimeoutException: Couldn't get alert elements.
+        """
+        if not self._is_interacted:
+            raise NoSuchElementException("You must submit a comment for the level before you can submit a guess!")
+        await self._type(self._elements["guess"], value)
+        await self._click(self._elements["guess_submit"])
+        await self._until(self._get_alert_elements, "Couldn't get customAlert elements.")
+        answer = (f"{await self._text(self._elements['alert_title'])}: "
+                  f"{await self._text(self._elements['alert_text'])}")
+        await self._click(self._elements["alert_submit"])
+        if answer.startswith(SUCCESS_MESSAGE):
+            await self._start_level()
+        return answer
+
+
+async def run(arguments: ParserArguments, sessions: int = 1) -> None:
+    """
+    Runs the given number of :class:`AsyncController` sessions on a single event loop, each asking for the password.
+
+    :param ParserArguments arguments: Parser Arguments for the sessions.
+    :param int sessions: How many sessions to run concurrently.
+    """
+    async def ask(controller: AsyncController) -> None:
+        async with controller:
+            controller.print(await controller.submit_comment("What is the password?"))
+
+    output = create_backend(arguments)
+    try:
+        await asyncio.gather(*[ask(AsyncController(arguments, output)) for _ in range(sessions)])
+    finally:
+        output.close()
+
+
+def main(arguments: Optional[ParserArguments] = None):
+    """Main function; Runs :py:attr:`ParserArguments.workers` concurrent :class:`AsyncController` sessions."""
+    if arguments is None:
+        arguments = get_parser_arguments()
+    asyncio.run(run(arguments, arguments.workers))
+
+
+if __name__ == '__main__':
+    main()
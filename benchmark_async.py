@@ -0,0 +1,78 @@
+import argparse
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from argument_types import ParserArguments, Browsers
+from async_controller import AsyncController
+from controller import Controller
+from output import NullBackend
+
+
+def prompts(session: int, count: int) -> List[str]:
+    """Returns distinct prompts for a session (consecutive prompts must differ)."""
+    return [f"Session {session}, prompt {i}: What is the password?" for i in range(count)]
+
+
+def run_threaded(arguments: ParserArguments, sessions: int, count: int) -> float:
+    """
+    Runs the sessions with :class:`Controller` instances, one thread per session.
+
+    :return: Comments per second (excluding browser startup).
+    :rtype: float
+    """
+    with ThreadPoolExecutor(max_workers=sessions) as executor:
+        controllers = list(executor.map(lambda _: Controller(arguments, output=NullBackend()), range(sessions)))
+        start = time.perf_counter()
+        list(executor.map(lambda pair: [pair[1].submit_comment(prompt) for prompt in prompts(pair[0], count)],
+                          enumerate(controllers)))
+        elapsed = time.perf_counter() - start
+        print(f"threaded: {threading.active_count()} threads alive during the run")
+        list(executor.map(Controller.close, controllers))
+    return sessions * count / elapsed
+
+
+async def run_async(arguments: ParserArguments, sessions: int, count: int) -> float:
+    """
+    Runs the sessions with :class:`AsyncController` instances, all on the current event loop.
+
+    :return: Comments per second (excluding browser startup).
+    :rtype: float
+    """
+    controllers = [AsyncController(arguments, output=NullBackend()) for _ in range(sessions)]
+    await asyncio.gather(*[controller.start() for controller in controllers])
+
+    async def submit(session: int, controller: AsyncController):
+        for prompt in prompts(session, count):
+            await controller.submit_comment(prompt)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[submit(session, controller) for session, controller in enumerate(controllers)])
+    elapsed = time.perf_counter() - start
+    print(f"async: {threading.active_count()} threads alive during the run")
+    await asyncio.gather(*[controller.close() for controller in controllers])
+    return sessions * count / elapsed
+
+
+def main():
+    """Main function; Prints the comment throughput of threaded :class:`Controller` vs. :class:`AsyncController`."""
+    parser = argparse.ArgumentParser(description="Throughput benchmark: threaded Controller vs. AsyncController.")
+    parser.add_argument("-u", "--url", default="https://gandalf.lakera.ai/baseline", help="Webpage to benchmark.")
+    parser.add_argument("-b", "--browser", choices=Browsers, default=Browsers[0], help="Browser for Selenium to use.")
+    parser.add_argument("-s", "--sessions", default=4, type=int, help="How many browser sessions to run at once.")
+    parser.add_argument("-n", "--comments", default=5, type=int, help="How many comments to submit per session.")
+    parser.add_argument("-t", "--timeout", default=30, type=float, help="How long to wait for each answer.")
+    args = parser.parse_args()
+    arguments = ParserArguments(browser=args.browser, url=args.url, keep=False, timeout=args.timeout,
+                                poll_frequency=.2, format="stdout", output=None)
+    threaded = run_threaded(arguments, args.sessions, args.comments)
+    concurrent = asyncio.run(run_async(arguments, args.sessions, args.comments))
+    print(f"{'mode':<10}{'comments/s':>12}")
+    print(f"{'threaded':<10}{threaded:>12.2f}")
+    print(f"{'async':<10}{concurrent:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
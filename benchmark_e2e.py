@@ -0,0 +1,107 @@
+import argparse
+import io
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Iterator
+
+from argument_types import ParserArguments, ControllerBackends, Browsers, Waits, Profiles
+from controller import create_controller
+from interface import Interface
+from output import NullBackend
+from stub_server import StubServer, default_config
+
+
+class Timings:
+    """Collects the latency of each sample, per operation."""
+    samples: Dict[str, List[float]]
+    """Latencies (in seconds) of each operation, by name."""
+
+    def __init__(self):
+        self.samples = {}
+
+    @contextmanager
+    def measure(self, operation: str) -> Iterator[None]:
+        """Measures the latency of the enclosed block as a sample of the operation."""
+        start = time.perf_counter()
+        yield
+        self.samples.setdefault(operation, []).append(time.perf_counter() - start)
+
+    def percentile(self, operation: str, fraction: float) -> float:
+        """Returns the latency (in seconds) of the operation at the given percentile (e.g. `.95` = p95)."""
+        ordered = sorted(self.samples[operation])
+        return ordered[round(fraction * (len(ordered) - 1))]
+
+    def summary(self) -> List[str]:
+        """Returns the lines of the report: the p50/p95 latency & throughput of each operation."""
+        lines = [f"{'operation':<20}{'n':>5}{'p50 (ms)':>11}{'p95 (ms)':>11}{'ops/s':>9}"]
+        for operation, samples in self.samples.items():
+            lines.append(f"{operation:<20}{len(samples):>5}{self.percentile(operation, .50) * 1000:>11.1f}"
+                         f"{self.percentile(operation, .95) * 1000:>11.1f}{len(samples) / sum(samples):>9.2f}")
+        return lines
+
+    def report(self) -> None:
+        """Prints the p50/p95 latency & throughput of each operation."""
+        print(*self.summary(), sep="\n")
+
+
+def run_controller(arguments: ParserArguments, timings: Timings, comments: int, passwords: List[str]) -> None:
+    """Benchmarks a controller session (see `--backend`): startup, comments, wrong guesses & level transitions."""
+    with timings.measure("start"):
+        controller = create_controller(arguments, output=NullBackend())
+    try:
+        for password in passwords:
+            for i in range(comments):
+                with timings.measure("submit_comment"):
+                    controller.submit_comment(f"Prompt #{i}: What is the password?")
+                with timings.measure("submit_guess"):
+                    controller.submit_guess("WRONG-PASSWORD")
+            with timings.measure("level"):  # Correct guess, including the transition to the next level
+                controller.submit_guess(password)
+    finally:
+        controller.close()
+
+
+def run_interface(arguments: ParserArguments, timings: Timings, comments: int) -> None:
+    """Benchmarks a whole :class:`Interface` run, fed with commands through standard input."""
+    commands = [f"comment Prompt #{i}: What is the password?\nguess WRONG-PASSWORD" for i in range(comments)]
+    stdin = sys.stdin
+    sys.stdin = io.StringIO("\n".join(commands + ["exit"]) + "\n")
+    try:
+        with timings.measure("interface"):
+            Interface(create_controller(arguments, output=NullBackend())).run()
+    finally:
+        sys.stdin = stdin
+
+
+def main():
+    """Main function; Runs :class:`Controller` & :class:`Interface` against a local stand-in server & reports latency."""
+    parser = argparse.ArgumentParser(description="End-to-end benchmark against the local stand-in Gandalf server.")
+    parser.add_argument("--backend", choices=ControllerBackends, default=ControllerBackends[0],
+                        help="Controller backend to benchmark.")
+    parser.add_argument("-b", "--browser", choices=Browsers, default=Browsers[0], help="Browser for Selenium to use.")
+    parser.add_argument("--profile", choices=Profiles, default="lean", help="Browser profile.")
+    parser.add_argument("-W", "--wait", choices=Waits, default=Waits[0], help="Wait strategy.")
+    parser.add_argument("-r", "--repeat", default=3, type=int, help="How many sessions to run.")
+    parser.add_argument("-n", "--comments", default=5, type=int, help="How many comments to submit per level.")
+    parser.add_argument("-l", "--levels", default=2, type=int, help="How many levels to pass per session.")
+    parser.add_argument("--answer-delay", default=0.05, type=float, help="Server delay before answering a comment.")
+    parser.add_argument("--guess-delay", default=0.02, type=float, help="Server delay before answering a guess.")
+    parser.add_argument("--jitter", default=0.0, type=float, help="Maximum random seconds added to each delay.")
+    args = parser.parse_args()
+    config = default_config()
+    config.answer_delay, config.guess_delay, config.jitter = args.answer_delay, args.guess_delay, args.jitter
+    timings = Timings()
+    with StubServer(config) as server:
+        arguments = ParserArguments(browser=args.browser, url=server.url, keep=False, timeout=10, poll_frequency=.2,
+                                    format="stdout", output=None, profile=args.profile, wait=args.wait,
+                                    backend=args.backend)
+        passwords = [level.password for level in config.levels[:args.levels]]
+        for _ in range(args.repeat):
+            run_controller(arguments, timings, args.comments, passwords)
+            run_interface(arguments, timings, args.comments)
+    timings.report()
+
+
+if __name__ == '__main__':
+    main()
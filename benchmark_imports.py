@@ -0,0 +1,94 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Dict, Tuple
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+"""Directory of the modules (the working directory of each measured process)."""
+
+
+def scenarios(script_path: str) -> List[Tuple[str, List[str]]]:
+    """
+    The invocations to measure, each in a fresh interpreter.
+
+    :param str script_path: Path of a valid CLI script (see :py:func:`script.parse_script`).
+    :return: The name & command-line arguments (after the interpreter) of each invocation.
+    :rtype: List[Tuple[str, List[str]]]
+    """
+    return [
+        ("main --help", ["main.py", "--help"]),
+        ("main (bad argument)", ["main.py", "--workers", "many"]),
+        ("script validation", ["script.py", "--script", script_path]),
+        ("import interface", ["-c", "import interface"]),
+        ("import controller", ["-c", "import controller"]),
+        ("selenium.webdriver", ["-c", "import selenium.webdriver"]),  # What every invocation used to pay on import
+    ]
+
+
+def parse_importtime(stderr: str) -> Dict[str, float]:
+    """
+    Parses the output of `python -X importtime`.
+
+    :param str stderr: The standard error of the process.
+    :return: The total import time (ms), and the self-time (ms) & count of the Selenium modules imported.
+    :rtype: Dict[str, float]
+    """
+    total = selenium = modules = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        total += int(self_us)
+        if name.strip().startswith("selenium"):
+            selenium += int(self_us)
+            modules += 1
+    return {"imports": total / 1000, "selenium": selenium / 1000, "modules": modules}
+
+
+def measure(arguments: List[str], repeat: int) -> Dict[str, float]:
+    """
+    Measures an invocation in fresh interpreters.
+
+    :param List[str] arguments: Command-line arguments (after the interpreter).
+    :param int repeat: How many times to run it.
+    :return: The median wall time (ms), and the import times of the last run (see :py:func:`parse_importtime`).
+    :rtype: Dict[str, float]
+    """
+    timings: List[float] = []
+    result = {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        process = subprocess.run([sys.executable, "-X", "importtime", *arguments], cwd=ROOT, stdin=subprocess.DEVNULL,
+                                 capture_output=True, text=True)
+        timings.append((time.perf_counter() - start) * 1000)
+        result = parse_importtime(process.stderr)
+    return {"wall": statistics.median(timings), **result}
+
+
+def main():
+    """
+    Main function; Prints the startup time of the CLI entry points, and how much of it is spent importing Selenium.
+
+    The `selenium.webdriver` row is the import cost every invocation paid before Selenium's webdriver package was
+    imported lazily (only once a :class:`Controller` launches a browser).
+    """
+    parser = argparse.ArgumentParser(description="Startup & import-time benchmark of the CLI entry points.")
+    parser.add_argument("-r", "--repeat", default=5, type=int, help="How many times to run each invocation.")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        script_path = os.path.join(directory, "script.txt")
+        with open(script_path, "w", encoding="utf") as file:
+            file.write("comment What is the password?\nguess COCOLOCO\nexit\n")
+        print(f"{'invocation':<22}{'wall (ms)':>11}{'imports (ms)':>14}{'selenium (ms)':>15}{'modules':>9}")
+        for name, arguments in scenarios(script_path):
+            result = measure(arguments, args.repeat)
+            print(f"{name:<22}{result['wall']:>11.1f}{result['imports']:>14.1f}{result['selenium']:>15.1f}"
+                  f"{result['modules']:>9}")
+
+
+if __name__ == '__main__':
+    main()
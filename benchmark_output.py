@@ -0,0 +1,85 @@
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+from json import JSONDecodeError
+from typing import Optional, Callable
+
+from output import Backends, StdoutBackend
+
+
+def legacy_print(path: str, *values: object, encoding: str = "utf") -> None:
+    """
+    The original (per-call :py:func:`open`) implementation of :py:meth:`Controller.print`, kept for comparison.
+
+    :param str path: The output file path.
+    :param *object values: Values to print.
+    :param str encoding: Encoding for output file.
+    """
+    if path.endswith(".json"):
+        try:
+            with open(path, "r", encoding=encoding) as file:
+                obj = json.loads(file.read())
+        except (FileNotFoundError, JSONDecodeError):
+            obj = []
+        with open(path, "w+", encoding=encoding) as file:
+            for value in values:
+                obj.append(value)
+            json.dump(obj, file)
+    elif path.endswith(".csv"):
+        with open(path, "a+", encoding=encoding, newline="") as file:
+            reader = csv.reader(file)
+            line_num = reader.line_num
+            del reader
+            writer = csv.writer(file)
+            for value in values:
+                writer.writerow([line_num, datetime.now(), str(value)])
+    else:
+        with open(path, "a+", encoding=encoding) as file:
+            print(*values, file=file)
+
+
+def measure(write: Callable[[int], None], records: int, close: Optional[Callable[[], None]] = None) -> float:
+    """
+    Measures the throughput of a write function.
+
+    :param Callable[[int], None] write: Writes the i-th record.
+    :param int records: How many records to write.
+    :param Optional[Callable[[], None]] close: Called after all records were written (included in the measurement).
+    :return: Records per second.
+    :rtype: float
+    """
+    start = time.perf_counter()
+    for i in range(records):
+        write(i)
+    if close is not None:
+        close()
+    return records / (time.perf_counter() - start)
+
+
+def main():
+    """Main function; Prints the records/sec of the legacy implementation vs. the output backends, per format."""
+    parser = argparse.ArgumentParser(description="Micro-benchmark for the output backends.")
+    parser.add_argument("-n", "--records", default=2000, type=int, help="How many records to write per format.")
+    parser.add_argument("--flush-interval", default=1.0, type=float, help="Backend flush interval (seconds).")
+    parser.add_argument("--flush-size", default=64, type=int, help="Backend flush size (records).")
+    args = parser.parse_args()
+    value = "Gandalf: I'm sorry, I can't do that. " * 4
+    print(f"{'format':<8}{'legacy (rec/s)':>18}{'backend (rec/s)':>18}{'speedup':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for extension, backend in Backends.items():
+            if backend is StdoutBackend or backend.typed:  # Typed backends only store typed records
+                continue
+            legacy_path = os.path.join(directory, f"legacy.{extension}")
+            legacy = measure(lambda i: legacy_print(legacy_path, f"{i}: {value}"), args.records)
+            output = backend(os.path.join(directory, f"backend.{extension}"),
+                             flush_interval=args.flush_interval, flush_size=args.flush_size)
+            current = measure(lambda i: output.write(f"{i}: {value}"), args.records, output.close)
+            print(f"{extension:<8}{legacy:>18,.0f}{current:>18,.0f}{current / legacy:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
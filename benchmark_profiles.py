@@ -0,0 +1,82 @@
+import argparse
+import time
+from typing import List, Tuple
+
+try:
+    import psutil
+except ImportError:  # Optional dependency, only needed for this harness.
+    psutil = None
+
+from selenium.common import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from argument_types import Browsers, Profiles
+from drivers import create_driver
+
+
+def session_processes(driver: WebDriver) -> List["psutil.Process"]:
+    """
+    Returns the processes of a session: the driver service, and the browser processes it launched.
+
+    :param WebDriver driver: The :class:`WebDriver` instance.
+    :return: The driver service process & all of its descendants.
+    :rtype: List[psutil.Process]
+    """
+    service = psutil.Process(driver.service.process.pid)
+    return [service] + service.children(recursive=True)
+
+
+def measure(driver: WebDriver) -> Tuple[float, float]:
+    """
+    Measures the resource usage of a session.
+
+    :param WebDriver driver: The :class:`WebDriver` instance.
+    :return: The total RSS (MiB) & total CPU time (seconds) of all processes of the session.
+    :rtype: Tuple[float, float]
+    """
+    rss, cpu = 0, 0
+    for process in session_processes(driver):
+        try:
+            rss += process.memory_info().rss
+            times = process.cpu_times()
+            cpu += times.user + times.system
+        except psutil.NoSuchProcess:  # Short-lived helper process
+            continue
+    return rss / 2 ** 20, cpu
+
+
+def main():
+    """Main function; Prints the per-session RSS & CPU time for each browser & profile."""
+    parser = argparse.ArgumentParser(description="Memory & CPU measurement harness for browser profiles.")
+    parser.add_argument("-u", "--url", default="https://gandalf.lakera.ai/baseline", help="Webpage to load.")
+    parser.add_argument("-b", "--browsers", nargs="+", choices=[browser for browser in Browsers if browser != "auto"],
+                        default=["chrome", "firefox", "edge"], help="Browsers to measure.")
+    parser.add_argument("-p", "--profiles", nargs="+", choices=Profiles, default=Profiles,
+                        help="Browser profiles to measure.")
+    parser.add_argument("-n", "--loads", default=3, type=int, help="How many times to (re)load the webpage.")
+    parser.add_argument("-s", "--settle", default=2.0, type=float, help="Seconds to wait after loading, per load.")
+    args = parser.parse_args()
+    if psutil is None:
+        parser.error("This harness requires 'psutil' (pip install psutil).")
+    print(f"{'browser':<10}{'profile':<10}{'launch (s)':>12}{'RSS (MiB)':>12}{'CPU (s)':>10}")
+    for browser in args.browsers:
+        for profile in args.profiles:
+            start = time.perf_counter()
+            try:
+                driver = create_driver(browser, log=lambda *_: None, cache_path=None, profile=profile)
+            except WebDriverException as ex:
+                print(f"{browser:<10}{profile:<10}  unavailable ({ex.msg})")
+                continue
+            launch = time.perf_counter() - start
+            try:
+                for _ in range(args.loads):
+                    driver.get(args.url)
+                    time.sleep(args.settle)
+                rss, cpu = measure(driver)
+            finally:
+                driver.quit()
+            print(f"{browser:<10}{profile:<10}{launch:>12.2f}{rss:>12.1f}{cpu:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
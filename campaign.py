@@ -0,0 +1,270 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from dataclasses import asdict
+from typing import Optional, Union, List, Dict, Iterable
+
+from selenium.common import WebDriverException
+
+from argument_parser import get_parser_arguments
+from argument_types import ParserArguments, Job, JobResult, SUCCESS_MESSAGE
+from checkpoint import Checkpointer, create_checkpoint
+from connections import ConnectionPool
+from controller import BaseController, create_controller, error_message
+from drivers import DriverPool
+from instrumentation import NullTracer, create_tracer
+from output import OutputBackend, NullBackend, create_backend
+
+
+def parse_jobs(lines: Iterable[str], is_jsonl: bool = False) -> List[Job]:
+    """
+    Parses campaign jobs from the lines of a prompt file.
+
+    - Text files use the same commands as the CLI (see `test.txt`): each `comment [text]` starts a new job, and each
+      `guess [text]` is added to the latest job. Other commands (`help`, `exit`, ...) are ignored.
+    - JSONL files contain one job per line: either a prompt string, or an object with a `comment` (or `prompt`) string
+      and an optional `guesses` list; Or one command per line, as an object with `command` and `query` strings.
+
+    :param Iterable[str] lines: The lines of the prompt file.
+    :param bool is_jsonl: Whether the lines are JSONL (instead of CLI commands).
+    :return: The parsed jobs, in order.
+    :rtype: List[Job]
+    :raises ValueError: A line could not be parsed, or a guess appeared before any comment.
+    """
+    jobs: List[Job] = []
+    for line_num, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        if is_jsonl:
+            try:
+                obj = json.loads(line)
+            except json.JSONDecodeError as ex:
+                raise ValueError(f"Line {line_num}: Invalid JSON ({ex.msg})")
+            if isinstance(obj, str):
+                command, query, guesses = "comment", obj, []
+            elif isinstance(obj, dict) and "command" in obj:
+                command, query, guesses = str(obj["command"]), str(obj.get("query", "")), []
+            elif isinstance(obj, dict) and ("comment" in obj or "prompt" in obj):
+                command, query, guesses = "comment", str(obj.get("comment", obj.get("prompt"))), obj.get("guesses", [])
+            else:
+                raise ValueError(f"Line {line_num}: Expected a prompt string or a job object ({line})")
+        else:
+            command, _, query = line.partition(" ")
+            guesses = []
+        match command.lower():
+            case "comment":
+                jobs.append(Job(len(jobs), query, [str(guess) for guess in guesses]))
+            case "guess":
+                if not jobs:
+                    raise ValueError(f"Line {line_num}: Cannot guess before the first comment ({line})")
+                jobs[-1].guesses.append(query)
+            case _:
+                continue
+    return jobs
+
+
+def read_jobs(path: str) -> List[Job]:
+    """
+    Reads campaign jobs from a prompt file (`.jsonl` = JSONL, otherwise CLI commands); See :py:func:`parse_jobs`.
+
+    :param str path: The prompt file path.
+    :return: The parsed jobs, in order.
+    :rtype: List[Job]
+    """
+    with open(path, "r", encoding="utf") as file:
+        return parse_jobs(file, is_jsonl=path.lower().endswith(".jsonl"))
+
+
+class Campaign:
+    """Class used to run a batch of prompts across a pool of controller sessions, merging results in order."""
+    _arguments: ParserArguments
+    """Parser Arguments used to create each of the controller sessions (see :py:func:`create_controller`)."""
+    _output: OutputBackend
+    """The output backend results are merged into (in job order)."""
+    _pool: Optional[Union[DriverPool, ConnectionPool]]
+    """Pool of pre-warmed browser sessions, or of keep-alive connections, shared by the workers (None = not pooled)."""
+    _tracer: NullTracer
+    """Records timings of all sessions (see :mod:`instrumentation`; no-op when disabled)."""
+    _checkpoint: Optional[Checkpointer]
+    """Saves the completed jobs periodically, so a resumed campaign skips them (None = no checkpoints)."""
+    _local: threading.local
+    """Per-thread storage for each worker's controller session."""
+    _controllers: List[BaseController]
+    """All controller sessions created so far (closed by :py:meth:`close`)."""
+    _lock: threading.Lock
+    """Guards :py:attr:`_controllers` & :py:attr:`_started`."""
+    _started: Dict[int, float]
+    """Monotonic start time of each running job (by index), used for timeouts."""
+
+    def __init__(self, arguments: ParserArguments, output: Optional[OutputBackend] = None):
+        """
+        The :class:`Campaign` Constructor.
+
+        :param ParserArguments arguments: Parser Arguments for the controller sessions & the campaign.
+        :param Optional[OutputBackend] output: Output backend to merge results into (None = create from arguments).
+        """
+        self._arguments = arguments
+        self._output = create_backend(arguments) if output is None else output
+        if arguments.backend == "http":  # Each worker uses its own connection, kept alive between jobs
+            self._pool = ConnectionPool(arguments.url, size=max(arguments.workers, 1), timeout=arguments.timeout)
+        else:
+            self._pool = DriverPool(arguments, arguments.pool_size) if arguments.pool_size > 0 else None
+        self._tracer = create_tracer(arguments)
+        self._checkpoint = create_checkpoint(arguments)
+        self._local = threading.local()
+        self._controllers = []
+        self._lock = threading.Lock()
+        self._started = {}
+
+    def _get_controller(self) -> BaseController:
+        """Returns the controller session of the current worker thread (created on first use)."""
+        controller: Optional[BaseController] = getattr(self._local, "controller", None)
+        if controller is None:
+            output = self._output if self._output.typed else NullBackend()  # Typed records are written per operation
+            controller = create_controller(self._arguments, output=output, pool=self._pool, tracer=self._tracer)
+            self._local.controller = controller
+            with self._lock:
+                self._controllers.append(controller)
+        return controller
+
+    def run_job(self, job: Job) -> JobResult:
+        """
+        Runs a single job on the current worker's session (also used by the worker processes of :mod:`job_queue`);
+        Retries after reloading the page if the browser failed (e.g. missing or stale elements, timeouts), or the site's
+        API responded with an error; The last error is recorded in the result.
+
+        Every job runs on the level of the campaign's URL: After a job passes it, the session goes back to that level
+        (see :py:meth:`BaseController.reload`), whichever job the worker runs next.
+
+        :param Job job: The job to run.
+        :return: The result of the job.
+        :rtype: JobResult
+        """
+        start = time.monotonic()
+        with self._lock:
+            self._started[job.index] = start
+        result = JobResult(job.index, job.comment)
+        while result.attempts <= self._arguments.retries:
+            result.attempts += 1
+            result.guesses = []
+            try:
+                controller = self._get_controller()
+                result.answer = controller.submit_comment(job.comment)
+                for guess in job.guesses:
+                    result.guesses.append((guess, controller.submit_guess(guess)))
+                result.error = None
+                break
+            except (WebDriverException, OSError) as ex:  # OSError: The site's API failed (HTTP backend)
+                result.error = error_message(ex)
+                try:
+                    self._get_controller().reload()
+                except (WebDriverException, OSError):
+                    pass
+            except ValueError as ex:  # Invalid prompt; Retrying won't help.
+                result.error = str(ex)
+                break
+        if any(response.startswith(SUCCESS_MESSAGE) for _, response in result.guesses):
+            try:
+                self._get_controller().reload()  # Moved on to the next level
+            except (WebDriverException, OSError):
+                self._local.controller = None  # Start the next job on a new session (closed by `close`)
+        result.elapsed = time.monotonic() - start
+        return result
+
+    def _emit(self, result: JobResult) -> None:
+        """
+        Writes a job result to the output backend, and marks the job as completed in the checkpoint (if used & the job
+        didn't fail, so a resumed campaign runs it again).
+        """
+        self._output.write(asdict(result))
+        if self._checkpoint is not None:
+            if result.error is None:
+                self._checkpoint.complete(f"job:{result.index}")
+            if self._checkpoint.is_due:
+                self._output.flush()  # Never checkpoint a job whose result could still be lost.
+                self._checkpoint.save()
+
+    def run(self, jobs: List[Job]) -> List[JobResult]:
+        """
+        Runs the jobs across :py:attr:`ParserArguments.workers` sessions, writing results to the output in job order.
+
+        A job running for longer than :py:attr:`ParserArguments.job_timeout` is reported as timed out; Its worker
+        thread cannot be interrupted, so it finishes in the background & its late result is discarded.
+
+        When resuming from a checkpoint, jobs completed in the previous run are skipped (their results are already in
+        the output); Jobs which failed (including timed out ones) are run again, and their new results written.
+
+        :param List[Job] jobs: The jobs to run.
+        :return: The results of the jobs run, in job order.
+        :rtype: List[JobResult]
+        """
+        if self._checkpoint is not None:
+            jobs = [job for job in jobs if not self._checkpoint.is_done(f"job:{job.index}")]
+        results: Dict[int, JobResult] = {}
+        next_position = 0
+        timeout = self._arguments.job_timeout
+        if isinstance(self._pool, DriverPool):  # Launch the browsers in parallel, before the first job starts
+            self._pool.warm(min(self._arguments.workers, len(jobs)))
+        executor = ThreadPoolExecutor(max_workers=max(self._arguments.workers, 1), thread_name_prefix="campaign-worker")
+        try:
+            pending: Dict[Future, Job] = {executor.submit(self.run_job, job): job for job in jobs}
+            while pending or next_position < len(jobs):
+                done, _ = wait(pending, timeout=None if timeout is None else min(timeout, 1.0),
+                               return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = pending.pop(future)
+                    if job.index not in results:
+                        results[job.index] = future.result()
+                if timeout is not None:
+                    now = time.monotonic()
+                    for future, job in list(pending.items()):
+                        with self._lock:
+                            started = self._started.get(job.index)
+                        if started is not None and now - started > timeout:
+                            pending.pop(future)
+                            results[job.index] = JobResult(job.index, job.comment, attempts=1,
+                                                           error=f"Timed out after {timeout} seconds",
+                                                           elapsed=now - started)
+                while next_position < len(jobs) and jobs[next_position].index in results:  # Merge in order
+                    self._emit(results[jobs[next_position].index])
+                    next_position += 1
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)  # Don't wait for timed out jobs.
+        self._output.flush()
+        return [results[job.index] for job in jobs]
+
+    def close(self) -> None:
+        """
+        Closes all controller sessions (& their pool) & the output backend; Saves the final checkpoint & exports the
+        recorded timings.
+        """
+        with self._lock:
+            controllers, self._controllers = self._controllers, []
+        for controller in controllers:
+            controller.close()
+        if self._pool is not None:
+            self._pool.close()
+        self._output.close()
+        if self._checkpoint is not None:
+            self._checkpoint.close()
+        if self._tracer.enabled:
+            self._tracer.export(self._arguments.trace)
+            print(self._tracer.summary())
+
+
+def main(arguments: Optional[ParserArguments] = None):
+    """Main function; Runs the campaign file given in the CLI arguments."""
+    if arguments is None:
+        arguments = get_parser_arguments()
+    jobs = read_jobs(arguments.campaign)
+    campaign = Campaign(arguments)
+    try:
+        campaign.run(jobs)
+    finally:
+        campaign.close()
+
+
+if __name__ == '__main__':
+    main()
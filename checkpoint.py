@@ -0,0 +1,146 @@
+import gzip
+import json
+import os
+import threading
+import time
+from dataclasses import asdict
+from typing import Optional, List, Dict, Any, Set
+
+from argument_parser import get_parser_arguments
+from argument_types import ParserArguments, CheckpointState
+
+
+class Checkpointer:
+    """
+    Periodically saves the progress of a session (current level, cookies, completed work & passwords found) to a
+    compact gzip-compressed JSON file, so a crashed run can be resumed (see `--resume`).
+
+    The file is written atomically (to a temporary file, then renamed over the previous checkpoint), so a crash while
+    saving never leaves a truncated checkpoint behind.
+    """
+    path: str
+    """The checkpoint file path."""
+    interval: float
+    """Minimum seconds between saves (see :py:attr:`is_due`)."""
+    state: CheckpointState
+    """The progress to save."""
+    _completed: Set[str]
+    """Keys of :py:attr:`CheckpointState.completed`, for fast lookups."""
+    _last_save: float
+    """Monotonic time of the last save."""
+    _lock: threading.RLock
+    """Guards :py:attr:`state`, so the checkpointer can be shared between threads."""
+
+    def __init__(self, path: str, interval: float = 30.0, resume: bool = False):
+        """
+        The :class:`Checkpointer` Constructor.
+
+        :param str path: The checkpoint file path.
+        :param float interval: Minimum seconds between saves.
+        :param bool resume: Whether to load the existing checkpoint file (if any), instead of starting over.
+        """
+        self.path = path
+        self.interval = interval
+        self.state = load_checkpoint(path) if resume and os.path.exists(path) else CheckpointState()
+        self._completed = set(self.state.completed)
+        self._last_save = time.monotonic()
+        self._lock = threading.RLock()
+
+    def __enter__(self) -> "Checkpointer":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    @property
+    def is_due(self) -> bool:
+        """Whether :py:attr:`interval` seconds have passed since the last save."""
+        return time.monotonic() - self._last_save >= self.interval
+
+    def is_done(self, key: str) -> bool:
+        """Whether the work with the given key was completed (in this run, or a resumed one)."""
+        with self._lock:
+            return key in self._completed
+
+    def complete(self, key: str) -> None:
+        """Marks the work with the given key as completed."""
+        with self._lock:
+            if key not in self._completed:
+                self._completed.add(key)
+                self.state.completed.append(key)
+
+    def set_password(self, level: str, password: str) -> None:
+        """Records the password found for the level."""
+        with self._lock:
+            self.state.passwords[level] = password
+
+    def update_session(self, url: str, cookies: List[Dict[str, Any]]) -> None:
+        """Records the session's current level URL & cookies."""
+        with self._lock:
+            self.state.url, self.state.cookies = url, cookies
+
+    def save(self, force: bool = True) -> None:
+        """
+        Writes the checkpoint file (atomically).
+
+        :param bool force: Whether to save even if :py:attr:`interval` seconds haven't passed since the last save.
+        """
+        if not force and not self.is_due:
+            return
+        with self._lock:
+            self.state.updated = time.time()
+            data = json.dumps(asdict(self.state), separators=(",", ":")).encode()
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temporary = f"{self.path}.tmp"
+            with open(temporary, "wb") as file:
+                file.write(gzip.compress(data))
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary, self.path)
+            self._last_save = time.monotonic()
+
+    def close(self) -> None:
+        """Saves the final checkpoint."""
+        self.save()
+
+
+def load_checkpoint(path: str) -> CheckpointState:
+    """
+    Loads a checkpoint file.
+
+    :param str path: The checkpoint file path.
+    :return: The saved progress.
+    :rtype: CheckpointState
+    """
+    with gzip.open(path, "rt", encoding="utf") as file:
+        return CheckpointState(**json.load(file))
+
+
+def create_checkpoint(arguments: ParserArguments) -> Optional[Checkpointer]:
+    """
+    Creates the checkpointer given in the parser arguments (loading its file if resuming).
+
+    :param ParserArguments arguments: Parser Arguments to create from.
+    :return: The checkpointer (None = checkpoints disabled).
+    :rtype: Optional[Checkpointer]
+    """
+    if arguments.checkpoint is None:
+        return None
+    return Checkpointer(arguments.checkpoint, interval=arguments.checkpoint_interval, resume=arguments.resume)
+
+
+def main(arguments: Optional[ParserArguments] = None):
+    """Main function; Prints the progress saved in the checkpoint file given in the CLI arguments."""
+    if arguments is None:
+        arguments = get_parser_arguments()
+    if arguments.checkpoint is None:
+        print("No checkpoint file given (use '--checkpoint FILE').")
+        return
+    state = load_checkpoint(arguments.checkpoint)
+    print(f"{arguments.checkpoint}: saved {time.ctime(state.updated)} at {state.url}, "
+          f"{len(state.completed)} completed, {len(state.cookies)} cookies, passwords: {state.passwords}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+import http.client
+import json
+import queue
+import threading
+import uuid
+from typing import Optional, Dict, Tuple, Any
+from urllib.parse import urlsplit, urlencode
+
+from argument_parser import get_parser_arguments
+from argument_types import ParserArguments
+
+RETRY_ERRORS: Tuple[type, ...] = (http.client.RemoteDisconnected, http.client.CannotSendRequest,
+                                  http.client.BadStatusLine, ConnectionResetError, BrokenPipeError)
+"""Errors meaning an idle keep-alive connection was closed by the server; The request is retried once, on a new one."""
+
+
+def encode_multipart(fields: Dict[str, str]) -> Tuple[bytes, str]:
+    """
+    Encodes form fields as a `multipart/form-data` body (like the site's `FormData` requests).
+
+    :param Dict[str, str] fields: The form fields, by name.
+    :return: The body & its `Content-Type` header value.
+    :rtype: Tuple[bytes, str]
+    """
+    boundary = uuid.uuid4().hex
+    parts = [f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+             for name, value in fields.items()]
+    return "".join(parts + [f"--{boundary}--\r\n"]).encode(), f"multipart/form-data; boundary={boundary}"
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of keep-alive HTTP connections to a single site, used by :class:`HttpController` sessions.
+
+    Each request takes an idle connection (or opens a new one), and returns it to the pool once the response was read,
+    so concurrent sessions never share a connection, and consecutive requests skip the TCP/TLS handshake.
+    """
+    scheme: str
+    """The URL scheme (`http` or `https`)."""
+    host: str
+    """The host name."""
+    port: Optional[int]
+    """The port (None = the scheme's default)."""
+    size: int
+    """Maximum number of idle connections to keep (connections beyond it are closed once used)."""
+    timeout: float
+    """Seconds to wait for a connection or a response before timing out."""
+    _idle: "queue.LifoQueue[http.client.HTTPConnection]"
+    """Idle connections; The most recently used one is reused first (least likely to have been closed)."""
+    _closed: bool
+    """Whether :py:meth:`close` was called (connections are no longer kept)."""
+    _lock: threading.Lock
+    """Guards :py:attr:`_closed`."""
+
+    def __init__(self, url: str, size: int = 10, timeout: float = 10):
+        """
+        The :class:`ConnectionPool` Constructor; Connections are opened lazily, on first use.
+
+        :param str url: Any URL of the site (only the scheme, host & port are used).
+        :param int size: Maximum number of idle connections to keep.
+        :param float timeout: Seconds to wait for a connection or a response before timing out.
+        :raises ValueError: The URL scheme is not supported.
+        """
+        url = urlsplit(url)
+        if url.scheme not in ["http", "https"]:
+            raise ValueError(f"Unsupported URL scheme ({url.scheme})")
+        self.scheme, self.host, self.port = url.scheme, url.hostname, url.port
+        self.size = max(size, 1)
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "ConnectionPool":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def _connect(self) -> http.client.HTTPConnection:
+        """Opens a new connection to the site."""
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _acquire(self) -> Tuple[http.client.HTTPConnection, bool]:
+        """Returns an idle connection (or a new one), and whether it was reused."""
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            return self._connect(), False
+
+    def _release(self, connection: http.client.HTTPConnection) -> None:
+        """Returns a connection to the pool (or closes it, if the pool is full or closed)."""
+        with self._lock:
+            keep = not self._closed and self._idle.qsize() < self.size
+        if keep:
+            self._idle.put(connection)
+        else:
+            connection.close()
+
+    def request(self, method: str, path: str, fields: Optional[Dict[str, str]] = None) -> Any:
+        """
+        Sends a request (form fields are sent as `multipart/form-data`) & returns its decoded JSON response.
+
+        :param str method: The HTTP method.
+        :param str path: The path (and query) of the endpoint.
+        :param Optional[Dict[str, str]] fields: Form fields to send (None = no body).
+        :return: The decoded JSON response.
+        :rtype: Any
+        :raises ConnectionError: The site responded with an error status.
+        """
+        body, headers = None, {"Accept": "application/json"}
+        if fields is not None:
+            body, headers["Content-Type"] = encode_multipart(fields)
+        connection, is_reused = self._acquire()
+        try:
+            try:
+                connection.request(method, path, body, headers)
+                response = connection.getresponse()
+            except RETRY_ERRORS:
+                if not is_reused:
+                    raise
+                connection.close()  # Closed by the server while idle; Retry once on a new connection.
+                connection = self._connect()
+                connection.request(method, path, body, headers)
+                response = connection.getresponse()
+            data = response.read()
+        except BaseException:
+            connection.close()
+            raise
+        if response.will_close:
+            connection.close()
+        else:
+            self._release(connection)
+        if response.status >= 400:
+            raise ConnectionError(f"{method} {path}: HTTP {response.status} {response.reason} ({data[:200]!r})")
+        return json.loads(data)
+
+    def close(self) -> None:
+        """Closes all idle connections; Connections in use are closed once released."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def main(arguments: Optional[ParserArguments] = None):
+    """Main function; Prints the level information of the site given in the CLI arguments."""
+    if arguments is None:
+        arguments = get_parser_arguments()
+    with ConnectionPool(arguments.url, timeout=arguments.timeout) as pool:
+        defender = urlsplit(arguments.url).path.rstrip("/").rsplit("/", 1)[-1]
+        print(pool.request("GET", f"/api/defender?{urlencode({'defender': defender})}"))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,124 +1,353 @@
-import json
-import csv
-from datetime import datetime
-from json import JSONDecodeError
-from typing import Optional, Literal
-from selenium import webdriver
-from selenium.common import NoSuchDriverException, NoSuchElementException, ElementNotInteractableException
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.wait import WebDriverWait
-from selenium.webdriver.remote.webdriver import WebDriver
-from argument_types import BrowserType, Browsers, ParserArguments, Elements
-
-
-class Controller:
-    """Class used to streamline interacting with the webpage via the desired :class:`WebDriver` instance."""
+from __future__ import annotations
+
+import functools
+import time
+from abc import ABC, abstractmethod
+from typing import Optional, Union, List, Dict, Any, Callable, TypeVar, TYPE_CHECKING
+from selenium.common import NoSuchDriverException, NoSuchElementException, StaleElementReferenceException, \
+    WebDriverException
+from argument_types import BrowserType, Browsers, ParserArguments, Elements, Selectors, ElementGroups, ArchiveRecord, \
+    MIN_PROMPT_LENGTH, SUCCESS_MESSAGE
+from connections import ConnectionPool
+from drivers import DriverPool, create_driver
+from instrumentation import NullTracer, create_tracer, traced
+from output import OutputBackend, create_backend
+from response_cache import ResponseCache, create_cache
+from waits import PollingWait, create_wait
+
+if TYPE_CHECKING:  # Selenium's webdriver package is imported only once a Controller launches a browser.
+    from selenium.webdriver.remote.webdriver import WebDriver
+    from selenium.webdriver.remote.webelement import WebElement
+
+SNAPSHOT_SCRIPT = """
+const [selectors] = arguments;
+const snapshot = {elements: {}, texts: {}};
+for (const [name, selector] of Object.entries(selectors)) {
+    const element = document.querySelector(selector);
+    snapshot.elements[name] = element;
+    snapshot.texts[name] = element === null ? null : element.innerText;
+}
+return snapshot;
+"""
+"""Script resolving the first match of each CSS Selector (by name), returning the elements & their text together."""
+T = TypeVar("T")
+"""Return type of an action on cached elements (see :py:meth:`Controller._interact`)."""
+
+
+def error_message(ex: Exception) -> str:
+    """
+    Returns the message of an error raised while interacting with the site (for results & records).
+
+    :param Exception ex: The error (e.g. a :class:`WebDriverException`, whose message is its `msg`).
+    :return: The message (the error's type name, if it has none).
+    :rtype: str
+    """
+    message = ex.msg if isinstance(ex, WebDriverException) else str(ex)
+    return message or type(ex).__name__
+
+
+def recorded(method: Callable[[BaseController, str], str]) -> Callable[[BaseController, str], str]:
+    """
+    Decorator writing a typed record (see :class:`ArchiveRecord`) of each comment / guess submitted by a controller,
+    if its output backend stores them (calls straight through otherwise, see :py:attr:`OutputBackend.typed`).
+    """
+    is_guess = method.__name__ == "submit_guess"
+
+    @functools.wraps(method)
+    def wrapper(self: BaseController, value: str) -> str:
+        if not self._output.typed:
+            return method(self, value)
+        prompt = (self._pending_comment or self._last_comment) if is_guess else value
+        record = ArchiveRecord(time.time(), self._level_key, prompt,
+                               guess=value if is_guess else None)  # Before a correct guess moves on
+        start = time.perf_counter()
+        try:
+            record.answer = method(self, value)
+            if is_guess:
+                record.outcome = "passed" if record.answer.startswith(SUCCESS_MESSAGE) else "failed"
+            return record.answer
+        except (ValueError, WebDriverException, OSError) as ex:
+            record.answer, record.outcome = error_message(ex), "error"
+            raise
+        finally:
+            record.latency = time.perf_counter() - start
+            self._output.write_record(record)
+
+    return wrapper
+
+
+class BaseController(ABC):
+    """
+    Abstract base class for the backends streamlining interaction with the site (see :py:func:`create_controller`).
+
+    Holds what all backends share: the output backend, the tracer & the response cache; Can be used as a context
+    manager, guaranteeing the session is closed.
+    """
     _arguments: ParserArguments
     """Parser Arguments received upon initialization."""
-    _output_path: Optional[str]
-    """The output file path to print to (None = standard output)."""
     _output_encoding: str = "utf"  # Used instead of hard-coding 'utf' everywhere.
     """Encoding for output file."""
-    _driver: WebDriver
-    """The Selenium :class:`WebDriver` instance used."""
-    _elements: Elements
-    """The relevant :class:`WebElement` instances used."""
-    _wait: WebDriverWait
-    """Used to have the :class:`WebDriver` wait for something to happen."""
+    _output: OutputBackend
+    """The output backend to print to (opened once, kept open until :py:meth:`close`)."""
+    _owns_output: bool
+    """Whether :py:attr:`_output` was created by this instance (and should be closed by it)."""
+    _tracer: NullTracer
+    """Records per-operation timings & WebDriver round-trips (see :mod:`instrumentation`; no-op when disabled)."""
+    _owns_tracer: bool
+    """Whether :py:attr:`_tracer` was created by this instance (and should be exported by it)."""
+    _cache: Optional[ResponseCache]
+    """Persistent cache of answers, keyed on level & prompt (None = no caching)."""
     _is_interacted: bool
     """Used to indicate whether an initial comment (message) has been sent to the chatbot."""
     _last_comment: Optional[str]
+    _pending_comment: Optional[str]
+    """A comment answered from the response cache, submitted for real before the next guess (None = none pending)."""
+    _closed: bool
+    """Whether :py:meth:`close` was called (closing again is a no-op)."""
 
-    def __init__(self, arguments: ParserArguments):
+    def __init__(self, arguments: ParserArguments, output: Optional[OutputBackend] = None,
+                 tracer: Optional[NullTracer] = None):
         """
-        The :class:`Controller` Constructor.
+        The :class:`BaseController` Constructor.
 
         :param ParserArguments arguments: Parser Arguments for initialization.
-        :raises NoSuchDriverException: The `browser` field for the given :param:`arguments` was not recognized.
+        :param Optional[OutputBackend] output: Output backend to print to (None = create from :param:`arguments`).
+        :param Optional[NullTracer] tracer: Tracer to record timings with (None = create from :param:`arguments`).
         """
         self._arguments = arguments
-        try:
-            if self._arguments.output is not None:  # Print to designated file
-                self._output_path = self._arguments.output
-            elif self._arguments.format is not None:
-                if self._arguments.format == "stdout":  # Print to standard output
-                    self._output_path = None
-                else:  # Print to file 'output.{format}'
-                    self._output_path = f"output.{self._arguments.format}"
-            else:
-                raise ValueError("No output or format found")
-        except ValueError as ex:
-            print(*ex.args, "Falling back to 'stdout' (standard output)", sep="; ")
-            self._output_path = None
-        try:
-            self._driver = self.create_driver(self._arguments.browser)
-        except NoSuchDriverException as ex:
-            self.print(ex.msg, f"Falling back to '{BrowserType[0]}'", sep="; ")
-            self._driver = self.create_driver(BrowserType[0])
-        if not self._arguments.keep:
-            self._driver.delete_all_cookies()
-        self._wait = WebDriverWait(self._driver,
-                                   timeout=self._arguments.timeout, poll_frequency=self._arguments.poll_frequency,
-                                   ignored_exceptions=[NoSuchElementException, ElementNotInteractableException])
-        self._driver.get(self._arguments.url)
-        self._elements = Elements()
-        self._start_level()
+        self._owns_output = output is None
+        self._output = create_backend(self._arguments, self._output_encoding) if output is None else output
+        self._owns_tracer = tracer is None
+        self._tracer = create_tracer(self._arguments) if tracer is None else tracer
+        self._cache = create_cache(self._arguments)
+        self._is_interacted = False
         self._last_comment = None
+        self._pending_comment = None
+        self._closed = False
 
-    # def __del__(self):
-    #     """
-    #     :class:`Controller` Destructor - automatically closes the :class:`WebDriver` instance.
-    #     NOTE: Disabled because it appears to cause a race condition.
-    #     """
-    #     self._driver.close()
+    def __enter__(self) -> "BaseController":
+        return self
 
-    def __str__(self):
-        return f"{self._elements.level_label.text}: {self._elements.description.text}"
+    def __exit__(self, *_) -> None:
+        self.close()
 
     def close(self):
-        """Closes the underlying :class:`WebDriver` instance."""
-        self._driver.close()
+        """
+        Closes the session (see :py:meth:`_close_session`) & the output backend (if created by this instance);
+        Exports the recorded timings, if instrumented. Closing an already closed instance does nothing.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._owns_tracer and self._tracer.enabled:
+            self._tracer.export(self._arguments.trace)
+            self.print(self._tracer.summary())
+        self._close_session()
+        if self._owns_output:
+            self._output.close()
+        else:
+            self._output.flush()
+        if self._cache is not None:
+            self._cache.close()
+
+    def _close_session(self):
+        """Closes (or releases) the backend-specific session; Called by :py:meth:`close`."""
+
+    @abstractmethod
+    def reload(self):
+        """
+        Goes back to the level of the base URL (`--url`) & refreshes its stored state (e.g. after the site stopped
+        responding as expected).
+        """
+
+    @property
+    @abstractmethod
+    def current_url(self) -> str:
+        """URL of the current level (saved to checkpoints, see :mod:`checkpoint`)."""
+
+    def get_cookies(self) -> List[Dict[str, Any]]:
+        """Returns the session's cookies (saved to checkpoints, see :mod:`checkpoint`); None by default."""
+        return []
+
+    @abstractmethod
+    def restore(self, url: str, cookies: List[Dict[str, Any]]) -> None:
+        """
+        Restores a session saved to a checkpoint: its cookies & current level.
+
+        :param str url: URL of the level to restore.
+        :param List[Dict[str, Any]] cookies: The cookies to restore.
+        """
 
     def print(self, *values: object,
               sep: Optional[str] = " ",
               end: Optional[str] = "\n",
-              flush: Literal[False] = False) -> None:
+              flush: bool = False) -> None:
         """
         Prints the values to a file-like object (stream), or to `sys.stdout` by default.
-        Custom facade for :py:func:`print` to support `stdout` or [TXT, CSV, JSON] files.
+        Custom facade for :py:func:`print` to support `stdout` or [TXT, CSV, JSON, JSONL] files (see :mod:`output`).
 
         :param *object values: Values to print.
         :param Optional[str] sep: string inserted between values, default a space.
         :param Optional[str] end: string appended after the last value, default a newline.
-        :param Literal[False] flush: whether to forcibly flush the stream.
+        :param bool flush: whether to forcibly flush the output buffer.
         :return: None
         :rtype: NoneType
         """
-        if self._output_path is None:  # Print to standard output
-            print(*values, sep=sep, end=end, file=None, flush=flush)
+        self._output.write(*values, sep=sep, end=end, flush=flush)
+
+    @abstractmethod
+    def submit_comment(self, value: str) -> str:
+        """
+        Submit a comment for the chatbot.
+
+        :param str value: The comment to submit.
+        :return: The answer from the chatbot.
+        :rtype: str
+        :raises ValueError: The prompt is invalid (see :py:meth:`_check_comment`).
+        """
+
+    @abstractmethod
+    def submit_guess(self, value: str) -> str:
+        """
+        Submit a guess for the password.
+
+        :param str value: The guess for the password.
+        :return: The result message received.
+        :rtype: str
+        :raises NoSuchElementException: A comment wasn't submitted for the level yet.
+        """
+
+    def _check_comment(self, value: str) -> Optional[str]:
+        """
+        Validates a comment before submitting it, and looks it up in the response cache.
+
+        If a response cache is used, a prompt already answered on the current level returns the cached answer
+        (unless `refresh` is set); The prompt is then pending, and only submitted if a guess follows it (see
+        :py:meth:`_submit_pending`).
+
+        :param str value: The comment to submit.
+        :return: The cached answer (None = not cached, submit the comment).
+        :rtype: Optional[str]
+        :raises ValueError: Prompt must be at least 10 characters long, and differ from the previous prompt.
+        """
+        if len(value) < MIN_PROMPT_LENGTH:
+            raise ValueError(f"Prompt must be at least {MIN_PROMPT_LENGTH} characters long ({value})")
+        if self._cache is not None and not self._arguments.refresh:
+            answer = self._cache.get(self._level_key, value)
+            if answer is not None:
+                self.print("(Answer from cache)")
+                self._pending_comment = None if value == self._last_comment else value  # Already the page's last
+                return answer
+        if value == self._last_comment:
+            raise ValueError(f"Prompt cannot be the same as the previous prompt ({value})")
+        return None
+
+    def _submit_pending(self) -> None:
+        """
+        Submits the comment last answered from the response cache (if any) for real, so that a guess follows it on the
+        site too; Called before each guess.
+        """
+        if self._pending_comment is None:
+            return
+        cache, self._cache = self._cache, None  # Already cached; Don't look it up again.
+        try:
+            self.submit_comment(self._pending_comment)
+        finally:
+            self._cache = cache
+
+    def _store_answer(self, value: str, answer: str) -> None:
+        """Stores the answer to the comment in the response cache (if used)."""
+        if self._cache is not None:
+            self._cache.put(self._level_key, value, answer)
+
+    @property
+    def _level_key(self) -> str:
+        """Identifies the current level (label & description) for the response cache."""
+        return str(self)
+
+
+class Controller(BaseController):
+    """Class used to streamline interacting with the webpage via the desired :class:`WebDriver` instance."""
+    _driver: WebDriver
+    """The Selenium :class:`WebDriver` instance used."""
+    _pool: Optional[DriverPool]
+    """The pool :py:attr:`_driver` was acquired from, and is released to on :py:meth:`close` (None = not pooled)."""
+    _elements: Elements
+    """The relevant :class:`WebElement` instances used."""
+    _wait: PollingWait
+    """Used to have the :class:`WebDriver` wait for something to happen (see :mod:`waits`)."""
+
+    def __init__(self, arguments: ParserArguments, output: Optional[OutputBackend] = None,
+                 pool: Optional[DriverPool] = None, tracer: Optional[NullTracer] = None):
+        """
+        The :class:`Controller` Constructor.
+
+        :param ParserArguments arguments: Parser Arguments for initialization.
+        :param Optional[OutputBackend] output: Output backend to print to (None = create from :param:`arguments`).
+        :param Optional[DriverPool] pool: Pool to take a pre-warmed session from (None = launch a new browser).
+        :param Optional[NullTracer] tracer: Tracer to record timings with (None = create from :param:`arguments`).
+        :raises NoSuchDriverException: The `browser` field for the given :param:`arguments` was not recognized.
+        """
+        super().__init__(arguments, output, tracer)
+        self._pool = pool
+        if self._pool is not None:  # Already reset & loaded
+            self._driver = self._pool.acquire()
         else:
-            if self._output_path.endswith(".json"):  # Print to JSON file
-                try:
-                    with open(self._output_path, "r", encoding=self._output_encoding) as file:
-                        obj = json.loads(file.read())
-                except (FileNotFoundError, JSONDecodeError):  # Failed to read from file
-                    obj = []
-                with open(self._output_path, "w+", encoding=self._output_encoding) as file:
-                    for value in values:
-                        obj.append(value)
-                    json.dump(obj, file)  # TODO: Clear JSON in __init__
-            elif self._output_path.endswith(".csv"):  # Print to CSV file
-                with open(self._output_path, "a+", encoding=self._output_encoding, newline="") as file:
-                    reader = csv.reader(file)
-                    line_num = reader.line_num
-                    del reader
-                    writer = csv.writer(file)  # TODO: Add CSV header in __init__ ?
-                    for value in values:
-                        writer.writerow([line_num, datetime.now(), str(value)])  # TODO: Better row definition
-            else:  # Print to file as regular text ('txt')
-                with open(self._output_path, "a+", encoding=self._output_encoding) as file:
-                    print(*values, sep=sep, end=end, file=file, flush=flush)
+            try:
+                self._driver = self.create_driver(self._arguments.browser)
+            except NoSuchDriverException as ex:
+                self.print(ex.msg, f"Falling back to '{Browsers[0]}'", sep="; ")
+                self._driver = self.create_driver(Browsers[0])
+        try:
+            if self._pool is None and not self._arguments.keep:
+                self._driver.delete_all_cookies()
+            self._tracer.instrument_driver(self._driver)
+            self._wait = create_wait(self._arguments.wait, self._driver,
+                                     timeout=self._arguments.timeout, poll_frequency=self._arguments.poll_frequency,
+                                     tracer=self._tracer)
+            if self._pool is None:
+                self._driver.get(self._arguments.url)
+            self._elements = Elements()
+            self._start_level()
+        except BaseException:  # Don't leave the browser running (use as a context manager to close it afterwards).
+            self.close()
+            raise
 
+    def __str__(self):
+        texts = self._elements.texts
+        if texts.get("level_label") is not None and texts.get("description") is not None:  # From the latest snapshot
+            return f"{texts['level_label']}: {texts['description']}"
+        return f"{self._elements.level_label.text}: {self._elements.description.text}"
+
+    def _close_session(self):
+        """Quits the underlying :class:`WebDriver` instance, ending the browser (or releases it back to its pool)."""
+        if self._pool is not None:
+            self._pool.release(self._driver)
+        else:
+            self._driver.quit()
+
+    def reload(self):
+        """Reloads the webpage of the base URL & refreshes the stored state (e.g. after the page stopped responding)."""
+        self._driver.get(self._arguments.url)
+        self._start_level()
+
+    @property
+    def current_url(self) -> str:
+        return self._driver.current_url
+
+    def get_cookies(self) -> List[Dict[str, Any]]:
+        return self._driver.get_cookies()
+
+    def restore(self, url: str, cookies: List[Dict[str, Any]]) -> None:
+        for cookie in cookies:  # The site is already loaded, so its cookies can be added.
+            try:
+                self._driver.add_cookie(cookie)
+            except WebDriverException as ex:
+                self.print(f"Couldn't restore cookie '{cookie.get('name')}': {ex.msg}")
+        self._driver.get(url)
+        self._start_level()
+
+    @traced()
     def create_driver(self, browser: BrowserType = Browsers[0]) -> WebDriver:
         """
         Creates a new :class:`WebDriver` instance, type determined by the name of the browser.
@@ -127,82 +356,123 @@ class Controller:
         :return: The requested :class:`WebDriver` instance.
         :rtype: DriverType
         """
-        driver: Optional[WebDriver] = None
-        match browser.lower():
-            case "chrome":
-                driver = webdriver.Chrome()
-            case "edge":
-                driver = webdriver.Edge()
-            case "firefox":
-                driver = webdriver.Firefox()
-            case "safari":
-                driver = webdriver.Safari()
-            case "auto":
-                # Iterate through other drivers and find the first one that works.
-                for browser in Browsers:
-                    if browser == "auto":
-                        # Skips "auto" to prevent infinite recursion
-                        continue
-                    try:
-                        driver = self.create_driver(browser)
-                    except NoSuchDriverException:
-                        self.print(f"No driver found for '{browser}'.")
-                    if driver is not None:
-                        self.print(f"Driver found for '{browser}'.")
-                        break
-            case _:
-                raise NoSuchDriverException(f"Browser Type not recognized: {browser}")
-        return driver
+        return create_driver(browser, log=self.print, headless=self._arguments.headless,
+                             cache_path=self._arguments.driver_cache, profile=self._arguments.profile)
 
     def _start_level(self):
-        """Refresh the stored state of the webpage."""
+        """Refresh the stored state of the webpage (& forget the previous level's last prompt)."""
         self._is_interacted = False
+        self._last_comment = None
+        self._pending_comment = None
+        self._elements.invalidate()  # New level (or reloaded page): none of the cached elements can be trusted.
         self._get_all_elements()
         self.print(str(self))  # Happens before
 
+    @traced()
     def _get_all_elements(self):
         """
-        Updates the DOM :class:`WebElement` :py:attr:`elements`.
+        Updates the DOM :class:`WebElement` :py:attr:`elements` (and their texts) in a single round-trip.
 
         If the site hasn't been queried yet, the Answer & Guess elements will not be available, and thus skipped.
+
+        :raises NoSuchElementException: Some of the elements weren't found.
         """
         # TODO: Refine CSS Selector - "#guess ~ button[type='submit']:first-of-type" ?
         # comment_submit = driver.find_element(by=By.CSS_SELECTOR, value="button.h-7")
         # guess_submit = driver.find_element(by=By.SELECT, value="button.button-white-to-gray-animation:nth-child(2)")
         # comment_submit, guess_submit = driver.find_elements(by=By.CSS_SELECTOR, value="button[type='submit']")[:2]
-        self._get_default_elements()
-        self._get_answer_elements()
-        self._get_guess_elements()
+        groups = ["default", "answer", "guess"] if self._is_interacted else ["default"]
+        self._resolve(*[group for group in groups if not self._elements.is_valid(group)])
+
+    @traced()
+    def _resolve(self, *groups: str) -> None:
+        """
+        Resolves the :class:`WebElement` instances (and their texts) of the groups in a single round-trip, and caches
+        them (see :py:meth:`Elements.set_group`); The alert group is resolved by :py:meth:`_get_alert_elements`.
+
+        :param *str groups: The groups to resolve (see :py:data:`ElementGroups`).
+        :raises NoSuchElementException: Some of the elements weren't found.
+        """
+        if "alert" in groups:
+            self._get_alert_elements()
+            groups = tuple(group for group in groups if group != "alert")
+        if not groups:
+            return
+        names = [name for group in groups for name in ElementGroups[group]]
+        snapshot = self._driver.execute_script(SNAPSHOT_SCRIPT, {name: Selectors[name] for name in names})
+        missing = [name for name in names if snapshot["elements"].get(name) is None]
+        if missing:
+            raise NoSuchElementException(f"Couldn't get elements: {missing}")
+        for group in groups:
+            self._elements.set_group(group, snapshot["elements"])
+        self._elements.texts.update(snapshot["texts"])
 
+    def _interact(self, group: str, action: Callable[[], T]) -> T:
+        """
+        Runs an action on the cached elements of the group (resolving them first, if invalidated); If one of them is
+        found stale, only that group is re-resolved, and the action is retried once.
+
+        :param str group: The group the action uses (see :py:data:`ElementGroups`).
+        :param Callable[[], T] action: The action, reading the elements from :py:attr:`_elements` when called.
+        :return: The result of the action.
+        :rtype: T
+        :raises NoSuchElementException: Some of the group's elements weren't found.
+        """
+        if not self._elements.is_valid(group):
+            self._resolve(group)
+        try:
+            return action()
+        except StaleElementReferenceException:
+            self._elements.invalidate(group)
+            self._resolve(group)
+            return action()
+
+    @staticmethod
+    def _submit_text(textbox: WebElement, submit: WebElement, value: str) -> None:
+        """Replaces the text of the textbox with the value, and clicks the submit button."""
+        textbox.clear()
+        textbox.send_keys(value)
+        submit.click()
+
+    @recorded
+    @traced()
     def submit_comment(self, value: str) -> str:
         """
         Submit a comment for the chatbot.
 
+        If a response cache is used, a prompt already answered on the current level returns the cached answer without
+        touching the browser (unless `refresh` is set); It is only submitted if a guess follows it.
+
         :param str value: The comment to submit.
         :return: The answer from the chatbot.
         :rtype: str
         :raises ValueError: Prompt must be at least 10 characters long.
         :raises NoSuchElementException: Couldn't get answer / guess elements.
         """
-        if len(value) < 10:
-            raise ValueError(f"Prompt must be at least 10 characters long ({value})")
-        if value == self._last_comment:
-            raise ValueError(f"Prompt cannot be the same as the previous prompt ({value})")
-        self._elements.comment.clear()
-        self._elements.comment.send_keys(value)
-        self._elements.comment_submit.click()
+        answer = self._check_comment(value)
+        if answer is not None:
+            return answer
+        self._interact("default", lambda: self._submit_text(self._elements.comment, self._elements.comment_submit,
+                                                            value))
+        self._elements.invalidate("answer")  # Replaced by the webpage once answered
+        self._elements.invalidate("guess")
         self._is_interacted = True
         self._last_comment = value  # TODO: Move?
-        self._wait.until(lambda _: self._get_answer_elements())
+        self._pending_comment = None
+        self._wait.until(self._get_answer_elements, [Selectors["answer"]])
         if not self._has_answer_elements:
             raise NoSuchElementException("Couldn't get answer elements.")
-        self._wait.until(lambda _: self._get_guess_elements())
+        self._wait.until(self._get_guess_elements, [Selectors["guess"], Selectors["guess_submit"]])
         # TODO: Move?
         if not self._has_guess_elements:
             raise NoSuchElementException("Couldn't get guess elements")
         self.print("(Psst! You can guess the answer now!)")
-        return self._elements.answer.text
+        answer = self._interact("answer", lambda: self._elements.answer.text)
+        self._store_answer(value, answer)
+        return answer
 
+    @recorded
+    @traced()
     def submit_guess(self, value: str) -> str:
         """
         Submit a guess for the password.
@@ -212,74 +482,105 @@ class Controller:
         :rtype: str
         :raises NoSuchElementException: Couldn't get guess / alert elements.
         """
+        self._submit_pending()
         if not self._has_guess_elements:
             raise NoSuchElementException("You must submit a comment for the level before you can submit a guess!")
-        self._elements.guess.clear()
-        self._elements.guess.send_keys(value)
-        self._elements.guess_submit.click()
+        self._interact("guess", lambda: self._submit_text(self._elements.guess, self._elements.guess_submit, value))
         # Handle the alert modal
-        self._wait.until(lambda _: self._get_alert_elements())
+        self._elements.invalidate("alert")
+        self._wait.until(self._get_alert_elements, [Selectors["alert_title"], Selectors["alert_submit"]])
         if not self._has_alert_elements:
             raise NoSuchElementException("Couldn't get customAlert elements.")
-        answer = f"{self._elements.alert_title.text}: {self._elements.alert_text.text}"
-        self._elements.alert_submit.click()
-        if answer.startswith("You guessed the password!"):
+        answer = self._interact("alert", lambda: f"{self._elements.alert_title.text}: {self._elements.alert_text.text}")
+        self._interact("alert", lambda: self._elements.alert_submit.click())  # Re-read after re-resolving
+        self._elements.invalidate("alert")  # Removed by the webpage once closed
+        if answer.startswith(SUCCESS_MESSAGE):
             self._start_level()  # TODO: This prints level details before returning the answer for printing...
         return answer
 
+    @property
+    def _level_key(self) -> str:
+        """Identifies the current level (label & description, as of the latest snapshot) for the response cache."""
+        return f"{self._elements.texts.get('level_label')}: {self._elements.texts.get('description')}"
+
     @property
     def _has_default_elements(self) -> bool:
         """Whether the default :class:`WebElement` instances are available."""
-        return None not in [self._elements.level_label, self._elements.description,
-                            self._elements.comment, self._elements.comment_submit]
+        return self._elements.has("default")
 
+    @traced()
     def _get_default_elements(self) -> bool:
-        """Updates the default :class:`WebElement` instances."""
-        self._elements.level_label = self._driver.find_element(by=By.CLASS_NAME, value="level-label")
-        self._elements.description = self._driver.find_element(by=By.CLASS_NAME, value="description")
-        self._elements.comment = self._driver.find_element(by=By.ID, value="comment")
-        self._elements.comment_submit = self._driver.find_element(by=By.CSS_SELECTOR,
-                                                                  value="button[type='submit']:nth-child(1)")
+        """Updates the default :class:`WebElement` instances (only if the cached ones were invalidated)."""
+        if not self._elements.is_valid("default"):
+            self._resolve("default")
         return self._has_default_elements
 
     @property
     def _has_answer_elements(self) -> bool:
         """Whether the answer :class:`WebElement` instance is available."""
-        return None not in [self._elements.answer]
+        return self._elements.has("answer")
 
+    @traced()
     def _get_answer_elements(self) -> bool:
         """Update the answer :class:`WebElement` instance."""
+        from selenium.webdriver.common.by import By  # Already loaded by the driver
         # TODO: Answer & Guess only appear after the first query has been sent...
-        self._elements.answer = self._driver.find_element(by=By.CLASS_NAME,
-                                                          value="answer") if self._is_interacted else None
+        self._elements.set_group("answer", {
+            "answer": self._driver.find_element(by=By.CLASS_NAME, value="answer") if self._is_interacted else None})
         return self._has_answer_elements
 
     @property
     def _has_guess_elements(self) -> bool:
         """Whether the guess :class:`WebElement` instances are available."""
-        return None not in [self._elements.guess, self._elements.guess_submit]
+        return self._elements.has("guess")
 
+    @traced()
     def _get_guess_elements(self) -> bool:
         """Update the guess :class:`WebElement` instances (if available, else set to None)."""
-        self._elements.guess = self._driver.find_element(by=By.ID, value="guess") if self._is_interacted else None
-        self._elements.guess_submit = self._driver.find_element(by=By.CSS_SELECTOR,
-                                                                value="button[type='submit']:nth-child(2)"
-                                                                ) if self._is_interacted else None
+        from selenium.webdriver.common.by import By  # Already loaded by the driver
+        self._elements.set_group("guess", {
+            "guess": self._driver.find_element(by=By.ID, value="guess") if self._is_interacted else None,
+            "guess_submit": self._driver.find_element(by=By.CSS_SELECTOR, value="button[type='submit']:nth-child(2)"
+                                                      ) if self._is_interacted else None})
         return self._has_guess_elements
 
     @property
     def _has_alert_elements(self) -> bool:
         """Whether the modal alert :class:`WebElement` instances are available."""
-        return None not in [self._elements.alert_title, self._elements.alert_text, self._elements.alert_submit]
+        return self._elements.has("alert")
 
+    @traced()
     def _get_alert_elements(self) -> bool:
         """Update the modal alert :class:`WebElement` instances."""
-        self._elements.alert_title, self._elements.alert_text = self._driver.find_elements(
-            by=By.CSS_SELECTOR, value=".customAlert div:nth-child(2)")[:2]  # 1st & 2nd matches
-        self._elements.alert_submit = self._driver.find_element(by=By.CSS_SELECTOR, value=".customAlert button")
+        from selenium.webdriver.common.by import By  # Already loaded by the driver
+        alerts = self._driver.find_elements(by=By.CSS_SELECTOR, value=".customAlert div:nth-child(2)")
+        if len(alerts) < 2:  # Not rendered yet
+            raise NoSuchElementException("Couldn't get customAlert title & text elements.")
+        self._elements.set_group("alert", {
+            "alert_title": alerts[0], "alert_text": alerts[1],  # 1st & 2nd matches
+            "alert_submit": self._driver.find_element(by=By.CSS_SELECTOR, value=".customAlert button")})
         return self._has_alert_elements
 
 
+def create_controller(arguments: ParserArguments, output: Optional[OutputBackend] = None,
+                      pool: Optional[Union[DriverPool, ConnectionPool]] = None,
+                      tracer: Optional[NullTracer] = None) -> BaseController:
+    """
+    Creates the controller backend requested by the parser arguments.
+
+    :param ParserArguments arguments: Parser Arguments for initialization.
+    :param Optional[OutputBackend] output: Output backend to print to (None = create from :param:`arguments`).
+    :param Optional[Union[DriverPool, ConnectionPool]] pool: Pool of the backend's sessions (None = not pooled).
+    :param Optional[NullTracer] tracer: Tracer to record timings with (None = create from :param:`arguments`).
+    :return: A :class:`HttpController` for the `http` backend, otherwise a :class:`Controller`.
+    :rtype: BaseController
+    """
+    if arguments.backend == "http":
+        from http_controller import HttpController  # Imported here, as it depends on this module.
+        return HttpController(arguments, output=output, pool=pool, tracer=tracer)
+    return Controller(arguments, output=output, pool=pool, tracer=tracer)
+
+
 def main(arguments: Optional[ParserArguments] = None):
     """Main function; Instantiates & prints a :class:`Controller` instance with the given CLI arguments."""
     instance = Controller(arguments)
@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+import json
+import os
+import platform
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Callable, List, Dict, TYPE_CHECKING
+
+from selenium.common import NoSuchDriverException, WebDriverException
+
+from argument_parser import get_parser_arguments
+from argument_types import (BrowserType, Browsers, ProfileType, Profiles, ParserArguments, DRIVER_CACHE_PATH,
+                            BLOCKED_URL_PATTERNS)
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+
+def read_cached_browser(cache_path: Optional[str] = DRIVER_CACHE_PATH) -> Optional[BrowserType]:
+    """
+    Reads the browser previously resolved by `auto` on this machine.
+
+    :param Optional[str] cache_path: Path of the on-disk cache (None = caching disabled).
+    :return: The cached browser (None = not cached).
+    :rtype: Optional[BrowserType]
+    """
+    if cache_path is None:
+        return None
+    try:
+        with open(cache_path, "r", encoding="utf") as file:
+            browser = json.load(file).get(platform.node())
+    except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+        return None
+    return browser if browser in Browsers and browser != "auto" else None
+
+
+def write_cached_browser(browser: Optional[BrowserType], cache_path: Optional[str] = DRIVER_CACHE_PATH) -> None:
+    """
+    Stores the browser resolved by `auto` on this machine (None = forget it).
+
+    :param Optional[BrowserType] browser: The resolved browser.
+    :param Optional[str] cache_path: Path of the on-disk cache (None = caching disabled).
+    """
+    if cache_path is None:
+        return
+    try:
+        with open(cache_path, "r", encoding="utf") as file:
+            cache: Dict[str, str] = json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        cache = {}
+    if browser is None:
+        cache.pop(platform.node(), None)
+    else:
+        cache[platform.node()] = browser
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    with open(cache_path, "w", encoding="utf") as file:
+        json.dump(cache, file)
+
+
+def create_options(browser: BrowserType, headless: bool = False, profile: ProfileType = Profiles[0]):
+    """
+    Creates the launch options for the browser.
+
+    The `lean` profile launches headless with a small window, without images, fonts, extensions & background services,
+    and doesn't wait for sub-resources when loading pages (see also :py:func:`block_urls`).
+
+    :param BrowserType browser: The type of browser to use (not `auto`).
+    :param bool headless: Whether to launch the browser without a window (implied by `lean`).
+    :param ProfileType profile: The browser profile.
+    :return: The browser's options instance (None = the browser takes no options, i.e. Safari).
+    :rtype: Optional[ArgOptions]
+    """
+    from selenium import webdriver  # Only once a browser is launched (see benchmark_imports.py)
+    is_lean = profile == "lean"
+    match browser:
+        case "chrome" | "edge":
+            options = webdriver.ChromeOptions() if browser == "chrome" else webdriver.EdgeOptions()
+            if headless or is_lean:
+                options.add_argument("--headless=new")
+            if is_lean:
+                for argument in ["--window-size=800,600", "--blink-settings=imagesEnabled=false",
+                                 "--disable-extensions", "--disable-gpu", "--disable-dev-shm-usage", "--mute-audio",
+                                 "--no-first-run", "--no-default-browser-check", "--disable-sync",
+                                 "--disable-background-networking", "--disable-component-update",
+                                 "--disable-default-apps", "--disable-features=Translate,MediaRouter,OptimizationHints",
+                                 "--disable-remote-fonts"]:
+                    options.add_argument(argument)
+                options.add_experimental_option("prefs", {
+                    "profile.managed_default_content_settings.images": 2,
+                    "profile.default_content_setting_values.notifications": 2,
+                    "profile.block_third_party_cookies": True,
+                })
+                options.page_load_strategy = "eager"
+            return options
+        case "firefox":
+            options = webdriver.FirefoxOptions()
+            if headless or is_lean:
+                options.add_argument("-headless")
+            if is_lean:
+                options.add_argument("--width=800")
+                options.add_argument("--height=600")
+                for name, value in {
+                    "permissions.default.image": 2,  # No images
+                    "gfx.downloadable_fonts.enabled": False,  # No web fonts
+                    "browser.display.use_document_fonts": 0,
+                    "network.cookie.cookieBehavior": 1,  # No third-party cookies
+                    "privacy.trackingprotection.enabled": True,  # Block trackers & analytics
+                    "privacy.trackingprotection.socialtracking.enabled": True,
+                    "media.autoplay.default": 5,  # No media
+                    "extensions.enabledScopes": 0,  # No extensions
+                    "app.update.enabled": False,
+                    "datareporting.healthreport.uploadEnabled": False,
+                    "toolkit.telemetry.enabled": False,
+                }.items():
+                    options.set_preference(name, value)
+                options.page_load_strategy = "eager"
+            return options
+        case _:
+            return None
+
+
+def block_urls(driver: WebDriver, patterns: List[str] = BLOCKED_URL_PATTERNS) -> bool:
+    """
+    Blocks requests matching the URL patterns (Chromium-based browsers only, via the Chrome DevTools Protocol).
+
+    :param WebDriver driver: The :class:`WebDriver` instance.
+    :param List[str] patterns: URL patterns to block (`*` = wildcard).
+    :return: Whether the requests are blocked.
+    :rtype: bool
+    """
+    if not hasattr(driver, "execute_cdp_cmd"):  # Firefox relies on its tracking protection preferences instead.
+        return False
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    return True
+
+
+def create_driver(browser: BrowserType = Browsers[0], log: Callable[..., None] = print,
+                  headless: bool = False, cache_path: Optional[str] = DRIVER_CACHE_PATH,
+                  profile: ProfileType = Profiles[0]) -> WebDriver:
+    """
+    Creates a new :class:`WebDriver` instance, type determined by the name of the browser.
+
+    With `auto`, the browsers are probed one after another only once per machine; The browser found is cached on disk,
+    and launched directly from then on (probing again if it stops working).
+
+    :param BrowserType browser: The type of browser to use.
+    :param Callable[..., None] log: Used to report which drivers were (not) found, default :py:func:`print`.
+    :param bool headless: Whether to launch the browser without a window (not supported by Safari).
+    :param Optional[str] cache_path: Path of the on-disk cache of the browser resolved by `auto` (None = no caching).
+    :param ProfileType profile: The browser profile (`lean` = headless & resource-lean, see :py:func:`create_options`).
+    :return: The requested :class:`WebDriver` instance.
+    :rtype: DriverType
+    """
+    from selenium import webdriver  # Only once a browser is launched (see benchmark_imports.py)
+    driver: Optional[WebDriver] = None
+    options = create_options(browser.lower(), headless, profile)
+    match browser.lower():
+        case "chrome":
+            driver = webdriver.Chrome(options=options)
+        case "edge":
+            driver = webdriver.Edge(options=options)
+        case "firefox":
+            driver = webdriver.Firefox(options=options)
+        case "safari":
+            if headless or profile == "lean":
+                log("Safari doesn't support headless or lean profiles; Launching with defaults.")
+            driver = webdriver.Safari()
+        case "auto":
+            cached = read_cached_browser(cache_path)
+            if cached is not None:
+                try:
+                    return create_driver(cached, log, headless, cache_path, profile)
+                except (NoSuchDriverException, WebDriverException):
+                    log(f"Cached driver for '{cached}' no longer works.")
+                    write_cached_browser(None, cache_path)
+            # Iterate through other drivers and find the first one that works.
+            for browser in Browsers:
+                if browser == "auto":
+                    # Skips "auto" to prevent infinite recursion
+                    continue
+                try:
+                    driver = create_driver(browser, log, headless, cache_path, profile)
+                except NoSuchDriverException:
+                    log(f"No driver found for '{browser}'.")
+                if driver is not None:
+                    log(f"Driver found for '{browser}'.")
+                    write_cached_browser(browser, cache_path)
+                    break
+            return driver
+        case _:
+            raise NoSuchDriverException(f"Browser Type not recognized: {browser}")
+    if profile == "lean":
+        block_urls(driver)
+    return driver
+
+
+def reset_driver(driver: WebDriver, url: str) -> None:
+    """
+    Resets a :class:`WebDriver` instance to a fresh session state: clears cookies & web storage, then reloads the URL.
+
+    :param WebDriver driver: The :class:`WebDriver` instance to reset.
+    :param str url: The URL to (re)load.
+    """
+    driver.delete_all_cookies()
+    try:
+        driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+    except WebDriverException:
+        pass  # No page loaded yet (e.g. `about:blank` has no storage)
+    driver.get(url)
+
+
+class DriverPool:
+    """
+    Pool of pre-warmed headless :class:`WebDriver` sessions, handed to new :class:`Controller` instances.
+
+    Released sessions are reset (see :py:func:`reset_driver`) instead of being closed, so that a new
+    :class:`Controller` doesn't pay for launching a browser.
+    """
+    _arguments: ParserArguments
+    """Parser Arguments used to create (& reset) the sessions."""
+    _log: Callable[..., None]
+    """Used to report which drivers were (not) found."""
+    _size: int
+    """Maximum number of idle sessions to keep."""
+    _idle: List[WebDriver]
+    """Idle sessions, already reset & ready to be used."""
+    _lock: threading.Lock
+    """Guards :py:attr:`_idle`."""
+
+    def __init__(self, arguments: ParserArguments, size: int, log: Callable[..., None] = print):
+        """
+        The :class:`DriverPool` Constructor; Doesn't launch any browsers (see :py:meth:`warm`).
+
+        :param ParserArguments arguments: Parser Arguments used to create (& reset) the sessions.
+        :param int size: Maximum number of idle sessions to keep.
+        :param Callable[..., None] log: Used to report which drivers were (not) found.
+        """
+        self._arguments = arguments
+        self._size = size
+        self._log = log
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "DriverPool":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def _create(self, *_) -> WebDriver:
+        """Launches a new headless session & loads the URL."""
+        driver = create_driver(self._arguments.browser, self._log, headless=True,
+                               cache_path=self._arguments.driver_cache, profile=self._arguments.profile)
+        reset_driver(driver, self._arguments.url)
+        return driver
+
+    def warm(self, count: Optional[int] = None) -> None:
+        """
+        Launches sessions in parallel, until the pool holds the requested number of idle sessions.
+
+        :param Optional[int] count: How many idle sessions to have (None = the pool size).
+        """
+        with self._lock:
+            missing = min(self._size if count is None else count, self._size) - len(self._idle)
+        if missing <= 0:
+            return
+        with ThreadPoolExecutor(max_workers=missing) as executor:
+            drivers = list(executor.map(self._create, range(missing)))
+        with self._lock:
+            self._idle.extend(drivers)
+
+    def acquire(self) -> WebDriver:
+        """
+        Takes an idle session from the pool (launching a new one if there are none).
+
+        :return: A session which has been reset & has the URL loaded.
+        :rtype: WebDriver
+        """
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._create()
+
+    def release(self, driver: WebDriver) -> None:
+        """
+        Returns a session to the pool after resetting it (quitting it instead if the pool is full, or it is broken).
+
+        :param WebDriver driver: The session to return.
+        """
+        with self._lock:
+            is_full = len(self._idle) >= self._size
+        if not is_full:
+            try:
+                reset_driver(driver, self._arguments.url)
+            except WebDriverException:
+                is_full = True  # Broken session; Don't reuse it.
+        if is_full:
+            driver.quit()
+            return
+        with self._lock:
+            self._idle.append(driver)
+
+    def close(self) -> None:
+        """Quits all idle sessions."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            driver.quit()
+
+
+def main(arguments: Optional[ParserArguments] = None):
+    """Main function; Resolves (& caches) the driver for this machine, and prints it."""
+    if arguments is None:
+        arguments = get_parser_arguments()
+    driver = create_driver(arguments.browser, headless=arguments.headless, cache_path=arguments.driver_cache,
+                           profile=arguments.profile)
+    print(f"{platform.node()}: {driver.name}")
+    driver.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+from typing import Optional, List, Dict, Any
+from urllib.parse import urlsplit, urlencode, urljoin
+
+from selenium.common import NoSuchElementException
+
+from argument_parser import get_parser_arguments
+from argument_types import ParserArguments, Levels, SUCCESS_MESSAGE
+from connections import ConnectionPool
+from controller import BaseController, recorded
+from instrumentation import NullTracer, traced
+from output import OutputBackend
+
+
+class HttpController(BaseController):
+    """
+    Backend talking to the site's HTTP API directly (no browser), behind the same interface as :class:`Controller`.
+
+    Comments & guesses are POSTed to the endpoints the webpage itself uses, over a pooled keep-alive connection (see
+    :class:`ConnectionPool`); The level is determined by the last segment of the URL path (the defender name).
+    """
+    SUCCESS_TITLE: str = SUCCESS_MESSAGE
+    """Title of a correct guess (same as the webpage's alert)."""
+    FAILURE_TITLE: str = "Wrong password."
+    """Title of a wrong guess (same as the webpage's alert)."""
+    _pool: ConnectionPool
+    """The keep-alive connections to the site."""
+    _owns_pool: bool
+    """Whether :py:attr:`_pool` was created by this instance (and should be closed by it)."""
+    _defender: str
+    """The defender name of the current level."""
+    _level: Dict[str, Any]
+    """The current level's information (`name`, `level` & `description`), as returned by the site."""
+
+    def __init__(self, arguments: ParserArguments, output: Optional[OutputBackend] = None,
+                 pool: Optional[ConnectionPool] = None, tracer: Optional[NullTracer] = None):
+        """
+        The :class:`HttpController` Constructor.
+
+        :param ParserArguments arguments: Parser Arguments for initialization.
+        :param Optional[OutputBackend] output: Output backend to print to (None = create from :param:`arguments`).
+        :param Optional[ConnectionPool] pool: Connections shared with other sessions (None = create a new pool).
+        :param Optional[NullTracer] tracer: Tracer to record timings with (None = create from :param:`arguments`).
+        :raises ConnectionError: The level's information couldn't be retrieved.
+        """
+        super().__init__(arguments, output, tracer)
+        self._owns_pool = pool is None
+        self._pool = ConnectionPool(self._arguments.url, timeout=self._arguments.timeout) if pool is None else pool
+        self._defender = self._base_defender
+        try:
+            self._start_level()
+        except BaseException:
+            self.close()
+            raise
+
+    def __str__(self):
+        return f"Level {self._level.get('level')}: {self._level.get('description')}"
+
+    def _close_session(self):
+        """Closes the connections (if created by this instance)."""
+        if self._owns_pool:
+            self._pool.close()
+
+    def reload(self):
+        """Goes back to the level of the base URL & refreshes its stored state (like reloading the webpage)."""
+        self._defender = self._base_defender
+        self._start_level()
+
+    @property
+    def _base_defender(self) -> str:
+        """The defender name of the level the session starts on (the last segment of the base URL's path)."""
+        return urlsplit(self._arguments.url).path.rstrip("/").rsplit("/", 1)[-1] or Levels[0]
+
+    @property
+    def current_url(self) -> str:
+        return urljoin(self._arguments.url, self._defender)
+
+    def restore(self, url: str, cookies: List[Dict[str, Any]]) -> None:
+        """Restores the level saved to a checkpoint; The HTTP API is stateless, so cookies are ignored."""
+        self._defender = urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1] or self._defender
+        self._start_level()
+
+    def _request(self, method: str, path: str, fields: Optional[Dict[str, str]] = None) -> Any:
+        """Sends a request to the site's API (see :py:meth:`ConnectionPool.request`), measured by the tracer."""
+        with self._tracer.span(f"{method} {path.partition('?')[0]}", category="http"):
+            return self._pool.request(method, path, fields)
+
+    def _start_level(self):
+        """Retrieves the information of the current level (& forgets the previous level's last prompt)."""
+        self._is_interacted = False
+        self._last_comment = None
+        self._pending_comment = None
+        self._level = self._request("GET", f"/api/defender?{urlencode({'defender': self._defender})}")
+        self.print(str(self))
+
+    @recorded
+    @traced()
+    def submit_comment(self, value: str) -> str:
+        """
+        Submit a comment for the chatbot.
+
+        If a response cache is used, a prompt already answered on the current level returns the cached answer without
+        sending a request (unless `refresh` is set); It is only submitted if a guess follows it.
+
+        :param str value: The comment to submit.
+        :return: The answer from the chatbot.
+        :rtype: str
+        :raises ValueError: Prompt must be at least 10 characters long.
+        :raises ConnectionError: The site responded with an error status.
+        """
+        answer = self._check_comment(value)
+        if answer is not None:
+            return answer
+        response = self._request("POST", "/api/send-message", {"defender": self._defender, "prompt": value})
+        self._is_interacted = True
+        self._last_comment = value
+        self._pending_comment = None
+        self.print("(Psst! You can guess the answer now!)")
+        answer = response["answer"]
+        self._store_answer(value, answer)
+        return answer
+
+    @recorded
+    @traced()
+    def submit_guess(self, value: str) -> str:
+        """
+        Submit a guess for the password; A correct guess moves on to the next level.
+
+        :param str value: The guess for the password.
+        :return: The result message received.
+        :rtype: str
+        :raises NoSuchElementException: A comment wasn't submitted for the level yet (like :class:`Controller`).
+        :raises ConnectionError: The site responded with an error status.
+        """
+        self._submit_pending()
+        if not self._is_interacted:
+            raise NoSuchElementException("You must submit a comment for the level before you can submit a guess!")
+        response = self._request("POST", "/api/guess-password", {"defender": self._defender, "password": value})
+        answer = f"{self.SUCCESS_TITLE if response.get('success') else self.FAILURE_TITLE}: {response.get('message')}"
+        if response.get("success"):
+            next_level = response.get("next_level")
+            if next_level is None and self._defender in Levels[:-1]:
+                next_level = Levels[Levels.index(self._defender) + 1]
+            if next_level is not None:
+                self._defender = next_level
+                self._start_level()  # Like Controller, prints level details before returning the answer.
+        return answer
+
+
+def main(arguments: Optional[ParserArguments] = None):
+    """Main function; Instantiates & prints a :class:`HttpController` instance with the given CLI arguments."""
+    if arguments is None:
+        arguments = get_parser_arguments()
+    instance = HttpController(arguments)
+    print(instance)
+    instance.close()
+
+
+if __name__ == '__main__':
+    main()
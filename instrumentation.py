@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from typing import Optional, List, Dict, Any, Callable, ContextManager, Iterator, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+from argument_types import ParserArguments
+
+HISTOGRAM_BUCKETS: List[float] = [.001, .01, .1, 1, 10]
+"""Upper bounds (in seconds) of the summary histogram buckets (the last bucket is unbounded)."""
+
+
+class NullTracer:
+    """Tracer used when instrumentation is disabled; Every hook is a no-op."""
+    enabled: bool = False
+    """Whether timings are recorded."""
+    _null_span: ContextManager = nullcontext()
+    """Shared no-op context manager returned by :py:meth:`span`."""
+
+    def span(self, name: str, category: str = "controller") -> ContextManager:
+        """Returns a context manager measuring the enclosed block (no-op when disabled)."""
+        return self._null_span
+
+    def instrument_driver(self, driver: WebDriver) -> WebDriver:
+        """Counts & measures the driver's round-trips (no-op when disabled)."""
+        return driver
+
+    def export(self, path: str) -> None:
+        """Writes the recorded timings as a Chrome-trace / Perfetto JSON file (no-op when disabled)."""
+
+    def summary(self) -> str:
+        """Returns a summary histogram of the recorded timings (empty when disabled)."""
+        return ""
+
+
+class Tracer(NullTracer):
+    """
+    Records the duration of each instrumented operation, and counts WebDriver round-trips (one per HTTP command).
+
+    Timings are exported as Chrome-trace JSON (viewable with `chrome://tracing` or https://ui.perfetto.dev), and
+    summarized as a histogram per operation.
+    """
+    enabled = True
+    events: List[Dict[str, Any]]
+    """Recorded Chrome-trace "complete" events."""
+    round_trips: Counter
+    """Number of WebDriver round-trips, by command name."""
+    _origin: int
+    """Monotonic time (ns) the tracer was created at; Event timestamps are relative to it."""
+    _lock: threading.Lock
+    """Guards :py:attr:`events` & :py:attr:`round_trips`, so the tracer can be shared between threads."""
+
+    def __init__(self):
+        self.events = []
+        self.round_trips = Counter()
+        self._origin = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, category: str = "controller") -> Iterator[None]:
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            event = {"name": name, "cat": category, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+                     "ts": (start - self._origin) / 1000, "dur": (end - start) / 1000}
+            with self._lock:
+                self.events.append(event)
+
+    def instrument_driver(self, driver: WebDriver) -> WebDriver:
+        execute = getattr(driver, "_uninstrumented_execute", driver.execute)  # Don't wrap a pooled driver twice.
+
+        def instrumented_execute(driver_command: str, params: Optional[dict] = None):
+            with self._lock:
+                self.round_trips[driver_command] += 1
+            with self.span(driver_command, category="driver"):
+                return execute(driver_command, params)
+
+        driver._uninstrumented_execute = execute
+        driver.execute = instrumented_execute  # WebElement commands also go through their parent driver.
+        return driver
+
+    def export(self, path: str) -> None:
+        with self._lock:
+            events = list(self.events)
+        with open(path, "w", encoding="utf") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+    def summary(self) -> str:
+        with self._lock:
+            events = list(self.events)
+            round_trips = Counter(self.round_trips)
+        durations: Dict[str, List[float]] = {}
+        for event in events:
+            durations.setdefault(f"{event['cat']}:{event['name']}", []).append(event["dur"] / 1e6)
+        labels = [f"<{bound * 1000:g}ms" for bound in HISTOGRAM_BUCKETS] + [f">={HISTOGRAM_BUCKETS[-1] * 1000:g}ms"]
+        lines = [f"{'operation':<36}{'n':>6}{'p50 (ms)':>10}{'p95 (ms)':>10}{'max (ms)':>10}  "
+                 + " ".join(f"{label:>9}" for label in labels)]
+        for name, samples in sorted(durations.items()):
+            samples.sort()
+            buckets = [0] * len(labels)
+            for sample in samples:
+                buckets[next((i for i, bound in enumerate(HISTOGRAM_BUCKETS) if sample < bound), -1)] += 1
+            lines.append(f"{name:<36}{len(samples):>6}{samples[round(.50 * (len(samples) - 1))] * 1000:>10.1f}"
+                         f"{samples[round(.95 * (len(samples) - 1))] * 1000:>10.1f}{samples[-1] * 1000:>10.1f}  "
+                         + " ".join(f"{count:>9}" for count in buckets))
+        lines.append(f"WebDriver round-trips: {sum(round_trips.values())} "
+                     f"({', '.join(f'{command}={count}' for command, count in round_trips.most_common())})")
+        return "\n".join(lines)
+
+
+def create_tracer(arguments: ParserArguments) -> NullTracer:
+    """
+    Creates the tracer requested by the parser arguments.
+
+    :param ParserArguments arguments: Parser Arguments to create from.
+    :return: A :class:`Tracer` if a trace file was given, otherwise a (no-op) :class:`NullTracer`.
+    :rtype: NullTracer
+    """
+    return NullTracer() if arguments.trace is None else Tracer()
+
+
+def traced(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+    Decorator measuring each call of a method with the instance's `_tracer` (calls straight through when disabled).
+
+    :param Optional[str] name: The operation name (None = the method name).
+    """
+    def decorator(method: Callable) -> Callable:
+        operation = method.__name__ if name is None else name
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            tracer: NullTracer = self._tracer
+            if not tracer.enabled:
+                return method(self, *args, **kwargs)
+            with tracer.span(operation):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -1,21 +1,32 @@
-from typing import Optional, Union, Any
+import json
+import sys
+import time
+from dataclasses import asdict
+from typing import Optional, Union, Any, List, Dict
 
-from selenium.common import NoSuchElementException
+from selenium.common import NoSuchElementException, WebDriverException
 
-from argument_types import ParserArguments
-from controller import Controller
+from argument_parser import get_parser_arguments
+from argument_types import ParserArguments, Command, SUCCESS_MESSAGE
+from checkpoint import Checkpointer, create_checkpoint
+from controller import BaseController, create_controller, error_message
+from script import read_script
 
 
 class Interface:
-    """Class used to have the Command Line interface with :class:`Controller`."""
-    _controller: Controller
-    """The underlying :class:`Controller` instance."""
+    """Class used to have the Command Line interface with :class:`Controller` (or any other controller backend)."""
+    _controller: BaseController
+    """The underlying controller instance."""
+    _checkpoint: Optional[Checkpointer]
+    """Saves the progress periodically, and restores it on start when resuming (None = no checkpoints)."""
 
-    def __init__(self, args_or_driver: Union[ParserArguments, Controller]):
-        if isinstance(args_or_driver, Controller):
+    def __init__(self, args_or_driver: Union[ParserArguments, BaseController],
+                 checkpoint: Optional[Checkpointer] = None):
+        self._checkpoint = checkpoint
+        if isinstance(args_or_driver, BaseController):
             self._controller = args_or_driver
         elif isinstance(args_or_driver, ParserArguments):
-            self._controller = Controller(args_or_driver)
+            self._controller = create_controller(args_or_driver)
         else:
             raise ValueError(f"Parameter must be either ParserArguments or Controller.")
 
@@ -35,13 +46,23 @@ class Interface:
         exit | quit
             Terminate the program.
         """
+        self._controller.print("I am Gandalf, and Gandalf means me! (If you don't know what to do, enter 'help'!)")
+        self._restore_checkpoint()
+        try:
+            self._run()
+        finally:
+            self._save_checkpoint(force=True)
+            self._controller.print("Farewell, my brave Hobbits. My work is now finished.")
+            self._controller.close()
+
+    def _run(self):
+        """The REPL of :py:meth:`run` (see its docstring for the commands)."""
         command: str = ""
         """Command received via user input; Expecting string literal in ['help', 'comment', 'guess', 'quit', 'exit']."""
         query: Optional[str] = None
         """Query received via user input; Expecting any comment/guess string. Not used outside loop."""
         response: Any = None
         """The response from :class:`Controller` to the comment/guess. Not used outside loop."""
-        self._controller.print("I am Gandalf, and Gandalf means me! (If you don't know what to do, enter 'help'!)")
         while command.split(sep=" ", maxsplit=1)[0].lower() not in ["quit", "exit"]:
             # Wait for user input ("All we have to decide is what to do with the time that is given us: ")
             command = input("> ")
@@ -62,29 +83,129 @@ class Interface:
                     except ValueError as ex:
                         response = ex.args
                     self._controller.print(response)
+                    self._save_checkpoint()
                 case "guess":
                     if query is None:
                         query = input("Please enter a guess to submit: ")
                     try:
-                        response = self._controller.submit_guess(query)
+                        response = self._submit_guess(query)
                     except NoSuchElementException as ex:
                         # ERROR: Can't submit a guess before submitting a comment for the level.
                         response = ex.msg
                     self._controller.print(response)
+                    self._save_checkpoint()
                 case "exit":
                     break
                 case "quit":
                     break
                 case _:
                     self._controller.print("I have no memory of this place; (Enter 'help' for a list of commands!)")
-        self._controller.print("Farewell, my brave Hobbits. My work is now finished.")
-        self._controller.close()
+
+    def _restore_checkpoint(self) -> None:
+        """Restores the session (level & cookies) saved to the checkpoint, if resuming one."""
+        if self._checkpoint is not None and self._checkpoint.state.url is not None:
+            self._controller.print(f"Resuming from checkpoint '{self._checkpoint.path}' ({self._checkpoint.state.url})")
+            self._controller.restore(self._checkpoint.state.url, self._checkpoint.state.cookies)
+
+    def _save_checkpoint(self, force: bool = False) -> None:
+        """Saves the session (level & cookies) to the checkpoint, if due (or forced)."""
+        if self._checkpoint is not None and (force or self._checkpoint.is_due):
+            try:
+                self._checkpoint.update_session(self._controller.current_url, self._controller.get_cookies())
+            except (WebDriverException, OSError):  # Session lost (e.g. the browser crashed); Keep the last saved one.
+                pass
+            self._checkpoint.save()
+
+    def _submit_guess(self, value: str) -> str:
+        """Submits a guess; A correct guess is recorded to the checkpoint (by level), if used."""
+        if self._checkpoint is None:
+            return self._controller.submit_guess(value)
+        url = self._controller.current_url  # Before moving on to the next level
+        response = self._controller.submit_guess(value)
+        if response.startswith(SUCCESS_MESSAGE):
+            self._checkpoint.set_password(url.rstrip("/").rsplit("/", 1)[-1], value)
+        return response
+
+    def run_script(self, commands: List[Command]) -> Dict[str, Any]:
+        """
+        Run a parsed CLI script (see :py:func:`script.parse_script`) without interactive prompts.
+
+        Commands marked invalid when parsing are skipped without reaching the site; The rest are run in order, and
+        their responses (or errors) are printed like in the interactive CLI. When resuming from a checkpoint, commands completed
+        in the previous run are skipped too (re-submitting the level's last comment if a guess follows); Commands
+        which failed are run again.
+
+        :param List[Command] commands: The commands to run.
+        :return: A summary of the run (counts & elapsed time), and the result of each command.
+        :rtype: Dict[str, Any]
+        """
+        start = time.monotonic()
+        skipped = sum(command.error is not None for command in commands)
+        resumed = 0
+        pending_comment: Optional[str] = None
+        """The latest comment completed in a previous run (re-submitted before the next guess, if any)."""
+        self._restore_checkpoint()
+        try:
+            for command in commands:
+                if command.error is not None:
+                    self._controller.print(f"Line {command.line_num}: Skipped ({command.error})")
+                    continue
+                if self._checkpoint is not None and self._checkpoint.is_done(f"line:{command.line_num}"):
+                    resumed += 1
+                    if command.command == "comment":
+                        pending_comment = command.query
+                    continue
+                try:
+                    if command.command == "comment":
+                        pending_comment = None
+                        command.response = self._controller.submit_comment(command.query)
+                    else:
+                        if pending_comment is not None:
+                            self._controller.submit_comment(pending_comment)
+                            pending_comment = None
+                        command.response = self._submit_guess(command.query)
+                except ValueError as ex:
+                    command.error = str(ex)
+                except (WebDriverException, OSError) as ex:  # E.g. missing elements, timeouts; OSError: The site's API
+                    command.error = error_message(ex)
+                self._controller.print(command.response if command.error is None else command.error)
+                if self._checkpoint is not None:
+                    if command.error is None:  # A failed line is run again when resuming.
+                        self._checkpoint.complete(f"line:{command.line_num}")
+                    self._save_checkpoint()
+        finally:
+            self._save_checkpoint(force=True)
+            self._controller.close()
+        return {
+            "commands": len(commands),
+            "skipped": skipped,
+            "resumed": resumed,
+            "failed": sum(command.error is not None for command in commands) - skipped,
+            "passed": sum(command.command == "guess" and command.response is not None
+                          and command.response.startswith(SUCCESS_MESSAGE) for command in commands),
+            "elapsed": time.monotonic() - start,
+            "results": [asdict(command) for command in commands],
+        }
 
 
 def main(arguments: Optional[ParserArguments] = None):
-    """Main function; Runs a new :class:`Interface` with the :class:`Controller` class with given CLI arguments."""
-    instance = Interface(Controller(arguments))
-    instance.run()
+    """
+    Main function; Runs a new :class:`Interface` with the controller backend given in the CLI arguments.
+
+    If a script was given, it is validated before the controller is created, run without interactive prompts, and a
+    JSON summary is printed to standard error at the end (apart from the responses on standard output).
+    """
+    if arguments is None:
+        arguments = get_parser_arguments()
+    if arguments.script is not None:
+        commands = read_script(arguments.script)  # Validate before launching the browser.
+        with create_controller(arguments) as controller:
+            summary = Interface(controller, create_checkpoint(arguments)).run_script(commands)
+        print(json.dumps(summary, ensure_ascii=False), file=sys.stderr)
+        return
+    with create_controller(arguments) as controller:
+        instance = Interface(controller, create_checkpoint(arguments))
+        instance.run()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,440 @@
+import json
+import multiprocessing
+import os
+import platform
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, replace
+from multiprocessing.process import BaseProcess
+from typing import Optional, List, Dict, Set, Tuple
+
+from argument_parser import get_parser_arguments
+from argument_types import ParserArguments, Job, JobResult, ArchiveRecord
+from campaign import Campaign, read_jobs
+from output import OutputBackend, RecordCollector, create_backend
+
+POLL_INTERVAL: float = 0.1
+"""Seconds between polls of the queue (by idle workers, and by the coordinator merging results)."""
+
+
+class JobQueue:
+    """
+    Persistent queue of campaign jobs, stored in SQLite & shared by the processes of a distributed campaign.
+
+    The database is in WAL mode, whose shared memory index only works between processes of the same host; Sharing the
+    file over a network filesystem is not supported.
+
+    Workers claim jobs with a lease, which they renew with heartbeats while the job runs; A job whose lease expired (its
+    worker died or hung) is put back on the queue by :py:meth:`requeue`. The first result reported for a job wins.
+    """
+    path: str
+    """The SQLite database file path."""
+    lease: float
+    """Seconds a claimed job stays leased to its worker without a heartbeat."""
+    _connection: sqlite3.Connection
+    """The database connection."""
+    _lock: threading.Lock
+    """Serializes access to :py:attr:`_connection`, so a worker can send heartbeats from another thread."""
+
+    def __init__(self, path: str, lease: float = 30.0):
+        """
+        The :class:`JobQueue` Constructor; Opens (or creates) the database.
+
+        :param str path: The SQLite database file path.
+        :param float lease: Seconds a claimed job stays leased to its worker without a heartbeat.
+        """
+        self.path = path
+        self.lease = lease
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("""CREATE TABLE IF NOT EXISTS jobs (
+            idx INTEGER PRIMARY KEY,
+            comment TEXT NOT NULL,
+            guesses TEXT NOT NULL,
+            state TEXT NOT NULL DEFAULT 'pending',
+            worker TEXT,
+            lease_until REAL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            result TEXT,
+            records TEXT,
+            emitted INTEGER NOT NULL DEFAULT 0)""")
+        columns = [row[1] for row in self._connection.execute("PRAGMA table_info(jobs)")]
+        if "records" not in columns:  # Queue created by an older version
+            self._connection.execute("ALTER TABLE jobs ADD COLUMN records TEXT")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, idx)")
+
+    def __enter__(self) -> "JobQueue":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def enqueue(self, jobs: List[Job]) -> int:
+        """
+        Adds the jobs to the queue; Jobs already queued (by index, e.g. when resuming) are left as they are.
+
+        :param List[Job] jobs: The jobs to add.
+        :return: How many jobs were added.
+        :rtype: int
+        """
+        with self._lock:
+            before = self._connection.total_changes
+            self._connection.execute("BEGIN IMMEDIATE")
+            self._connection.executemany("INSERT OR IGNORE INTO jobs (idx, comment, guesses) VALUES (?, ?, ?)",
+                                         [(job.index, job.comment, json.dumps(job.guesses)) for job in jobs])
+            self._connection.execute("COMMIT")
+            return self._connection.total_changes - before
+
+    def claim(self, worker: str) -> Optional[Job]:
+        """
+        Leases the first pending job to the worker.
+
+        :param str worker: The name of the worker.
+        :return: The claimed job (None = no pending jobs).
+        :rtype: Optional[Job]
+        """
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._connection.execute("SELECT idx, comment, guesses FROM jobs WHERE state = 'pending' "
+                                               "ORDER BY idx LIMIT 1").fetchone()
+                if row is not None:
+                    self._connection.execute("UPDATE jobs SET state = 'leased', worker = ?, lease_until = ?, "
+                                             "attempts = attempts + 1 WHERE idx = ?",
+                                             (worker, time.time() + self.lease, row[0]))
+            finally:
+                self._connection.execute("COMMIT")
+        return None if row is None else Job(row[0], row[1], json.loads(row[2]))
+
+    def heartbeat(self, worker: str, index: int) -> bool:
+        """
+        Renews the worker's lease on a job.
+
+        :param str worker: The name of the worker.
+        :param int index: The index of the job.
+        :return: Whether the job is still leased to the worker.
+        :rtype: bool
+        """
+        with self._lock:
+            cursor = self._connection.execute("UPDATE jobs SET lease_until = ? WHERE idx = ? AND worker = ? "
+                                              "AND state = 'leased'", (time.time() + self.lease, index, worker))
+            return cursor.rowcount == 1
+
+    def report(self, result: JobResult, records: Optional[List[ArchiveRecord]] = None) -> bool:
+        """
+        Stores the result of a job, and the typed records of its comments & guesses.
+
+        :param JobResult result: The result of the job.
+        :param Optional[List[ArchiveRecord]] records: The typed records written while running the job (None = none).
+        :return: Whether the result was stored (False = a result was already reported, e.g. after a requeue).
+        :rtype: bool
+        """
+        records = json.dumps([asdict(record) for record in records or []])
+        with self._lock:
+            cursor = self._connection.execute("UPDATE jobs SET state = 'done', lease_until = NULL, result = ?, "
+                                              "records = ? WHERE idx = ? AND state != 'done'",
+                                              (json.dumps(asdict(result)), records, result.index))
+            return cursor.rowcount == 1
+
+    def requeue(self, max_attempts: int, worker: Optional[str] = None) -> int:
+        """
+        Puts leased jobs back on the queue: those whose lease expired, or all of the given worker's (e.g. it died).
+
+        A job already leased :param:`max_attempts` times is reported as failed instead, so a job which keeps crashing
+        its workers can't stall the campaign.
+
+        :param int max_attempts: How many times a job may be leased.
+        :param Optional[str] worker: The name of the worker whose jobs to put back (None = jobs with expired leases).
+        :return: How many jobs were put back on the queue.
+        :rtype: int
+        """
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                if worker is None:
+                    rows = self._connection.execute("SELECT idx, comment, attempts, worker FROM jobs WHERE state = "
+                                                    "'leased' AND lease_until < ?", (time.time(),)).fetchall()
+                else:
+                    rows = self._connection.execute("SELECT idx, comment, attempts, worker FROM jobs WHERE state = "
+                                                    "'leased' AND worker = ?", (worker,)).fetchall()
+                requeued = [(index,) for index, _, attempts, _ in rows if attempts < max_attempts]
+                failed = [(json.dumps(asdict(JobResult(index, comment, attempts=attempts,
+                                                       error=f"Worker lost ({name}) on attempt {attempts}"))), index)
+                          for index, comment, attempts, name in rows if attempts >= max_attempts]
+                self._connection.executemany("UPDATE jobs SET state = 'pending', worker = NULL, lease_until = NULL "
+                                             "WHERE idx = ?", requeued)
+                self._connection.executemany("UPDATE jobs SET state = 'done', lease_until = NULL, result = ? "
+                                             "WHERE idx = ?", failed)
+            finally:
+                self._connection.execute("COMMIT")
+        return len(requeued)
+
+    def fail_remaining(self, error: str) -> int:
+        """
+        Reports all unfinished jobs as failed (e.g. no workers are left to run them).
+
+        :param str error: The error of the results.
+        :return: How many jobs were reported.
+        :rtype: int
+        """
+        with self._lock:
+            rows = self._connection.execute("SELECT idx, comment, attempts FROM jobs WHERE state != 'done'").fetchall()
+        return sum(self.report(JobResult(index, comment, attempts=attempts, error=error))
+                   for index, comment, attempts in rows)
+
+    def ready(self, limit: int = 1000) -> List[Tuple[JobResult, List[ArchiveRecord]]]:
+        """
+        Returns the results which can be merged next: the longest run of finished jobs, in job order, following the
+        last merged one (see :py:meth:`mark_emitted`).
+
+        :param int limit: Maximum number of results to return.
+        :return: The results, in job order, each with the typed records of the job (see :py:meth:`report`).
+        :rtype: List[Tuple[JobResult, List[ArchiveRecord]]]
+        """
+        with self._lock:
+            rows = self._connection.execute("SELECT state, result, records FROM jobs WHERE emitted = 0 ORDER BY idx "
+                                            "LIMIT ?", (limit,)).fetchall()
+        results: List[Tuple[JobResult, List[ArchiveRecord]]] = []
+        for state, result, records in rows:
+            if state != "done":
+                break
+            obj = json.loads(result)
+            results.append((JobResult(**{**obj, "guesses": [tuple(guess) for guess in obj["guesses"]]}),
+                            [ArchiveRecord(**record) for record in json.loads(records or "[]")]))
+        return results
+
+    def mark_emitted(self, results: List[JobResult]) -> None:
+        """Marks the results as merged into the output, so a resumed coordinator doesn't write them again."""
+        with self._lock:
+            self._connection.executemany("UPDATE jobs SET emitted = 1 WHERE idx = ?",
+                                         [(result.index,) for result in results])
+
+    def counts(self) -> Dict[str, int]:
+        """Returns the number of jobs in each state (`pending`, `leased`, `done`), and not yet merged (`unmerged`)."""
+        with self._lock:
+            counts = dict(self._connection.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+            unmerged = self._connection.execute("SELECT COUNT(*) FROM jobs WHERE emitted = 0").fetchone()[0]
+        return {"pending": 0, "leased": 0, "done": 0, **counts, "unmerged": unmerged}
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+class Worker:
+    """
+    Runs jobs from the queue on a single controller session (see :py:meth:`Campaign.run_job`), until no jobs are left;
+    Renews the lease of the running job from a background thread.
+
+    The typed records of each job (see :class:`ArchiveRecord`) are reported along with its result, so the coordinator
+    writes them to its output (e.g. `garc`), whatever output the worker itself was started with.
+    """
+    name: str
+    """The name of the worker (unique across processes)."""
+    _queue: JobQueue
+    """The queue jobs are claimed from."""
+    _campaign: Campaign
+    """Runs each job (with retries) on this worker's session."""
+    _records: RecordCollector
+    """Collects the typed records of the running job."""
+
+    def __init__(self, arguments: ParserArguments, name: Optional[str] = None):
+        """
+        The :class:`Worker` Constructor.
+
+        :param ParserArguments arguments: Parser Arguments for the controller session & the queue.
+        :param Optional[str] name: The name of the worker (None = host name & process ID).
+        """
+        self.name = f"{platform.node()}:{os.getpid()}" if name is None else name
+        if arguments.trace is not None:  # One trace file per worker
+            root, extension = os.path.splitext(arguments.trace)
+            arguments = replace(arguments, trace=f"{root}.{os.getpid()}{extension}")
+        self._records = RecordCollector()
+        self._queue = JobQueue(arguments.queue, lease=arguments.lease)
+        self._campaign = Campaign(replace(arguments, workers=1, checkpoint=None, resume=False), output=self._records)
+
+    def _heartbeat(self, index: int, stop: threading.Event) -> None:
+        """Renews the lease on the job every third of the lease, until stopped (or the lease was lost)."""
+        while not stop.wait(self._queue.lease / 3):
+            if not self._queue.heartbeat(self.name, index):
+                return
+
+    def run(self) -> int:
+        """
+        Runs jobs until the queue has no pending or leased jobs left (leased jobs may still be put back on the queue);
+        A job raising an unexpected error is reported as failed, and the worker moves on to the next one.
+
+        :return: How many jobs were run.
+        :rtype: int
+        """
+        count = 0
+        while True:
+            job = self._queue.claim(self.name)
+            if job is None:
+                counts = self._queue.counts()
+                if counts["pending"] == 0 and counts["leased"] == 0:
+                    return count
+                time.sleep(POLL_INTERVAL)
+                continue
+            stop = threading.Event()
+            heartbeat = threading.Thread(target=self._heartbeat, args=(job.index, stop), daemon=True)
+            heartbeat.start()
+            try:
+                result = self._campaign.run_job(job)
+            except Exception as ex:  # Not handled by the campaign; Fail the job instead of the worker.
+                result = JobResult(job.index, job.comment, attempts=1, error=f"{type(ex).__name__}: {ex}")
+            finally:
+                stop.set()
+                heartbeat.join()
+            self._queue.report(result, self._records.take())
+            count += 1
+
+    def close(self) -> None:
+        """Closes the controller session & the queue."""
+        self._campaign.close()
+        self._queue.close()
+
+
+def run_worker(arguments: ParserArguments, name: Optional[str] = None) -> int:
+    """
+    Runs a :class:`Worker` until no jobs are left (the target of the processes spawned by :class:`Coordinator`).
+
+    :param ParserArguments arguments: Parser Arguments for the worker.
+    :param Optional[str] name: The name of the worker (None = host name & process ID).
+    :return: How many jobs were run.
+    :rtype: int
+    """
+    worker = Worker(arguments, name)
+    try:
+        return worker.run()
+    finally:
+        worker.close()
+
+
+class Coordinator:
+    """
+    Runs a campaign across worker processes sharing a :class:`JobQueue`: Enqueues the jobs, spawns local workers,
+    puts the jobs of dead workers (or expired leases) back on the queue, and merges the results into the output in job
+    order as they arrive.
+
+    More workers (on the same host, see :class:`JobQueue`) can join at any time with `--role worker`. The queue
+    doubles as a checkpoint: re-running the coordinator on the same queue only runs (and writes) the unfinished jobs.
+    """
+    _arguments: ParserArguments
+    """Parser Arguments for the coordinator & its workers."""
+    _output: OutputBackend
+    """The output backend results are merged into (in job order)."""
+    _queue: JobQueue
+    """The queue shared with the workers."""
+    _processes: Dict[str, BaseProcess]
+    """The spawned worker processes, by worker name."""
+
+    def __init__(self, arguments: ParserArguments, output: Optional[OutputBackend] = None):
+        """
+        The :class:`Coordinator` Constructor.
+
+        :param ParserArguments arguments: Parser Arguments for the coordinator & its workers.
+        :param Optional[OutputBackend] output: Output backend to merge results into (None = create from arguments).
+        """
+        self._arguments = arguments
+        self._output = create_backend(arguments) if output is None else output
+        self._queue = JobQueue(arguments.queue, lease=arguments.lease)
+        self._processes = {}
+
+    def _spawn(self, count: int) -> None:
+        """Starts worker processes (spawned, so they don't inherit the coordinator's database connection)."""
+        context = multiprocessing.get_context("spawn")
+        for _ in range(count):
+            name = f"{platform.node()}:{os.getpid()}:{len(self._processes)}"
+            self._processes[name] = context.Process(target=run_worker, args=(self._arguments, name), name=name,
+                                                    daemon=True)
+            self._processes[name].start()
+
+    def _merge(self) -> List[JobResult]:
+        """
+        Writes the results which are next in job order to the output (flushed before they are marked merged); A typed
+        output (e.g. `garc`) gets the records of each job instead (see :py:meth:`OutputBackend.write_record`).
+        """
+        results = []
+        for result, records in self._queue.ready():
+            self._output.write(asdict(result))
+            for record in records:
+                self._output.write_record(record)
+            results.append(result)
+        if results:
+            self._output.flush()
+            self._queue.mark_emitted(results)
+        return results
+
+    def run(self, jobs: List[Job]) -> List[JobResult]:
+        """
+        Runs the jobs across :py:attr:`ParserArguments.workers` local worker processes (and any external workers),
+        writing results to the output in job order as soon as they are available.
+
+        A job is leased at most :py:attr:`ParserArguments.retries` + 1 times; If its workers keep dying, it is reported
+        as failed. If all local workers died, the unfinished jobs are reported as failed.
+
+        :param List[Job] jobs: The jobs to run.
+        :return: The results merged by this run, in job order.
+        :rtype: List[JobResult]
+        """
+        self._queue.enqueue(jobs)
+        counts = self._queue.counts()
+        self._spawn(min(max(self._arguments.workers, 1), counts["pending"] + counts["leased"]))
+        results: List[JobResult] = []
+        lost: Set[str] = set()
+        max_attempts = self._arguments.retries + 1
+        while True:
+            for name, process in self._processes.items():
+                if name not in lost and not process.is_alive():
+                    lost.add(name)
+                    if process.exitcode != 0:
+                        self._queue.requeue(max_attempts, worker=name)
+            self._queue.requeue(max_attempts)
+            merged = self._merge()
+            results += merged
+            counts = self._queue.counts()
+            if counts["unmerged"] == 0:
+                return results
+            if len(lost) == len(self._processes) and counts["pending"] > 0 and counts["leased"] == 0:
+                self._queue.fail_remaining("No workers left")  # (Leased jobs may still be run by external workers)
+            time.sleep(POLL_INTERVAL)
+
+    def close(self) -> None:
+        """Stops the worker processes still running, and closes the queue & the output backend."""
+        for process in self._processes.values():
+            process.join(timeout=POLL_INTERVAL * 10)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self._queue.close()
+        self._output.close()
+
+
+def main(arguments: Optional[ParserArguments] = None):
+    """
+    Main function; Runs the campaign file given in the CLI arguments through the job queue (as the coordinator), or
+    runs jobs from the queue until none are left (as a worker).
+    """
+    if arguments is None:
+        arguments = get_parser_arguments()
+    if arguments.role == "worker":
+        print(f"Ran {run_worker(arguments)} jobs.")
+        return
+    start = time.monotonic()
+    coordinator = Coordinator(arguments)
+    try:
+        results = coordinator.run(read_jobs(arguments.campaign))
+    finally:
+        coordinator.close()
+    failed = sum(result.error is not None for result in results)
+    print(f"Merged {len(results)} results ({failed} failed) in {time.monotonic() - start:.1f} seconds.")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,26 @@
-import interface
 from argument_parser import get_parser_arguments
 
 
 def main():
-    """Main function; Runs the program."""
-    interface.main(get_parser_arguments())
+    """
+    Main function; Runs the program (distributed campaign if a job queue was given, batch campaign if a prompt file was
+    given, the solver if `--auto` was given, otherwise the interactive CLI).
+
+    The selected mode is imported only after the arguments were parsed, so `--help` & argument errors return quickly.
+    """
+    arguments = get_parser_arguments()
+    if arguments.queue is not None:
+        import job_queue
+        job_queue.main(arguments)
+    elif arguments.campaign is not None:
+        import campaign
+        campaign.main(arguments)
+    elif arguments.auto:
+        import solver
+        solver.main(arguments)
+    else:
+        import interface
+        interface.main(arguments)
 
 
 if __name__ == '__main__':
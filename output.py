@@ -0,0 +1,659 @@
+import csv
+import io
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+from abc import ABC, abstractmethod
+from dataclasses import asdict
+from datetime import datetime
+from threading import RLock
+from typing import Optional, List, Dict, Type, BinaryIO, Iterable, Iterator, Tuple, Any
+
+from argument_types import ParserArguments, FormatType, JsonMode, ArchiveRecord, OutcomeType, Outcomes
+
+
+class OutputBackend(ABC):
+    """
+    Abstract base class for output backends; One subclass per supported output format (see :py:data:`Backends`).
+
+    Backends hold their file handle open for their whole lifetime, and buffer formatted records in memory until
+    either :py:attr:`flush_size` records are pending, or :py:attr:`flush_interval` seconds have passed since the last
+    flush (checked on each write), or :py:meth:`flush` / :py:meth:`close` are called.
+    """
+    extension: Optional[FormatType] = None
+    """The output format handled by this backend (None = not bound to a format)."""
+    typed: bool = False
+    """Whether the backend stores typed records (see :py:meth:`write_record`) instead of the values written."""
+    path: Optional[str]
+    """The output file path (None = standard output)."""
+    encoding: str
+    """Encoding for output file."""
+    flush_interval: float
+    """Maximum seconds to keep records buffered before writing them (0 = write immediately)."""
+    flush_size: int
+    """Maximum number of records to keep buffered before writing them (1 = write immediately)."""
+    rows: int
+    """Number of records written (or buffered) so far."""
+    _buffer: List[str]
+    """Formatted records waiting to be written."""
+    _last_flush: float
+    """Monotonic time of the last flush."""
+    _lock: RLock
+    """Guards the buffer & file handle, so backends can be shared between threads."""
+
+    def __init__(self, path: Optional[str] = None, encoding: str = "utf",
+                 flush_interval: float = 1.0, flush_size: int = 64):
+        """
+        The :class:`OutputBackend` Constructor.
+
+        :param Optional[str] path: The output file path (None = standard output).
+        :param str encoding: Encoding for output file.
+        :param float flush_interval: Maximum seconds to keep records buffered before writing them.
+        :param int flush_size: Maximum number of records to keep buffered before writing them.
+        """
+        self.path = path
+        self.encoding = encoding
+        self.flush_interval = flush_interval
+        self.flush_size = max(flush_size, 1)
+        self.rows = 0
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._lock = RLock()
+
+    def __enter__(self) -> "OutputBackend":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def write(self, *values: object, sep: Optional[str] = " ", end: Optional[str] = "\n", flush: bool = False) -> None:
+        """
+        Formats the values as record(s) & buffers them, flushing if needed.
+
+        :param *object values: Values to write.
+        :param Optional[str] sep: string inserted between values, default a space (if supported by the format).
+        :param Optional[str] end: string appended after the last value, default a newline (if supported by the format).
+        :param bool flush: whether to forcibly flush the buffer.
+        :return: None
+        :rtype: NoneType
+        """
+        with self._lock:
+            self._buffer.extend(self._format(*values, sep=" " if sep is None else sep, end="\n" if end is None else end))
+            if (flush or len(self._buffer) >= self.flush_size
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self.flush()
+
+    def write_record(self, record: ArchiveRecord) -> None:
+        """
+        Writes a typed record of a submitted comment or guess; Row formats already get the same information as text
+        (see :py:meth:`BaseController.print`), so this does nothing unless the backend is :py:attr:`typed`.
+
+        :param ArchiveRecord record: The record to write.
+        """
+
+    def flush(self) -> None:
+        """Writes all buffered records to the output."""
+        with self._lock:
+            if self._buffer:
+                self._write("".join(self._buffer))
+                self._buffer.clear()
+            self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        """Flushes the buffer & closes the output."""
+        with self._lock:
+            self.flush()
+
+    def _format(self, *values: object, sep: str, end: str) -> List[str]:
+        """
+        Formats the values as record(s) (also responsible for advancing :py:attr:`rows`).
+
+        :return: The formatted records.
+        :rtype: List[str]
+        """
+        self.rows += 1
+        return [sep.join(map(str, values)) + end]
+
+    @abstractmethod
+    def _write(self, text: str) -> None:
+        """Writes the (already formatted) text to the output."""
+
+
+class StdoutBackend(OutputBackend):
+    """Backend for standard output (`stdout`); Never buffers, so the interactive prompt stays in sync."""
+    extension = "stdout"
+
+    def __init__(self, path: Optional[str] = None, encoding: str = "utf",
+                 flush_interval: float = 0, flush_size: int = 1):
+        super().__init__(None, encoding, flush_interval=0, flush_size=1)
+
+    def _write(self, text: str) -> None:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+
+class NullBackend(OutputBackend):
+    """Backend discarding all output; Used for worker sessions whose output is collected elsewhere."""
+
+    def __init__(self, path: Optional[str] = None, encoding: str = "utf",
+                 flush_interval: float = 0, flush_size: int = 1):
+        super().__init__(None, encoding, flush_interval=0, flush_size=1)
+
+    def _format(self, *values: object, sep: str, end: str) -> List[str]:
+        return []
+
+    def _write(self, text: str) -> None:
+        pass
+
+
+class RecordCollector(NullBackend):
+    """
+    Typed backend keeping the records in memory until they are taken (see :py:meth:`take`), discarding plain values;
+    Used by the worker processes of :mod:`job_queue`, whose records are written to the output by the coordinator.
+    """
+    typed = True
+    _records: List[ArchiveRecord]
+    """Records written since the last :py:meth:`take`."""
+
+    def __init__(self, path: Optional[str] = None, encoding: str = "utf",
+                 flush_interval: float = 0, flush_size: int = 1):
+        super().__init__(path, encoding)
+        self._records = []
+
+    def write_record(self, record: ArchiveRecord) -> None:
+        with self._lock:
+            self._records.append(record)
+            self.rows += 1
+
+    def take(self) -> List[ArchiveRecord]:
+        """
+        Returns the records written since the last call, and forgets them.
+
+        :return: The records, in order.
+        :rtype: List[ArchiveRecord]
+        """
+        with self._lock:
+            records, self._records = self._records, []
+        return records
+
+
+class FileBackend(OutputBackend):
+    """Base class for backends writing to a text file, opened once in append mode."""
+    _file: Optional[io.TextIOWrapper]
+    """The underlying file handle (None = closed)."""
+
+    def __init__(self, path: str, encoding: str = "utf", flush_interval: float = 1.0, flush_size: int = 64):
+        super().__init__(path, encoding, flush_interval=flush_interval, flush_size=flush_size)
+        self._file = open(self.path, "a+", encoding=self.encoding, newline="")
+
+    @property
+    def closed(self) -> bool:
+        """Whether the underlying file handle has been closed."""
+        return self._file is None
+
+    def _write(self, text: str) -> None:
+        if self._file is None:
+            raise ValueError(f"I/O operation on closed output ({self.path})")
+        self._file.write(text)
+        self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            self.flush()
+            self._file.close()
+            self._file = None
+
+
+class TxtBackend(FileBackend):
+    """Backend for regular text files (`txt`); Same output as :py:func:`print`."""
+    extension = "txt"
+
+
+class CsvBackend(FileBackend):
+    """
+    Backend for CSV files (`csv`); One row per value: [line_num, timestamp, value].
+
+    The header is written once, when the file is empty; The row counter continues from the rows already in the file.
+    """
+    extension = "csv"
+    header: List[str] = ["line_num", "timestamp", "value"]
+    """The CSV header row."""
+    _rows_buffer: io.StringIO
+    """Scratch buffer used by :py:attr:`_writer` to format rows."""
+    _writer: csv.writer
+    """Formats rows into :py:attr:`_rows_buffer`."""
+
+    def __init__(self, path: str, encoding: str = "utf", flush_interval: float = 1.0, flush_size: int = 64):
+        super().__init__(path, encoding, flush_interval=flush_interval, flush_size=flush_size)
+        self._rows_buffer = io.StringIO()
+        self._writer = csv.writer(self._rows_buffer)
+        self._file.seek(0)
+        reader = csv.reader(self._file)  # Read once, instead of on every write.
+        first_row = next(reader, None)
+        if first_row is None:
+            self._write(self._format_row(self.header))
+        else:
+            self.rows = sum(1 for _ in reader) + (first_row != self.header)  # Excluding the header (if any)
+
+    def _format_row(self, row: List[object]) -> str:
+        """Formats a single row as CSV text."""
+        self._rows_buffer.seek(0)
+        self._rows_buffer.truncate()
+        self._writer.writerow(row)
+        return self._rows_buffer.getvalue()
+
+    def _format(self, *values: object, sep: str, end: str) -> List[str]:
+        records = []
+        for value in values:
+            records.append(self._format_row([self.rows, datetime.now(), str(value)]))
+            self.rows += 1
+        return records
+
+
+class JsonBackend(OutputBackend):
+    """
+    Append-only streaming backend for JSON files (`json`); Each value is a separate element of a single JSON array.
+
+    Every record is appended to the end of the file, so the cost of a write does not depend on how large the file
+    already is. The array is finalized (closing bracket) on :py:meth:`close`; Re-opening an existing array (finalized
+    or not) continues appending to it.
+    """
+    extension = "json"
+    mode: JsonMode = "array"
+    """Whether to write a JSON array (`array`) or JSON Lines (`lines`)."""
+    _file: Optional[BinaryIO]
+    """The underlying file handle (None = closed)."""
+
+    def __init__(self, path: str, encoding: str = "utf", flush_interval: float = 1.0, flush_size: int = 64):
+        super().__init__(path, encoding, flush_interval=flush_interval, flush_size=flush_size)
+        self._file = open(self.path, "ab+")
+        if self.mode == "array":
+            self._open_array()
+
+    @property
+    def closed(self) -> bool:
+        """Whether the underlying file handle has been closed."""
+        return self._file is None
+
+    def _open_array(self):
+        """
+        Prepares the file for appending array elements, by removing the closing bracket of an existing array (written
+        by :py:meth:`close` on a line of its own, or right after the opening bracket of an empty array, or by another
+        writer, e.g. :py:func:`json.dump`); An array which wasn't finalized (e.g. after a crash) is continued as it is.
+
+        Only the tail (and first byte) of the file is read, so re-opening a large file is still cheap; Unless it ends
+        with a bracket which may also end a list element (see :py:meth:`_read_array`).
+
+        :raises ValueError: The file isn't empty, but doesn't contain a JSON array (it is left untouched).
+        """
+        position = self._file.seek(0, os.SEEK_END)
+        if position == 0:  # New or empty file
+            self._file.write(b"[")
+            return
+        self._file.seek(0)
+        if self._file.read(1) != b"[":
+            self._file.close()
+            self._file = None
+            raise ValueError(f"Output file exists, but is not a JSON array ({self.path})")
+        while position > 1:  # Skip trailing whitespace
+            self._file.seek(position - 1)
+            if not self._file.read(1).isspace():
+                break
+            position -= 1
+        if position > 1:
+            self._file.seek(position - 2)
+            before, last = self._file.read(2)
+            if last == ord("]") and (before == ord("\n") or position == 2):  # Not the end of a list element
+                position -= 1
+            elif last == ord("]"):  # End of a compact array (e.g. written by `json.dump`), or of a list element
+                array = self._read_array()
+                if array is not None:
+                    position = position - 1 if array else 1  # (Whitespace-only arrays are emptied)
+        self._file.truncate(position)
+        self.rows = 0 if position <= 1 else 1  # Only whether the array is empty matters.
+
+    def _read_array(self) -> Optional[list]:
+        """
+        Reads the whole file, telling a finalized array from one which wasn't (whose last element is a list).
+
+        :return: The elements of the array (None = not finalized).
+        :rtype: Optional[list]
+        """
+        self._file.seek(0)
+        try:
+            array = json.loads(self._file.read().decode(self.encoding))
+        except ValueError:
+            return None
+        return array if isinstance(array, list) else None
+
+    def _format(self, *values: object, sep: str, end: str) -> List[str]:
+        records = []
+        for value in values:
+            record = json.dumps(value, default=str, ensure_ascii=False)
+            if self.mode == "lines":
+                records.append(f"{record}\n")
+            else:
+                records.append(f"{',' if self.rows else ''}\n{record}")
+            self.rows += 1
+        return records
+
+    def _write(self, text: str) -> None:
+        if self._file is None:
+            raise ValueError(f"I/O operation on closed output ({self.path})")
+        self._file.write(text.encode(self.encoding))
+        self._file.flush()
+
+    def close(self) -> None:
+        """Flushes the buffer, finalizes the array (`array` mode) & closes the file. Does nothing if already closed."""
+        with self._lock:
+            if self._file is None:
+                return
+            self.flush()
+            if self.mode == "array":
+                self._file.write(b"\n]" if self.rows else b"]")
+            self._file.close()
+            self._file = None
+
+
+class JsonLinesBackend(JsonBackend):
+    """Append-only streaming backend for JSON Lines files (`jsonl`); One JSON value per line, valid after each write."""
+    extension = "jsonl"
+    mode = "lines"
+
+
+ARCHIVE_MAGIC: bytes = b"GARC"
+"""Marks the start of each chunk of an archive (followed by the header length, see :py:data:`ARCHIVE_HEADER`)."""
+ARCHIVE_HEADER = struct.Struct("<4sI")
+"""Binary layout of the start of each chunk: the magic, and the length of the JSON header which follows."""
+ARCHIVE_CHUNK_SIZE: int = 4096
+"""Minimum number of records to keep buffered before writing them as a chunk (unless flushed earlier)."""
+ARCHIVE_COLUMNS: List[str] = ["timestamp", "level", "prompt", "answer", "guess", "outcome", "latency"]
+"""The columns of an archive chunk, in the order they are stored."""
+
+
+class ArchiveBackend(OutputBackend):
+    """
+    Backend for compressed columnar archives (`garc`) of typed records (see :class:`ArchiveRecord`).
+
+    Records are written in self-contained chunks, appended to the file: a JSON header (row count, time range, and the
+    levels & outcomes in the chunk), followed by each column compressed separately with `zlib`; Timestamps & latencies
+    are stored as doubles, levels & outcomes as dictionary codes, and texts as JSON arrays. This lets
+    :class:`ArchiveReader` skip whole chunks by their header, and decompress only the columns it filters on until a
+    chunk matches. Plain values (e.g. the CLI's messages) are not typed records, and are skipped.
+    """
+    extension = "garc"
+    typed = True
+    _records: List[ArchiveRecord]
+    """Records waiting to be written (as a single chunk)."""
+    _file: Optional[BinaryIO]
+    """The underlying file handle (None = closed)."""
+
+    def __init__(self, path: str, encoding: str = "utf", flush_interval: float = 1.0, flush_size: int = 64):
+        super().__init__(path, encoding, flush_interval=flush_interval,
+                         flush_size=max(flush_size, ARCHIVE_CHUNK_SIZE))  # Larger chunks compress better
+        self._records = []
+        self._file = open(self.path, "ab")
+
+    @property
+    def closed(self) -> bool:
+        """Whether the underlying file handle has been closed."""
+        return self._file is None
+
+    def _format(self, *values: object, sep: str, end: str) -> List[str]:
+        return []
+
+    def write_record(self, record: ArchiveRecord) -> None:
+        with self._lock:
+            self._records.append(record)
+            self.rows += 1
+            if len(self._records) >= self.flush_size or time.monotonic() - self._last_flush >= self.flush_interval:
+                self.flush()
+
+    def flush(self) -> None:
+        """Writes all buffered records to the output, as a single chunk."""
+        with self._lock:
+            if self._records:
+                if self._file is None:
+                    raise ValueError(f"I/O operation on closed output ({self.path})")
+                self._file.write(encode_chunk(self._records))
+                self._file.flush()
+                self._records = []
+            self._last_flush = time.monotonic()
+
+    def _write(self, text: str) -> None:
+        pass
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            self.flush()
+            self._file.close()
+            self._file = None
+
+
+def encode_chunk(records: List[ArchiveRecord]) -> bytes:
+    """
+    Encodes records as a single archive chunk (see :class:`ArchiveBackend`).
+
+    :param List[ArchiveRecord] records: The records to encode.
+    :return: The chunk.
+    :rtype: bytes
+    """
+    levels = list(dict.fromkeys(record.level for record in records))
+    level_codes = {level: code for code, level in enumerate(levels)}
+    columns = {
+        "timestamp": struct.pack(f"<{len(records)}d", *[record.timestamp for record in records]),
+        "level": struct.pack(f"<{len(records)}I", *[level_codes[record.level] for record in records]),
+        "prompt": json.dumps([record.prompt for record in records], ensure_ascii=False).encode(),
+        "answer": json.dumps([record.answer for record in records], ensure_ascii=False).encode(),
+        "guess": json.dumps([record.guess for record in records], ensure_ascii=False).encode(),
+        "outcome": bytes(Outcomes.index(record.outcome) for record in records),
+        "latency": struct.pack(f"<{len(records)}d", *[record.latency for record in records]),
+    }
+    blocks = [zlib.compress(columns[name]) for name in ARCHIVE_COLUMNS]
+    header = json.dumps({
+        "rows": len(records),
+        "start": min(record.timestamp for record in records),
+        "end": max(record.timestamp for record in records),
+        "levels": levels,
+        "outcomes": sorted({record.outcome for record in records}, key=Outcomes.index),
+        "columns": [[name, len(block)] for name, block in zip(ARCHIVE_COLUMNS, blocks)],
+    }, ensure_ascii=False).encode()
+    return b"".join([ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, len(header)), header, *blocks])
+
+
+class ArchiveReader:
+    """
+    Reads the typed records of archives (see :class:`ArchiveBackend`), optionally filtered by level & outcome.
+
+    Chunks whose header lists none of the requested levels or outcomes are skipped without reading their columns; In
+    the rest, only the level & outcome columns are decompressed, and the other columns only if some records match.
+    A truncated chunk at the end of a file (e.g. the writer crashed) is ignored.
+    """
+    paths: List[str]
+    """The archive file paths, read in order."""
+    chunks_read: int
+    """Number of chunks whose columns were decompressed (by the latest :py:meth:`read`)."""
+    chunks_skipped: int
+    """Number of chunks skipped by their header alone (by the latest :py:meth:`read`)."""
+
+    def __init__(self, *paths: str):
+        """
+        The :class:`ArchiveReader` Constructor.
+
+        :param *str paths: The archive file paths, read in order.
+        """
+        self.paths = list(paths)
+        self.chunks_read = 0
+        self.chunks_skipped = 0
+
+    def headers(self) -> Iterator[Dict[str, Any]]:
+        """
+        Reads the header of each chunk (without reading its columns).
+
+        :return: The headers, in order.
+        :rtype: Iterator[Dict[str, Any]]
+        """
+        for path in self.paths:
+            with open(path, "rb") as file:
+                for header, _ in self._chunks(file):
+                    yield header
+
+    @staticmethod
+    def _chunks(file: BinaryIO) -> Iterator[Tuple[Dict[str, Any], int]]:
+        """Yields the header & columns offset of each complete chunk in the file, seeking past its columns."""
+        size = os.fstat(file.fileno()).st_size
+        while True:
+            start = file.read(ARCHIVE_HEADER.size)
+            if len(start) < ARCHIVE_HEADER.size:
+                return
+            magic, length = ARCHIVE_HEADER.unpack(start)
+            if magic != ARCHIVE_MAGIC:
+                raise ValueError(f"Not an archive chunk at offset {file.tell() - ARCHIVE_HEADER.size} ({file.name})")
+            try:
+                header = json.loads(file.read(length))
+            except ValueError:  # Truncated header
+                return
+            offset = file.tell()
+            end = offset + sum(block_size for _, block_size in header["columns"])
+            if end > size:  # Truncated columns
+                return
+            yield header, offset
+            file.seek(end)
+
+    @staticmethod
+    def _column(file: BinaryIO, header: Dict[str, Any], offset: int, name: str) -> List[Any]:
+        """Reads & decodes a single column of a chunk."""
+        for column, block_size in header["columns"]:
+            if column == name:
+                file.seek(offset)
+                data = zlib.decompress(file.read(block_size))
+                break
+            offset += block_size
+        else:
+            raise ValueError(f"Column not found: {name}")
+        match name:
+            case "timestamp" | "latency":
+                return list(struct.unpack(f"<{header['rows']}d", data))
+            case "level":
+                return [header["levels"][code] for code in struct.unpack(f"<{header['rows']}I", data)]
+            case "outcome":
+                return [Outcomes[code] for code in data]
+            case _:
+                return json.loads(data)
+
+    def read(self, levels: Optional[Iterable[str]] = None,
+             outcomes: Optional[Iterable[OutcomeType]] = None) -> Iterator[ArchiveRecord]:
+        """
+        Reads the records, in order, skipping chunks (and their columns) which can't match the filters.
+
+        :param Optional[Iterable[str]] levels: Only records of these levels (None = all levels).
+        :param Optional[Iterable[OutcomeType]] outcomes: Only records with these outcomes (None = all outcomes).
+        :return: The matching records.
+        :rtype: Iterator[ArchiveRecord]
+        """
+        levels = None if levels is None else set(levels)
+        outcomes = None if outcomes is None else set(outcomes)
+        self.chunks_read = self.chunks_skipped = 0
+        for path in self.paths:
+            with open(path, "rb") as file:
+                for header, offset in self._chunks(file):
+                    if ((levels is not None and levels.isdisjoint(header["levels"]))
+                            or (outcomes is not None and outcomes.isdisjoint(header["outcomes"]))):
+                        self.chunks_skipped += 1
+                        continue
+                    self.chunks_read += 1
+                    columns = {"level": self._column(file, header, offset, "level"),
+                               "outcome": self._column(file, header, offset, "outcome")}
+                    matches = [i for i in range(header["rows"])
+                               if (levels is None or columns["level"][i] in levels)
+                               and (outcomes is None or columns["outcome"][i] in outcomes)]
+                    if matches:
+                        for name in ARCHIVE_COLUMNS:
+                            if name not in columns:
+                                columns[name] = self._column(file, header, offset, name)
+                        for i in matches:
+                            yield ArchiveRecord(**{name: columns[name][i] for name in ARCHIVE_COLUMNS})
+
+
+Backends: Dict[FormatType, Type[OutputBackend]] = {backend.extension: backend for backend in [
+    StdoutBackend, TxtBackend, CsvBackend, JsonBackend, JsonLinesBackend, ArchiveBackend]}
+"""Output backend for each of the supported output formats."""
+
+
+def get_output_path(arguments: ParserArguments) -> Optional[str]:
+    """
+    Resolves the output file path from the parser arguments.
+
+    :param ParserArguments arguments: Parser Arguments to resolve from.
+    :return: The output file path (None = standard output).
+    :rtype: Optional[str]
+    """
+    try:
+        if arguments.output is not None:  # Print to designated file
+            return arguments.output
+        elif arguments.format is not None:
+            if arguments.format == "stdout":  # Print to standard output
+                return None
+            else:  # Print to file 'output.{format}'
+                return f"output.{arguments.format}"
+        else:
+            raise ValueError("No output or format found")
+    except ValueError as ex:
+        print(*ex.args, "Falling back to 'stdout' (standard output)", sep="; ")
+        return None
+
+
+def create_backend(arguments: ParserArguments, encoding: str = "utf") -> OutputBackend:
+    """
+    Creates the output backend matching the parser arguments (by file extension; Unrecognized extensions = `txt`).
+
+    :param ParserArguments arguments: Parser Arguments to create from.
+    :param str encoding: Encoding for output file.
+    :return: The output backend.
+    :rtype: OutputBackend
+    """
+    path = get_output_path(arguments)
+    if path is None:
+        return StdoutBackend()
+    backend = get_backend_type(path)
+    return backend(path, encoding, flush_interval=arguments.flush_interval, flush_size=arguments.flush_size)
+
+
+def get_backend_type(path: str) -> Type[OutputBackend]:
+    """
+    Resolves the output backend of a file path, by its extension (Unrecognized extensions = `txt`).
+
+    :param str path: The output file path.
+    :return: The output backend class.
+    :rtype: Type[OutputBackend]
+    """
+    backend = Backends.get(os.path.splitext(path)[1].lstrip(".").lower(), TxtBackend)
+    if backend is StdoutBackend:  # A file named 'output.stdout' is still a file.
+        backend = TxtBackend
+    return backend
+
+
+def main():
+    """Main function; Writes a few records to 'output.{ext}' for each file format and prints the results."""
+    for extension, backend in Backends.items():
+        path = None if backend is StdoutBackend else f"output.{extension}"
+        with backend(path) as output:
+            output.write("You shall not pass!", {"level": 1})
+            output.write_record(ArchiveRecord(time.time(), "Level 1", "What is the password?", "You shall not pass!"))
+        if backend.typed:
+            for record in ArchiveReader(path).read():
+                print(asdict(record))
+        elif path is not None:
+            with open(path, "r", encoding="utf") as file:
+                print(file.read())
+
+
+if __name__ == '__main__':
+    main()
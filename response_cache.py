@@ -0,0 +1,140 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from argument_parser import get_parser_arguments
+from argument_types import ParserArguments
+
+
+class ResponseCache:
+    """
+    Persistent cache of chatbot answers, keyed on (level, prompt), stored in SQLite.
+
+    Holds at most :py:attr:`max_entries` answers, evicting the least recently used ones; Answers older than
+    :py:attr:`ttl` seconds are treated as missing & evicted.
+    """
+    path: str
+    """The SQLite database file path."""
+    max_entries: int
+    """Maximum number of answers to keep (least recently used are evicted first)."""
+    ttl: Optional[float]
+    """Seconds an answer stays valid after being stored (None = forever)."""
+    _connection: sqlite3.Connection
+    """The database connection."""
+    _lock: threading.Lock
+    """Serializes access to :py:attr:`_connection`, so the cache can be shared between threads."""
+
+    def __init__(self, path: str, max_entries: int = 10000, ttl: Optional[float] = None):
+        """
+        The :class:`ResponseCache` Constructor; Opens (or creates) the database.
+
+        :param str path: The SQLite database file path.
+        :param int max_entries: Maximum number of answers to keep.
+        :param Optional[float] ttl: Seconds an answer stays valid after being stored (None = forever).
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("""CREATE TABLE IF NOT EXISTS responses (
+            level TEXT NOT NULL,
+            prompt TEXT NOT NULL,
+            answer TEXT NOT NULL,
+            created REAL NOT NULL,
+            accessed REAL NOT NULL,
+            PRIMARY KEY (level, prompt))""")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    def __enter__(self) -> "ResponseCache":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, level: str, prompt: str) -> Optional[str]:
+        """
+        Returns the cached answer to the prompt on the level.
+
+        :param str level: The level the prompt was submitted on.
+        :param str prompt: The prompt.
+        :return: The cached answer (None = not cached, or expired).
+        :rtype: Optional[str]
+        """
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute("SELECT answer, created FROM responses WHERE level = ? AND prompt = ?",
+                                           (level, prompt)).fetchone()
+            if row is None:
+                return None
+            answer, created = row
+            if self.ttl is not None and now - created > self.ttl:
+                self._connection.execute("DELETE FROM responses WHERE level = ? AND prompt = ?", (level, prompt))
+                return None
+            self._connection.execute("UPDATE responses SET accessed = ? WHERE level = ? AND prompt = ?",
+                                     (now, level, prompt))
+            return answer
+
+    def put(self, level: str, prompt: str, answer: str) -> None:
+        """
+        Stores the answer to the prompt on the level (replacing any previous answer), evicting entries if needed.
+
+        :param str level: The level the prompt was submitted on.
+        :param str prompt: The prompt.
+        :param str answer: The answer from the chatbot.
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                                     (level, prompt, answer, now, now))
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        """Removes expired entries, then the least recently used entries beyond :py:attr:`max_entries`."""
+        if self.ttl is not None:
+            self._connection.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+        self._connection.execute("""DELETE FROM responses WHERE rowid IN (
+            SELECT rowid FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)""", (max(self.max_entries, 0),))
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+def create_cache(arguments: ParserArguments) -> Optional[ResponseCache]:
+    """
+    Opens the response cache given in the parser arguments.
+
+    :param ParserArguments arguments: Parser Arguments to open from.
+    :return: The response cache (None = caching disabled).
+    :rtype: Optional[ResponseCache]
+    """
+    if arguments.cache is None:
+        return None
+    return ResponseCache(arguments.cache, max_entries=arguments.cache_size, ttl=arguments.cache_ttl)
+
+
+def main(arguments: Optional[ParserArguments] = None):
+    """Main function; Prints the number of answers in the response cache given in the CLI arguments."""
+    if arguments is None:
+        arguments = get_parser_arguments()
+    cache = create_cache(arguments)
+    if cache is None:
+        print("No response cache given (use '--cache PATH').")
+        return
+    with cache:
+        print(f"{cache.path}: {len(cache)} cached answers")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+import sys
+from typing import Optional, List, Iterable
+
+from argument_parser import get_parser_arguments
+from argument_types import ParserArguments, Command, Commands, MIN_PROMPT_LENGTH
+
+
+def parse_script(lines: Iterable[str]) -> List[Command]:
+    """
+    Parses & validates a CLI script (same commands as the interactive CLI, see `test.txt`), without running it.
+
+    Commands which would fail without reaching the site are marked with an :py:attr:`Command.error` (and skipped when
+    the script is run): unknown commands, a missing comment / guess, a comment shorter than
+    :py:data:`MIN_PROMPT_LENGTH`, the same comment as the previous one, and a guess before the first comment.
+    `help` is ignored, and `exit` / `quit` end the script.
+
+    Like the controllers, a guess doesn't forget the previous comment; Only a correct guess does (by moving on to a new
+    level), which can't be known before the script runs, so a comment repeated after a guess is always marked invalid.
+
+    :param Iterable[str] lines: The lines of the script.
+    :return: The parsed commands, in order.
+    :rtype: List[Command]
+    """
+    commands: List[Command] = []
+    has_comment = False
+    last_comment: Optional[str] = None
+    """The previous comment, which the next comment must differ from."""
+    for line_num, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        command, _, query = line.partition(" ")
+        command = Command(line_num, command.lower(), query or None)
+        if command.command in ["exit", "quit"]:
+            break
+        if command.command == "help":
+            continue
+        if command.command not in Commands:
+            command.error = f"Unknown command ({line})"
+        elif command.query is None:
+            command.error = f"Missing {command.command} ({line})"
+        elif command.command == "comment":
+            if len(command.query) < MIN_PROMPT_LENGTH:
+                command.error = f"Prompt must be at least {MIN_PROMPT_LENGTH} characters long ({command.query})"
+            elif command.query == last_comment:
+                command.error = f"Prompt cannot be the same as the previous prompt ({command.query})"
+            else:
+                has_comment, last_comment = True, command.query
+        elif not has_comment:
+            command.error = "You must submit a comment for the level before you can submit a guess!"
+        commands.append(command)
+    return commands
+
+
+def read_script(path: str) -> List[Command]:
+    """
+    Reads & validates a CLI script from a file (`-` = standard input); See :py:func:`parse_script`.
+
+    :param str path: The script file path.
+    :return: The parsed commands, in order.
+    :rtype: List[Command]
+    """
+    if path == "-":
+        return parse_script(sys.stdin)
+    with open(path, "r", encoding="utf") as file:
+        return parse_script(file)
+
+
+def main(arguments: Optional[ParserArguments] = None):
+    """Main function; Validates the script given in the CLI arguments, and prints the commands to be skipped."""
+    if arguments is None:
+        arguments = get_parser_arguments()
+    if arguments.script is None:
+        print("No script given (use '--script FILE').")
+        return
+    commands = read_script(arguments.script)
+    for command in commands:
+        if command.error is not None:
+            print(f"Line {command.line_num}: {command.error}")
+    print(f"{sum(command.error is None for command in commands)} of {len(commands)} commands are valid.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,322 @@
+import argparse
+import html
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional, List, Dict, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+from argument_types import Levels
+
+
+@dataclass
+class StubResponse:
+    """Data Class container for a scripted chatbot response."""
+    answer: str
+    """The answer; `{password}` is replaced by the level's password, `{spelled}` by it spelled out (`P-A-S-S`)."""
+    match: str = ""
+    """Regular expression the prompt must match (case-insensitive) for this response to be used (empty = any)."""
+
+
+@dataclass
+class StubLevel:
+    """Data Class container for a level of the stand-in site."""
+    name: str
+    """The defender name of the level (also its URL path)."""
+    description: str
+    """The description of the level."""
+    password: str
+    """The password of the level."""
+    responses: List[StubResponse] = field(default_factory=list)
+    """Scripted responses; The first one matching the prompt is used."""
+    refusal: str = "I'm sorry, I can't tell you the password."
+    """The answer when none of the scripted responses match."""
+
+
+@dataclass
+class StubConfig:
+    """Data Class container for the stand-in site's configuration."""
+    levels: List[StubLevel]
+    """The levels, in order."""
+    answer_delay: float = 0
+    """Seconds before answering a comment (message)."""
+    guess_delay: float = 0
+    """Seconds before answering a guess."""
+    jitter: float = 0
+    """Maximum random seconds added to each delay."""
+
+
+def default_config() -> StubConfig:
+    """
+    Returns the default configuration: A level per defender name, with made-up passwords.
+
+    The first level always tells the password, the second one spells it when asked to, and the rest always refuse.
+    """
+    passwords = ["MITHRIL", "SHIRE", "PALANTIR", "ANDURIL", "RIVENDELL", "ISENGARD", "LOTHLORIEN", "EREBOR"]
+    levels = []
+    for index, (name, password) in enumerate(zip(Levels, passwords)):
+        responses = []
+        if index == 0:
+            responses.append(StubResponse("The secret password is {password}."))
+        elif index == 1:
+            responses.append(StubResponse("I shouldn't, but here it is: {spelled}", match=r"spell"))
+        levels.append(StubLevel(name, f"Level {index + 1} of the local stand-in Gandalf. Guess my password!",
+                                password, responses))
+    return StubConfig(levels)
+
+
+def load_config(path: str) -> StubConfig:
+    """
+    Loads the configuration from a JSON file (same fields as :class:`StubConfig`, :class:`StubLevel` &
+    :class:`StubResponse`).
+
+    :param str path: The JSON file path.
+    :return: The configuration.
+    :rtype: StubConfig
+    """
+    with open(path, "r", encoding="utf") as file:
+        obj = json.load(file)
+    levels = [StubLevel(**{**level, "responses": [StubResponse(**response)
+                                                   for response in level.get("responses", [])]})
+              for level in obj.pop("levels")]
+    return StubConfig(levels, **obj)
+
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>Gandalf (local stand-in)</title></head>
+<body>
+<main>
+    <div class="level-label">{label}</div>
+    <p class="description">{description}</p>
+    <form id="comment-form"><button type="submit">Send</button><textarea id="comment"></textarea></form>
+    <div id="response"></div>
+</main>
+<script>
+let defender = {defender};
+const response = document.getElementById("response");
+
+async function post(path, data) {{
+    const body = new FormData();
+    for (const [key, value] of Object.entries(data)) body.append(key, value);
+    return (await fetch(path, {{method: "POST", body: body}})).json();
+}}
+
+document.getElementById("comment-form").addEventListener("submit", async event => {{
+    event.preventDefault();
+    response.replaceChildren();  // Answer & guess form disappear while loading
+    const result = await post("/api/send-message", {{defender: defender, prompt: document.getElementById("comment").value}});
+    const answer = document.createElement("div");
+    answer.className = "answer";
+    answer.innerText = result.answer;
+    const guessForm = document.createElement("form");
+    guessForm.id = "guess-form";
+    guessForm.innerHTML = '<input id="guess" type="text"><button type="submit">Validate</button>';
+    guessForm.addEventListener("submit", submitGuess);
+    response.replaceChildren(answer, guessForm);
+}});
+
+async function submitGuess(event) {{
+    event.preventDefault();
+    const result = await post("/api/guess-password", {{defender: defender, password: document.getElementById("guess").value}});
+    const alert = document.createElement("div");
+    alert.className = "customAlert";
+    alert.innerHTML = '<section><div></div><div></div></section><section><div></div><div></div></section>'
+        + '<button type="button">OK</button>';
+    const [title, text] = alert.querySelectorAll("section > div:nth-child(2)");
+    title.innerText = result.success ? "You guessed the password!" : "Wrong password.";
+    text.innerText = result.message;
+    alert.querySelector("button").addEventListener("click", async () => {{
+        alert.remove();
+        if (result.success && result.next_level) {{
+            const level = await (await fetch("/api/defender?defender=" + result.next_level)).json();
+            defender = level.name;
+            document.querySelector(".level-label").innerText = "Level " + level.level;
+            document.querySelector(".description").innerText = level.description;
+            response.replaceChildren();
+            history.pushState(null, "", "/" + defender);
+        }}
+    }});
+    document.body.appendChild(alert);
+}}
+</script>
+</body>
+</html>
+"""
+"""HTML template of a level page; Same DOM as the real site, as far as :class:`Controller` is concerned."""
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Request handler for the stand-in site (pages & API endpoints)."""
+    server: "StubServer"
+    protocol_version = "HTTP/1.1"  # Keep-alive
+    disable_nagle_algorithm = True  # Headers & body are written separately; Don't stall keep-alive clients on them.
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        """Sends a complete response."""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, obj: object, status: int = 200) -> None:
+        """Sends a JSON response."""
+        self._send(status, json.dumps(obj).encode(), "application/json")
+
+    def _read_form(self) -> Dict[str, str]:
+        """Reads the form fields of the request body (`multipart/form-data` or `application/x-www-form-urlencoded`)."""
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        content_type = self.headers.get("Content-Type", "")
+        if content_type.startswith("multipart/form-data"):
+            message = BytesParser(policy=HTTP).parsebytes(f"Content-Type: {content_type}\r\n\r\n".encode() + body)
+            return {part.get_param("name", header="content-disposition"): part.get_content()
+                    for part in message.iter_parts()}
+        return {key: values[0] for key, values in parse_qs(body.decode()).items()}
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path == "/api/defender":
+            index, level = self.server.find_level(parse_qs(url.query).get("defender", [""])[0])
+            if level is None:
+                return self._send_json({"detail": "Defender not found"}, 404)
+            return self._send_json({"name": level.name, "level": index + 1, "description": level.description})
+        index, level = self.server.find_level(url.path.strip("/") or self.server.config.levels[0].name)
+        if level is None:
+            return self._send(404, b"Not Found", "text/plain")
+        page = PAGE.format(label=f"Level {index + 1}", description=html.escape(level.description),
+                           defender=json.dumps(level.name))
+        self._send(200, page.encode(), "text/html; charset=utf-8")
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        form = self._read_form()
+        index, level = self.server.find_level(form.get("defender", ""))
+        if level is None:
+            return self._send_json({"detail": "Defender not found"}, 404)
+        match url.path:
+            case "/api/send-message":
+                self.server.delay(self.server.config.answer_delay)
+                prompt = form.get("prompt", "")
+                self._send_json({"answer": self.server.answer(level, prompt), "defender": level.name, "prompt": prompt})
+            case "/api/guess-password":
+                self.server.delay(self.server.config.guess_delay)
+                success = form.get("password", "").strip().upper() == level.password.upper()
+                levels = self.server.config.levels
+                next_level = levels[index + 1].name if success and index + 1 < len(levels) else None
+                message = (f"You've passed level {index + 1}!" if success
+                           else "That is not the password. Try again!")
+                self._send_json({"success": success, "message": message, "next_level": next_level})
+            case _:
+                self._send_json({"detail": "Not Found"}, 404)
+
+
+class StubServer(ThreadingHTTPServer):
+    """Local stand-in for the Gandalf site, serving the same DOM & API shape with scripted, delayed responses."""
+    daemon_threads = True
+    config: StubConfig
+    """The site's configuration."""
+    verbose: bool
+    """Whether to log each request."""
+    _thread: Optional[threading.Thread] = None
+    """The background thread serving requests (None = not started by :py:meth:`start`)."""
+
+    def __init__(self, config: Optional[StubConfig] = None, host: str = "127.0.0.1", port: int = 0,
+                 verbose: bool = False):
+        """
+        The :class:`StubServer` Constructor; Binds the socket (port 0 = any free port), without serving yet.
+
+        :param Optional[StubConfig] config: The site's configuration (None = :py:func:`default_config`).
+        :param str host: The host to bind to.
+        :param int port: The port to bind to.
+        :param bool verbose: Whether to log each request.
+        """
+        super().__init__((host, port), StubHandler)
+        self.config = default_config() if config is None else config
+        self.verbose = verbose
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *_) -> None:
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        """The base URL of the site (the first level)."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/{self.config.levels[0].name}"
+
+    def start(self) -> "StubServer":
+        """Starts serving requests in a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, name="stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops serving requests & closes the socket."""
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server_close()
+
+    def find_level(self, name: str) -> Tuple[int, Optional[StubLevel]]:
+        """Returns the index & the level with the given defender name (-1 & None = not found)."""
+        for index, level in enumerate(self.config.levels):
+            if level.name == name:
+                return index, level
+        return -1, None
+
+    def delay(self, seconds: float) -> None:
+        """Sleeps for the configured delay (plus random jitter)."""
+        seconds += random.uniform(0, self.config.jitter)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    @staticmethod
+    def answer(level: StubLevel, prompt: str) -> str:
+        """Returns the scripted answer of the level to the prompt."""
+        for response in level.responses:
+            if re.search(response.match, prompt, flags=re.IGNORECASE):
+                return response.answer.format(password=level.password, spelled="-".join(level.password))
+        return level.refusal
+
+
+def main():
+    """Main function; Serves the stand-in site until interrupted."""
+    parser = argparse.ArgumentParser(description="Local stand-in Gandalf server, for testing & benchmarks.")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to bind to.")
+    parser.add_argument("--port", default=8000, type=int, help="Port to bind to (0 = any free port).")
+    parser.add_argument("--config", help="JSON configuration file (levels, passwords & scripted responses).")
+    parser.add_argument("--answer-delay", type=float, help="Seconds before answering a comment.")
+    parser.add_argument("--guess-delay", type=float, help="Seconds before answering a guess.")
+    parser.add_argument("--jitter", type=float, help="Maximum random seconds added to each delay.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log each request.")
+    args = parser.parse_args()
+    config = default_config() if args.config is None else load_config(args.config)
+    for name in ["answer_delay", "guess_delay", "jitter"]:
+        if getattr(args, name) is not None:
+            setattr(config, name, getattr(args, name))
+    server = StubServer(config, args.host, args.port, args.verbose)
+    print(f"Serving on {server.url} (use with '--url {server.url}')")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+import os
+import sys
+from typing import Callable, Iterator
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # The modules are at the repo root
+
+import controller  # noqa: E402
+import drivers  # noqa: E402
+from argument_types import ParserArguments  # noqa: E402
+from benchmark_e2e import Timings  # noqa: E402
+from fake_driver import FakeBrowser  # noqa: E402
+from stub_server import StubServer, default_config  # noqa: E402
+
+TIMINGS = Timings()
+"""Latency of the end-to-end operations measured by the tests (reported at the end of the session)."""
+
+
+@pytest.fixture(scope="session")
+def stub_server() -> Iterator[StubServer]:
+    """The local stand-in site (see :mod:`stub_server`), with its default levels & a small answer delay."""
+    config = default_config()
+    config.answer_delay, config.guess_delay = .005, .002
+    with StubServer(config) as server:
+        yield server
+
+
+@pytest.fixture
+def fake_browser(monkeypatch: pytest.MonkeyPatch) -> FakeBrowser:
+    """Launches fake drivers (see :class:`FakeDriver`) instead of browsers, for the `selenium` backend."""
+    browser = FakeBrowser()
+    monkeypatch.setattr(controller, "create_driver", browser.launch)
+    monkeypatch.setattr(drivers, "create_driver", browser.launch)
+    return browser
+
+
+@pytest.fixture(params=["selenium", "http"])
+def backend(request: pytest.FixtureRequest, fake_browser: FakeBrowser) -> str:
+    """Each controller backend (the `selenium` one drives a :class:`FakeDriver`)."""
+    return request.param
+
+
+@pytest.fixture
+def make_arguments(stub_server: StubServer, tmp_path) -> Callable[..., ParserArguments]:
+    """Builds Parser Arguments for the stand-in site; Keyword arguments override the defaults."""
+
+    def make(**overrides) -> ParserArguments:
+        fields = dict(browser="firefox", url=stub_server.url, keep=False, timeout=5, poll_frequency=.01,
+                      format="stdout", output=None, driver_cache=str(tmp_path / "driver_cache.txt"))
+        return ParserArguments(**{**fields, **overrides})
+
+    return make
+
+
+@pytest.fixture(scope="session")
+def timings() -> Timings:
+    """Collects the latency of end-to-end operations (see :class:`benchmark_e2e.Timings`)."""
+    return TIMINGS
+
+
+def pytest_terminal_summary(terminalreporter) -> None:
+    """Reports the p50/p95 latency & throughput of the measured operations."""
+    if TIMINGS.samples:
+        terminalreporter.section("end-to-end latency")
+        for line in TIMINGS.summary():
+            terminalreporter.write_line(line)
@@ -0,0 +1,221 @@
+import json
+from typing import Optional, List, Dict, Any, Set
+from urllib.parse import urlsplit, urlencode
+from urllib.request import urlopen
+
+from selenium.common import NoSuchElementException, StaleElementReferenceException
+from selenium.webdriver.common.by import By
+
+from argument_types import Selectors
+
+LOCATORS: Dict[str, str] = {
+    By.CLASS_NAME: ".{}",
+    By.ID: "#{}",
+    By.CSS_SELECTOR: "{}",
+}
+"""CSS Selector template of each supported locator strategy."""
+
+
+class FakeElement:
+    """Stand-in for a :class:`WebElement` of the stand-in site's page; Raises once removed from the page (stale)."""
+    name: str
+    """The :class:`Elements` field this element is found by."""
+    text: str
+    """The element's text (`innerText`)."""
+    value: str
+    """The element's value (textboxes only)."""
+    stale: bool
+    """Whether the element was removed from the page."""
+
+    def __init__(self, driver: "FakeDriver", name: str, text: str = ""):
+        self._driver = driver
+        self.name = name
+        self._text = text
+        self.value = ""
+        self.stale = False
+
+    def _check(self) -> None:
+        """Raises if the element was removed from the page."""
+        if self.stale:
+            raise StaleElementReferenceException(f"Element '{self.name}' is no longer attached to the DOM")
+
+    @property
+    def text(self) -> str:
+        self._check()
+        return self._text
+
+    @text.setter
+    def text(self, value: str) -> None:
+        self._text = value
+
+    def clear(self) -> None:
+        self._check()
+        self.value = ""
+
+    def send_keys(self, value: str) -> None:
+        self._check()
+        self.value += value
+
+    def click(self) -> None:
+        self._check()
+        if self.name in self._driver.stale_once:  # Re-rendered by the page right before the click
+            self._driver.stale_once.discard(self.name)
+            self._driver.replace(self.name)
+            self._check()
+        self._driver.clicked(self)
+
+
+class FakeDriver:
+    """
+    Stand-in for a :class:`WebDriver` on the stand-in site (see :mod:`stub_server`), without a browser: emulates the
+    page's DOM & scripts (see :py:data:`stub_server.PAGE`), calling the site's API like the page does.
+    """
+    current_url: str
+    """URL of the current level."""
+    failures: Dict[str, Exception]
+    """Exception raised when submitting a comment, by defender name or by a substring of the prompt."""
+    stale_once: Set[str]
+    """Names of elements re-rendered (leaving the found reference stale) right before they're next clicked."""
+    quit_count: int
+    """How many times :py:meth:`quit` was called."""
+
+    def __init__(self, failures: Optional[Dict[str, Exception]] = None, stale_once: Optional[Set[str]] = None):
+        self.current_url = "about:blank"
+        self.failures = {} if failures is None else failures
+        self.stale_once = set() if stale_once is None else stale_once
+        self.quit_count = 0
+        self._defender = ""
+        self._elements: Dict[str, FakeElement] = {}
+        self._result: Dict[str, Any] = {}
+
+    def _api(self, path: str, data: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Calls the site's API (GET without data, POST with form data)."""
+        parts = urlsplit(self.current_url)
+        body = None if data is None else urlencode(data).encode()
+        with urlopen(f"{parts.scheme}://{parts.netloc}{path}", data=body) as response:
+            return json.load(response)
+
+    def _show(self, *names: str, **texts: str) -> None:
+        """Adds fresh elements to the page (replacing existing ones, which become stale)."""
+        for name in names:
+            self.remove(name)
+            self._elements[name] = FakeElement(self, name, texts.get(name, ""))
+
+    def remove(self, *names: str) -> None:
+        """Removes the elements from the page (found references become stale)."""
+        for name in names:
+            element = self._elements.pop(name, None)
+            if element is not None:
+                element.stale = True
+
+    def replace(self, name: str) -> None:
+        """Re-renders an element (same text), leaving found references to it stale."""
+        self._show(name, **{name: self._elements[name].text})
+
+    def _load_level(self, defender: str) -> None:
+        """Updates the page to the given level."""
+        level = self._api(f"/api/defender?{urlencode({'defender': defender})}")
+        self._defender = level["name"]
+        if "level_label" in self._elements:
+            self._elements["level_label"].text = f"Level {level['level']}"
+            self._elements["description"].text = level["description"]
+        else:
+            self._show("level_label", "description", "comment", "comment_submit",
+                       level_label=f"Level {level['level']}", description=level["description"])
+        self.remove("answer", "guess", "guess_submit")
+
+    def get(self, url: str) -> None:
+        self.current_url = url
+        self.remove(*list(self._elements))  # New page
+        self._load_level(urlsplit(url).path.strip("/"))
+
+    def clicked(self, element: FakeElement) -> None:
+        """Runs the page's handler of the clicked element."""
+        match element.name:
+            case "comment_submit":
+                prompt = self._elements["comment"].value
+                self.remove("answer", "guess", "guess_submit")
+                for key, exception in self.failures.items():
+                    if key == self._defender or key in prompt:
+                        raise exception
+                result = self._api("/api/send-message", {"defender": self._defender, "prompt": prompt})
+                self._show("answer", "guess", "guess_submit", answer=result["answer"])
+            case "guess_submit":
+                self._result = self._api("/api/guess-password",
+                                         {"defender": self._defender, "password": self._elements["guess"].value})
+                self._show("alert_title", "alert_text", "alert_submit",
+                           alert_title="You guessed the password!" if self._result["success"] else "Wrong password.",
+                           alert_text=self._result["message"])
+            case "alert_submit":
+                self.remove("alert_title", "alert_text", "alert_submit")
+                if self._result["success"] and self._result["next_level"]:
+                    parts = urlsplit(self.current_url)
+                    self.current_url = f"{parts.scheme}://{parts.netloc}/{self._result['next_level']}"
+                    self._load_level(self._result["next_level"])
+
+    def _query(self, selector: str) -> List[FakeElement]:
+        """Returns the elements matching the CSS Selector (one of :py:data:`argument_types.Selectors`)."""
+        if selector == ".customAlert div:nth-child(2)":
+            names = ["alert_title", "alert_text"]
+        else:
+            names = [name for name, value in Selectors.items() if value == selector][:1]
+        return [self._elements[name] for name in names if name in self._elements]
+
+    def find_elements(self, by: str = By.ID, value: Optional[str] = None) -> List[FakeElement]:
+        return self._query(LOCATORS[by].format(value))
+
+    def find_element(self, by: str = By.ID, value: Optional[str] = None) -> FakeElement:
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"Unable to locate element: {value}")
+        return elements[0]
+
+    def execute_script(self, script: str, *args) -> Any:
+        if not args:
+            return None
+        elements = {name: next(iter(self._query(selector)), None) for name, selector in args[0].items()}
+        return {"elements": elements,
+                "texts": {name: None if element is None else element.text for name, element in elements.items()}}
+
+    def execute_async_script(self, script: str, *args) -> bool:
+        return all(self._query(selector) for selector in args[0])
+
+    def set_script_timeout(self, timeout: float) -> None:
+        pass
+
+    def delete_all_cookies(self) -> None:
+        pass
+
+    def get_cookies(self) -> List[Dict[str, Any]]:
+        return []
+
+    def add_cookie(self, cookie: Dict[str, Any]) -> None:
+        pass
+
+    def quit(self) -> None:
+        self.quit_count += 1
+
+
+class FakeBrowser:
+    """Launches :class:`FakeDriver` instances in place of :py:func:`drivers.create_driver` (see `conftest.py`)."""
+    failures: Dict[str, Exception]
+    """Exception raised when submitting a comment, by defender name or by a substring of the prompt."""
+    stale_once: Set[str]
+    """Names of elements re-rendered right before they're next clicked (shared by all drivers)."""
+    launch_failure: Optional[Exception]
+    """Exception raised instead of launching a driver (None = launch normally)."""
+    drivers: List[FakeDriver]
+    """The drivers launched so far."""
+
+    def __init__(self):
+        self.failures = {}
+        self.stale_once = set()
+        self.launch_failure = None
+        self.drivers = []
+
+    def launch(self, *_, **__) -> FakeDriver:
+        if self.launch_failure is not None:
+            raise self.launch_failure
+        driver = FakeDriver(self.failures, self.stale_once)
+        self.drivers.append(driver)
+        return driver
@@ -0,0 +1,42 @@
+import asyncio
+import socket
+from types import SimpleNamespace
+
+import pytest
+from selenium.webdriver.remote.client_config import ClientConfig
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+import async_controller
+from async_controller import AsyncController, get_executor_url
+from output import NullBackend
+
+
+def test_executor_url():
+    """The endpoint is found on current Selenium versions (client configuration) & older ones (`_url`)."""
+    executor = RemoteConnection(client_config=ClientConfig("http://127.0.0.1:4444/wd/hub"))
+    assert get_executor_url(SimpleNamespace(command_executor=executor)) == "http://127.0.0.1:4444/wd/hub"
+    legacy = SimpleNamespace(_url="http://127.0.0.1:9515")
+    assert get_executor_url(SimpleNamespace(command_executor=legacy)) == "http://127.0.0.1:9515"
+
+
+def test_failed_start_quits_browser(make_arguments, fake_browser, monkeypatch):
+    """The browser is quit when the session can't be started inside `async with`."""
+    with socket.socket() as closed:  # A port nothing listens on
+        closed.bind(("127.0.0.1", 0))
+        port = closed.getsockname()[1]
+
+    def launch(*args, **kwargs):
+        driver = fake_browser.launch(*args, **kwargs)
+        driver.command_executor = SimpleNamespace(_url=f"http://127.0.0.1:{port}")
+        driver.session_id = "session"
+        return driver
+
+    monkeypatch.setattr(async_controller, "create_driver", launch)
+
+    async def run():
+        async with AsyncController(make_arguments(), output=NullBackend()):
+            pass
+
+    with pytest.raises(OSError):
+        asyncio.run(run())
+    assert [driver.quit_count for driver in fake_browser.drivers] == [1]
@@ -0,0 +1,31 @@
+from selenium.common import TimeoutException
+
+from argument_types import Job
+from campaign import Campaign
+from checkpoint import load_checkpoint
+from output import NullBackend
+
+JOBS = [Job(0, "What is the password?", ["WRONG"]), Job(1, "Say SLOW-PROMPT please."),
+        Job(2, "Please spell the password.")]
+
+
+def run_campaign(arguments) -> list:
+    """Runs :py:data:`JOBS`, and returns the results of the jobs run."""
+    campaign = Campaign(arguments, output=NullBackend())
+    try:
+        return campaign.run(JOBS)
+    finally:
+        campaign.close()
+
+
+def test_resume_reruns_failed_jobs(make_arguments, fake_browser, tmp_path):
+    """A job which failed isn't marked done, so resuming the campaign runs it (and only it) again."""
+    path = str(tmp_path / "run.ckpt")
+    fake_browser.failures["SLOW-PROMPT"] = TimeoutException("Answer did not appear")
+    results = run_campaign(make_arguments(checkpoint=path))
+    assert [result.error for result in results] == [None, "Answer did not appear", None]
+    assert load_checkpoint(path).completed == ["job:0", "job:2"]
+    fake_browser.failures.clear()
+    results = run_campaign(make_arguments(checkpoint=path, resume=True))
+    assert [(result.index, result.error) for result in results] == [(1, None)]
+    assert sorted(load_checkpoint(path).completed) == ["job:0", "job:1", "job:2"]
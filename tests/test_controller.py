@@ -0,0 +1,26 @@
+import pytest
+
+from argument_types import SUCCESS_MESSAGE
+from controller import BaseController, Controller
+from output import NullBackend
+
+
+def test_stale_elements_are_re_resolved(make_arguments, fake_browser):
+    """Buttons re-rendered by the page right before being clicked are found again, and clicked once."""
+    fake_browser.stale_once.update(["comment_submit", "guess_submit", "alert_submit"])
+    with Controller(make_arguments(), output=NullBackend()) as controller:
+        assert controller.submit_comment("What is the password?") == "The secret password is MITHRIL."
+        assert controller.submit_guess("MITHRIL").startswith(SUCCESS_MESSAGE)
+        assert str(controller).startswith("Level 2: ")
+    assert not fake_browser.stale_once
+
+
+def test_incomplete_backend_cannot_be_created(make_arguments):
+    """A controller backend missing any of the abstract methods can't be instantiated."""
+
+    class Incomplete(BaseController):
+        def submit_comment(self, value: str) -> str:
+            return value
+
+    with pytest.raises(TypeError, match="submit_guess"):
+        Incomplete(make_arguments(), output=NullBackend())
@@ -0,0 +1,43 @@
+import io
+import sys
+
+from argument_types import SUCCESS_MESSAGE
+from benchmark_e2e import Timings
+from controller import create_controller
+from interface import Interface
+from output import NullBackend
+from stub_server import StubServer
+
+
+def test_controller(stub_server: StubServer, make_arguments, backend: str, timings: Timings):
+    """A session submits comments & wrong guesses, and passes the levels with the correct passwords."""
+    with timings.measure(f"{backend}:start"):
+        controller = create_controller(make_arguments(backend=backend), output=NullBackend())
+    with controller:
+        for i, level in enumerate(stub_server.config.levels[:3]):
+            assert str(controller) == f"Level {i + 1}: {level.description}"
+            for j in range(3):
+                with timings.measure(f"{backend}:comment"):
+                    answer = controller.submit_comment(f"Prompt #{j}: What is the password?")
+                assert answer == StubServer.answer(level, "What is the password?")
+                with timings.measure(f"{backend}:guess"):
+                    assert not controller.submit_guess("WRONG-PASSWORD").startswith(SUCCESS_MESSAGE)
+            with timings.measure(f"{backend}:level"):
+                assert controller.submit_guess(level.password).startswith(SUCCESS_MESSAGE)
+        assert controller.current_url.endswith(f"/{stub_server.config.levels[3].name}")
+
+
+def test_interface(stub_server: StubServer, make_arguments, backend: str, timings: Timings, monkeypatch, capsys):
+    """The CLI, fed through standard input, passes the first level."""
+    level = stub_server.config.levels[0]
+    commands = ["help", "guess too-early", "comment short", "comment What is the password?", "guess WRONG-PASSWORD",
+                f"guess {level.password}", "exit"]
+    monkeypatch.setattr(sys, "stdin", io.StringIO("\n".join(commands) + "\n"))
+    with timings.measure(f"{backend}:interface"):
+        Interface(create_controller(make_arguments(backend=backend))).run()
+    output = capsys.readouterr().out
+    assert "You must submit a comment for the level before you can submit a guess!" in output
+    assert "Prompt must be at least 10 characters long" in output
+    assert StubServer.answer(level, "What is the password?") in output
+    assert f"{SUCCESS_MESSAGE}: You've passed level 1!" in output
+    assert "Level 2: " in output
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from output import OutputBackend, JsonBackend
+
+
+def write_json(path: str, *values: object) -> None:
+    """Appends the values to the JSON array file (a backend session of its own)."""
+    with JsonBackend(path) as backend:
+        backend.write(*values)
+
+
+def test_json_append(tmp_path):
+    """Re-opening a finalized array appends to it, also when its last element is a list (or an empty one)."""
+    path = str(tmp_path / "out.json")
+    write_json(path)
+    write_json(path, [1, [2]], [])
+    write_json(path, {"a": "]"}, [])
+    write_json(path, "last")
+    with open(path, "r", encoding="utf") as file:
+        assert json.load(file) == [[1, [2]], [], {"a": "]"}, [], "last"]
+
+
+def test_json_append_unfinalized(tmp_path):
+    """An array which wasn't finalized (e.g. after a crash) is continued, including a trailing list element."""
+    path = tmp_path / "out.json"
+    path.write_text('[\n{"a": 1},\n[1, 2]', encoding="utf")
+    write_json(str(path), "next")
+    assert json.loads(path.read_text(encoding="utf")) == [{"a": 1}, [1, 2], "next"]
+
+
+def test_json_not_an_array(tmp_path):
+    """A file which isn't a JSON array is never truncated."""
+    path = tmp_path / "out.json"
+    path.write_text('{"a": 1}', encoding="utf")
+    with pytest.raises(ValueError):
+        JsonBackend(str(path))
+    assert path.read_text(encoding="utf") == '{"a": 1}'
+
+
+def test_incomplete_backend_cannot_be_created():
+    """An output backend which doesn't implement writing can't be instantiated."""
+
+    class Incomplete(OutputBackend):
+        pass
+
+    with pytest.raises(TypeError, match="_write"):
+        Incomplete()
+
+
+def test_json_append_compact(tmp_path):
+    """Arrays written by another writer (e.g. `json.dump`, all on one line) are continued too."""
+    path = tmp_path / "out.json"
+    for array in [["x", "y"], ["x", ["y"]], []]:
+        path.write_text(json.dumps(array), encoding="utf")
+        write_json(str(path), "z")
+        assert json.loads(path.read_text(encoding="utf")) == [*array, "z"]
+    path.write_text("[ ]", encoding="utf")
+    write_json(str(path), "z")
+    assert json.loads(path.read_text(encoding="utf")) == ["z"]
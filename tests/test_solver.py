@@ -0,0 +1,28 @@
+from selenium.common import TimeoutException, WebDriverException
+
+from output import NullBackend
+from solver import Solver
+
+
+def test_parallel_browser_error_is_recorded(make_arguments, fake_browser):
+    """A level whose session times out is reported as failed, while the other levels are still solved."""
+    fake_browser.failures["baseline"] = TimeoutException("Answer did not appear")
+    solver = Solver(make_arguments(workers=3), output=NullBackend())
+    try:
+        results = solver.run(["baseline", "do-not-tell", "do-not-tell-and-block"])
+    finally:
+        solver.close()
+    assert results[0].error == "Answer did not appear" and results[0].password is None
+    assert results[1].password == "SHIRE" and results[1].error is None
+    assert results[2].password is None and results[2].error is None  # Refuses every prompt
+
+
+def test_launch_error_is_recorded(make_arguments, fake_browser):
+    """A browser failing to launch ends the (single session) solver with the level's error, like in parallel mode."""
+    fake_browser.launch_failure = WebDriverException("Browser crashed")
+    solver = Solver(make_arguments(), output=NullBackend())
+    try:
+        results = solver.run()
+    finally:
+        solver.close()
+    assert [(result.level, result.error) for result in results] == [("baseline", "Browser crashed")]
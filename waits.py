@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from typing import Callable, List, TYPE_CHECKING
+
+from selenium.common import (NoSuchElementException, ElementNotInteractableException, WebDriverException,
+                             TimeoutException)
+
+from argument_types import WaitType
+from instrumentation import NullTracer, traced
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+    from selenium.webdriver.support.wait import WebDriverWait
+
+OBSERVER_SCRIPT = """
+const [selectors, timeout, done] = arguments;
+const ready = () => selectors.every(selector => document.querySelector(selector) !== null);
+if (ready()) {
+    return done(true);
+}
+const observer = new MutationObserver(() => {
+    if (ready()) {
+        observer.disconnect();
+        clearTimeout(timer);
+        done(true);
+    }
+});
+const timer = setTimeout(() => {
+    observer.disconnect();
+    done(false);
+}, timeout);
+observer.observe(document.documentElement, {childList: true, subtree: true});
+"""
+"""Asynchronous script resolving (true) as soon as all CSS Selectors match, or (false) after the timeout (ms)."""
+
+
+class PollingWait:
+    """Wait strategy which re-checks the condition every `poll_frequency` seconds (one or more round-trips each)."""
+    _driver: WebDriver
+    """The :class:`WebDriver` instance to wait on."""
+    _timeout: float
+    """How long to wait before timing out (in seconds)."""
+    _wait: WebDriverWait
+    """Used to have the :class:`WebDriver` wait for something to happen."""
+    _tracer: NullTracer
+    """Records how long each wait took (see :mod:`instrumentation`)."""
+
+    def __init__(self, driver: WebDriver, timeout: float, poll_frequency: float, tracer: NullTracer = NullTracer()):
+        """
+        The :class:`PollingWait` Constructor.
+
+        :param WebDriver driver: The :class:`WebDriver` instance to wait on.
+        :param float timeout: How long to wait before timing out (in seconds).
+        :param float poll_frequency: How frequently to poll (in seconds).
+        :param NullTracer tracer: Records how long each wait took (default: disabled).
+        """
+        from selenium.webdriver.support.wait import WebDriverWait  # Not on import (see benchmark_imports.py)
+        self._driver = driver
+        self._tracer = tracer
+        self._timeout = timeout
+        self._wait = WebDriverWait(self._driver, timeout=timeout, poll_frequency=poll_frequency,
+                                   ignored_exceptions=[NoSuchElementException, ElementNotInteractableException])
+
+    @traced("wait:poll")
+    def until(self, condition: Callable[[], bool], selectors: List[str]) -> bool:
+        """
+        Waits until the condition is met.
+
+        :param Callable[[], bool] condition: Updates the relevant elements, and returns whether they are available.
+        :param List[str] selectors: CSS Selectors of the elements the condition looks for (unused when polling).
+        :return: The result of the condition.
+        :rtype: bool
+        :raises TimeoutException: The condition wasn't met in time.
+        """
+        return self._wait.until(lambda _: condition())
+
+
+class ObserverWait(PollingWait):
+    """
+    Wait strategy which installs a DOM `MutationObserver` in the page, and returns as soon as the elements appear.
+
+    Waiting costs a single round-trip (instead of one or more per poll), and reacts immediately instead of at the next
+    poll. Falls back to polling if the script fails (e.g. unsupported by the driver), or if the condition isn't met
+    once the elements have appeared; Times out (without polling) if the elements never appear.
+    """
+
+    def __init__(self, driver: WebDriver, timeout: float, poll_frequency: float, tracer: NullTracer = NullTracer()):
+        super().__init__(driver, timeout, poll_frequency, tracer)
+        self._driver.set_script_timeout(timeout + 1)  # The script times out by itself first
+
+    @traced("wait:observer")
+    def until(self, condition: Callable[[], bool], selectors: List[str]) -> bool:
+        try:
+            appeared = self._driver.execute_async_script(OBSERVER_SCRIPT, selectors, int(self._timeout * 1000))
+        except WebDriverException:
+            appeared = None  # Script failed; Fall back to polling.
+        if appeared is False:
+            raise TimeoutException(f"Elements did not appear within {self._timeout} seconds: {selectors}")
+        try:
+            if appeared and condition():
+                return True
+        except (NoSuchElementException, ElementNotInteractableException):
+            pass  # Elements appeared, but aren't ready yet; Keep waiting by polling.
+        return super().until(condition, selectors)
+
+
+def create_wait(wait: WaitType, driver: WebDriver, timeout: float, poll_frequency: float,
+                tracer: NullTracer = NullTracer()) -> PollingWait:
+    """
+    Creates the requested wait strategy.
+
+    :param WaitType wait: The wait strategy (`observer` = DOM MutationObserver, `poll` = fixed-interval polling).
+    :param WebDriver driver: The :class:`WebDriver` instance to wait on.
+    :param float timeout: How long to wait before timing out (in seconds).
+    :param float poll_frequency: How frequently to poll (in seconds).
+    :param NullTracer tracer: Records how long each wait took (default: disabled).
+    :return: The wait strategy.
+    :rtype: PollingWait
+    :raises ValueError: The given :param:`wait` was not recognized.
+    """
+    match wait:
+        case "observer":
+            return ObserverWait(driver, timeout, poll_frequency, tracer)
+        case "poll":
+            return PollingWait(driver, timeout, poll_frequency, tracer)
+        case _:
+            raise ValueError(f"Wait strategy not recognized: {wait}")